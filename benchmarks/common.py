@@ -0,0 +1,71 @@
+"""Общее для замеров: окружение, тихие логи, временная БД и статистика
+
+Импортируется до модулей src: config требует токены, а для замеров
+достаточно заглушек.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("BOT_TOKEN", "benchmark")
+os.environ.setdefault("API_TOKEN", "benchmark")
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.core.database.engine import create_engine
+from src.core.database.migrations import migrate
+
+
+def quiet_logs(level: str = "WARNING") -> None:
+    """Логи менеджеров на каждый запрос искажают замеры"""
+    logger.remove()
+    logger.add(sys.stderr, level=level)
+
+
+@asynccontextmanager
+async def temporary_database(
+    name: str = "benchmark",
+    profile: str = "wal"
+) -> AsyncIterator[Tuple[AsyncEngine, async_sessionmaker[AsyncSession], Path]]:
+    """Файл SQLite с актуальной схемой во временном каталоге: (engine, Session, каталог)"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite+aiosqlite:///{Path(directory) / f'{name}.db'}", profile=profile)
+        try:
+            await migrate(engine)
+            yield engine, async_sessionmaker(engine), Path(directory)
+        finally:
+            await engine.dispose()
+
+
+async def measure(
+    func: Callable[[], Awaitable[object]],
+    repeat: int,
+    before: Optional[Callable[[], None]] = None
+) -> List[float]:
+    """Время каждого из repeat вызовов, сек. (before - вне замера)"""
+    times = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        started = time.perf_counter()
+        await func()
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def summarize(times: List[float]) -> Dict[str, float]:
+    """Медиана, p95, минимум и среднее, мс"""
+    ordered = sorted(times)
+    return {
+        "n": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3)
+    }
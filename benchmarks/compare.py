@@ -0,0 +1,51 @@
+"""Сравнение двух JSON из benchmarks.suite: что стало медленнее
+
+Сравниваются медианы одинаковых случаев. Код выхода 1, если хотя бы
+один случай медленнее базы больше чем в --threshold раз (и не меньше
+чем на --min-ms, чтобы шум на долях миллисекунды не считался регрессией).
+
+    python -m benchmarks.compare before.json after.json --threshold 1.25
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def load(path: str) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare(base: dict, new: dict, threshold: float, min_ms: float) -> int:
+    if base["data"] != new["data"]:
+        print(f"ВНИМАНИЕ: разные данные: {base['data']} и {new['data']}")
+
+    before = {(x["group"], x["name"]): x for x in base["results"]}
+    regressions = 0
+    print(f"{base['meta']['commit']} → {new['meta']['commit']}")
+    print(f"{'случай':<52} | {'было, мс':>10} | {'стало, мс':>10} | {'x':>6}")
+    for row in new["results"]:
+        key = (row["group"], row["name"])
+        name = f"{row['group']}: {row['name']}"
+        if key not in before:
+            print(f"{name:<52} | {'-':>10} | {row['p50_ms']:>10.3f} | {'новый':>6}")
+            continue
+        old = before[key]["p50_ms"]
+        ratio = row["p50_ms"] / old if old else float("inf")
+        slower = ratio > threshold and row["p50_ms"] - old >= min_ms
+        regressions += slower
+        mark = "  <-- медленнее" if slower else ""
+        print(f"{name:<52} | {old:>10.3f} | {row['p50_ms']:>10.3f} | {ratio:>6.2f}{mark}")
+
+    print(f"Регрессий: {regressions}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--min-ms", type=float, default=0.1)
+    args = parser.parse_args()
+    sys.exit(compare(load(args.base), load(args.new), args.threshold, args.min_ms))
@@ -0,0 +1,122 @@
+"""Проверка резервов: сотни одновременных POST /api/v1/order на маленький склад
+
+Заказы идут через приложение FastAPI (httpx + ASGITransport) в одном
+процессе, каждый запрос - отдельная транзакция из пула соединений. После
+запросов проверяется, что склад не ушёл в минус и что остаток вместе с
+резервами равен начальному; затем все резервы истекают и остатки должны
+вернуться полностью. Код выхода 1, если что-то не сошлось.
+
+    python -m benchmarks.oversell_stress --requests 500 --stock 100
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import Counter
+from datetime import timedelta
+
+from benchmarks.common import quiet_logs, temporary_database
+
+import httpx
+from sqlalchemy import func, select
+
+from src.api import create_app
+from src.core.database.engine import SQLITE_PROFILES
+from src.core.database.models import Order, Product, StockReservation
+from src.managers import ProductManager, StockReservations
+from src.managers.reservation import utcnow
+from src.schemas import ProductCreateSchema
+
+
+async def check_stock(Session, stock: int) -> list:
+    """Нарушения: отрицательный остаток или остаток + резерв != начальному"""
+    async with Session() as session:
+        reserved = dict((await session.execute(
+            select(StockReservation.product_id, func.sum(StockReservation.count))
+            .group_by(StockReservation.product_id)
+        )).all())
+        products = (await session.execute(select(Product.id, Product.count))).all()
+    problems = []
+    for product in products:
+        if product.count < 0:
+            problems.append(f"продукт {product.id}: остаток {product.count}")
+        if product.count + reserved.get(product.id, 0) != stock:
+            problems.append(
+                f"продукт {product.id}: остаток {product.count} + резерв "
+                f"{reserved.get(product.id, 0)} != {stock}"
+            )
+    return problems
+
+
+async def main(args) -> int:
+    quiet_logs("ERROR")
+    random.seed(args.seed)
+
+    async with temporary_database("stress", args.profile) as (engine, Session, _):
+        for i in range(args.products):
+            await ProductManager(Session).create_product(ProductCreateSchema(
+                title=f"Продукт {i}", poster="data/img/none.jpg",
+                price=100 + i, count=args.stock, description="stress"
+            ))
+
+        app = create_app(Session)
+        transport = httpx.ASGITransport(app=app)
+        statuses: Counter = Counter()
+        ordered = 0
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://stress", timeout=60) as client:
+            async def place_order() -> None:
+                nonlocal ordered
+                items = [
+                    {"product_id": product_id, "count": random.randint(1, args.max_count)}
+                    for product_id in random.sample(range(1, args.products + 1), k=random.randint(1, 2))
+                ]
+                response = await client.post("/api/v1/order", json={"items": items})
+                statuses[response.status_code] += 1
+                if response.status_code == 200:
+                    ordered += sum(x["count"] for x in items)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(place_order() for _ in range(args.requests)))
+            elapsed = time.perf_counter() - started
+
+        async with Session() as session:
+            orders = await session.scalar(select(func.count()).select_from(Order))
+        problems = await check_stock(Session, args.stock)
+        print(
+            f"Запросов: {args.requests} за {elapsed:.2f} с ({args.requests / elapsed:.0f}/с), "
+            f"ответы: {dict(statuses)}"
+        )
+        print(f"Заказов: {orders}, зарезервировано {ordered} из {args.stock * args.products} шт.")
+
+        if statuses[200] != orders:
+            problems.append(f"успешных ответов {statuses[200]}, а заказов в БД {orders}")
+        unexpected = {code: count for code, count in statuses.items() if code not in (200, 409)}
+        if unexpected:
+            problems.append(f"неожиданные ответы: {unexpected}")
+
+        # Все резервы истекают: склад должен вернуться к начальному
+        await StockReservations(Session).sweep(now=utcnow() + timedelta(days=1))
+        async with Session() as session:
+            left = await session.scalar(select(func.count()).select_from(StockReservation))
+        if left:
+            problems.append(f"после истечения осталось резервов: {left}")
+        problems += await check_stock(Session, args.stock)
+
+    for problem in problems:
+        print(f"ОШИБКА: {problem}")
+    if not problems:
+        print("OK: склад не ушёл в минус, резервы сходятся и возвращаются")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--products", type=int, default=3)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--max-count", type=int, default=3)
+    parser.add_argument("--profile", default="wal", choices=list(SQLITE_PROFILES))
+    parser.add_argument("--seed", type=int, default=0)
+    sys.exit(asyncio.run(main(parser.parse_args())))
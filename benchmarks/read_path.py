@@ -0,0 +1,112 @@
+"""Стоимость чтения на строку: get_all_products и get_all_orders
+
+Прежний путь (объекты ORM → ProductSchema(**as_dict()) / OrderSchema(...)
+с валидацией каждого поля) сравнивается с текущими методами менеджеров
+на одной и той же БД: колонки без объектов ORM, строки проверяются
+пакетом через TypeAdapter(List[схема]) (schemas/read.py), заказы
+собираются из готовых позиций по одному. Средний столбец - те же
+колонки, но каждая строка через model_validate: разница с ним - выигрыш
+только от пакетной проверки. Кэш продуктов сбрасывается перед каждым
+замером.
+
+    python -m benchmarks.read_path --products 10000 --orders 10000
+"""
+import argparse
+import asyncio
+import statistics
+
+from benchmarks.common import measure, quiet_logs, temporary_database
+from benchmarks.seed import seed
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from src.core.database.models import Order, OrderItem, Product
+from src.managers import OrderManager, ProductManager
+from src.managers.order_manager import ORDER_COLUMNS, ORDER_ITEM_COLUMNS
+from src.managers.product_manager import PRODUCT_COLUMNS
+from src.schemas import ProductSchema
+from src.schemas.order import OrderSchema, OrderItemResponseSchema
+
+
+async def legacy_products(Session):
+    async with Session() as session:
+        result = await session.execute(select(Product).order_by(Product.id))
+        return [ProductSchema(**x.as_dict()) for x in result.scalars().all()]
+
+
+async def legacy_orders(Session):
+    async with Session() as session:
+        result = await session.execute(select(Order).options(selectinload(Order.items)))
+        return [OrderSchema(
+            id=order.id,
+            status=order.status,
+            items=[OrderItemResponseSchema(id=x.id, product_id=x.product_id, count=x.count, price=x.price) for x in order.items]
+        ) for order in result.scalars()]
+
+
+async def validated_products(Session):
+    async with Session() as session:
+        result = await session.execute(select(*PRODUCT_COLUMNS).order_by(Product.id))
+        return [ProductSchema.model_validate(dict(x._mapping)) for x in result]
+
+
+async def validated_orders(Session):
+    async with Session() as session:
+        orders = (await session.execute(select(*ORDER_COLUMNS).order_by(Order.id))).all()
+        rows = (await session.execute(
+            select(OrderItem.order_id, *ORDER_ITEM_COLUMNS).order_by(OrderItem.order_id, OrderItem.product_id)
+        )).all()
+    items = {x.id: [] for x in orders}
+    for row in rows:
+        items[row.order_id].append(OrderItemResponseSchema.model_validate(dict(row._mapping)))
+    return [OrderSchema.model_validate({"id": x.id, "status": x.status, "items": items[x.id]}) for x in orders]
+
+
+async def median(func, repeat: int, before=None) -> float:
+    """Медиана, сек."""
+    return statistics.median(await measure(func, repeat, before))
+
+
+async def main(args) -> None:
+    quiet_logs()
+
+    async with temporary_database("read_path") as (engine, Session, _):
+        sizes = await seed(Session, args.products, args.orders, paid_ratio=0)
+        product_api = ProductManager(Session)
+        order_api = OrderManager(Session)
+
+        old, new = await legacy_products(Session), await product_api.get_all_products()
+        assert [x.model_dump() for x in old] == [x.model_dump() for x in new], "Продукты не совпадают"
+        old, new = await legacy_orders(Session), await order_api.get_all_orders()
+        assert [x.model_dump() for x in old] == [x.model_dump() for x in new], "Заказы не совпадают"
+
+        rows = [
+            ("get_all_products", args.products,
+             await median(lambda: legacy_products(Session), args.repeat),
+             await median(lambda: validated_products(Session), args.repeat),
+             await median(product_api.get_all_products, args.repeat, product_api.cache.invalidate)),
+            ("get_all_orders", args.orders + sizes["items"],
+             await median(lambda: legacy_orders(Session), args.repeat),
+             await median(lambda: validated_orders(Session), args.repeat),
+             await median(order_api.get_all_orders, args.repeat)),
+        ]
+
+    print(
+        f"{'метод':<18} | {'строк':>7} | {'было, мс':>9} | {'колонки+валидация':>17} | "
+        f"{'стало, мс':>9} | {'мкс/строку':>22}"
+    )
+    for name, count, before, validated, after in rows:
+        per_row = " → ".join(f"{x / count * 1e6:.1f}" for x in (before, validated, after))
+        print(
+            f"{name:<18} | {count:>7} | {before * 1000:>9.1f} | {validated * 1000:>17.1f} | "
+            f"{after * 1000:>9.1f} | {per_row:>22}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
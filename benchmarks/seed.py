@@ -0,0 +1,95 @@
+"""Заполнение БД для замеров: продукты, заказы и позиции заказов
+
+Данные детерминированы (--seed): одинаковые параметры дают одинаковую
+БД, поэтому замеры разных коммитов сравнимы. Агрегаты продаж
+пересобираются по оплаченным заказам, как после SalesLedger.rebuild.
+
+    python -m benchmarks.seed --url sqlite+aiosqlite:///data/database/bench.db --products 1000 --orders 10000
+"""
+import argparse
+import asyncio
+import random
+from typing import Dict
+
+from benchmarks.common import quiet_logs
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.database.engine import create_engine
+from src.core.database.migrations import migrate
+from src.core.database.models import Order, OrderItem, OrderStatus, Product
+from src.managers import SalesLedger
+
+# Размер пакета вставки: держит число параметров ниже лимита SQLite
+BATCH_SIZE = 2000
+
+
+async def seed(
+    Session: async_sessionmaker[AsyncSession],
+    products: int,
+    orders: int,
+    items: int = 3,
+    paid_ratio: float = 0.5,
+    stock: int = 100_000,
+    rng_seed: int = 0
+) -> Dict[str, int]:
+    """Продукты, заказы с 1..items позициями и их агрегаты; возвращает размеры таблиц"""
+    rng = random.Random(rng_seed)
+    product_rows = [
+        {
+            "title": f"Продукт {i}", "poster": f"data/img/{i}.jpg", "price": round(49.9 + i % 500, 2),
+            "count": stock, "description": "Описание продукта для замеров"
+        }
+        for i in range(products)
+    ]
+    order_rows, item_rows = [], []
+    for order_id in range(1, orders + 1):
+        paid = rng.random() < paid_ratio
+        order_rows.append({"status": (OrderStatus.PAID if paid else OrderStatus.UNPAID).value})
+        for product_id in rng.sample(range(1, products + 1), k=rng.randint(1, min(items, products))):
+            item_rows.append({
+                "order_id": order_id, "product_id": product_id, "count": rng.randint(1, 5),
+                "price": product_rows[product_id - 1]["price"]
+            })
+
+    async with Session() as session:
+        async with session.begin():
+            for table, rows in ((Product, product_rows), (Order, order_rows), (OrderItem, item_rows)):
+                for start in range(0, len(rows), BATCH_SIZE):
+                    await session.execute(insert(table), rows[start:start + BATCH_SIZE])
+
+    if orders:
+        await SalesLedger(Session).rebuild()
+    return {"products": products, "orders": orders, "items": len(item_rows)}
+
+
+async def main(args) -> None:
+    quiet_logs()
+    engine = create_engine(args.url)
+    try:
+        await migrate(engine)
+        sizes = await seed(
+            async_sessionmaker(engine), args.products, args.orders,
+            args.items, args.paid_ratio, args.stock, args.seed
+        )
+    finally:
+        await engine.dispose()
+    print(f"Записано: {sizes}")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Параметры данных, общие для seed и suite"""
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--items", type=int, default=3, help="максимум позиций в заказе")
+    parser.add_argument("--paid-ratio", type=float, default=0.5)
+    parser.add_argument("--stock", type=int, default=100_000, help="остаток каждого продукта (не больше 100 000, как в схеме)")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="БД для заполнения (схема создаётся миграциями)")
+    add_arguments(parser)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,66 @@
+"""Стоимость сериализации /api/v1/productall на большом каталоге
+
+Сравнивается прежний путь FastAPI (dict с моделями → jsonable_encoder →
+json.dumps) с текущим (ResponseSchema → orjson по полям моделей) на одних
+и тех же продуктах из БД, затем замеряется весь запрос через приложение
+(httpx + ASGITransport, без сжатия).
+
+    python -m benchmarks.serialization --products 10000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.common import quiet_logs, temporary_database
+from benchmarks.seed import seed
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.api import create_app
+from src.api.responses import ok
+from src.managers import ProductManager
+
+
+def timeit(func, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = func()
+        times.append(time.perf_counter() - started)
+    return {"ms": round(statistics.median(times) * 1000, 2), "bytes": len(body)}
+
+
+async def main(args) -> None:
+    quiet_logs()
+
+    async with temporary_database("serialization") as (engine, Session, _):
+        await seed(Session, args.products, 0)
+
+        products = await ProductManager(Session).get_all_products()
+        before = timeit(lambda: JSONResponse(jsonable_encoder({'ok': True, 'result': products})).body, args.repeat)
+        after = timeit(lambda: ok(products).body, args.repeat)
+        print(f"Продуктов: {len(products)}")
+        print(f"  jsonable_encoder + json: {before['ms']:>8} мс ({before['bytes']} байт)")
+        print(f"  ResponseSchema + orjson: {after['ms']:>8} мс ({after['bytes']} байт)")
+        print(f"  ускорение: x{before['ms'] / after['ms']:.1f}")
+
+        app = create_app(Session)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            times = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = await client.get("/api/v1/productall", headers={"Accept-Encoding": "identity"})
+                times.append(time.perf_counter() - started)
+                response.raise_for_status()
+        print(f"  GET /api/v1/productall:  {statistics.median(times) * 1000:>8.2f} мс (медиана, кэш продуктов прогрет)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,132 @@
+"""Чтение заказов во время записи из бота для разных профилей SQLite
+
+Писатель (как бот, в отдельном процессе) создаёт и оплачивает заказы,
+читатели (как сайт) листают заказы и считают суммы. Для каждого профиля выводятся число
+чтений/записей в секунду, задержки чтения и количество ошибок.
+
+    python -m benchmarks.sqlite_concurrency --seconds 5 --readers 8
+"""
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import quiet_logs
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.core.database.engine import SQLITE_PROFILES, create_engine
+from src.core.database.models import Base
+from src.managers import OrderManager, ProductManager
+from src.schemas import ProductCreateSchema
+from src.schemas.order import CreateOrderSchema, OrderItemSchema
+
+
+async def seed(Session, products: int, orders: int) -> None:
+    product_api = ProductManager(Session)
+    order_api = OrderManager(Session)
+    for i in range(products):
+        await product_api.create_product(ProductCreateSchema(
+            title=f"Продукт {i}", poster="data/img/none.jpg",
+            price=100 + i, count=100_000, description="benchmark"
+        ))
+    for i in range(orders):
+        await order_api.create_order(CreateOrderSchema(
+            items=[OrderItemSchema(product_id=i % products + 1, count=1)]
+        ))
+
+
+def run_writer(url: str, profile: str, seconds: float, products: int, result) -> None:
+    """Писатель в отдельном процессе: GIL читателей не мешает замеру блокировок"""
+    async def write() -> None:
+        engine = create_engine(url, profile=profile)
+        order_api = OrderManager(async_sessionmaker(engine))
+        deadline = time.perf_counter() + seconds
+        i = 0
+        while time.perf_counter() < deadline:
+            i += 1
+            try:
+                order = await order_api.create_order(CreateOrderSchema(
+                    items=[OrderItemSchema(product_id=i % products + 1, count=1)]
+                ))
+                await order_api.pay_order(order.id)
+                result["writes"] += 1
+            except Exception:
+                result["errors"] += 1
+        await engine.dispose()
+
+    logger.remove()
+    asyncio.run(write())
+
+
+async def run_profile(name: str, path: Path, args) -> dict:
+    url = f"sqlite+aiosqlite:///{path}"
+    engine = create_engine(url, profile=name)
+    Session = async_sessionmaker(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(Session, args.products, args.orders)
+
+    order_api = OrderManager(Session)
+    latencies, errors = [], 0
+    with multiprocessing.Manager() as manager:
+        writes = manager.dict(writes=0, errors=0)
+        writer = multiprocessing.Process(
+            target=run_writer, args=(url, name, args.seconds, args.products, writes)
+        )
+        writer.start()
+        deadline = time.perf_counter() + args.seconds
+
+        async def reader():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    await order_api.get_orders(limit=20)
+                    await order_api.get_revenue()
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(reader() for _ in range(args.readers)))
+        await asyncio.to_thread(writer.join)
+        writes = dict(writes)
+    await engine.dispose()
+
+    latencies.sort()
+    return {
+        "profile": name,
+        "reads/s": round(len(latencies) / args.seconds, 1),
+        "writes/s": round(writes["writes"] / args.seconds, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else None,
+        "errors": errors + writes["errors"]
+    }
+
+
+async def main(args) -> None:
+    quiet_logs()
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.profiles:
+            results.append(await run_profile(name, Path(directory) / f"{name}.db", args))
+
+    columns = list(results[0])
+    print(" | ".join(f"{x:>9}" for x in columns))
+    for row in results:
+        print(" | ".join(f"{str(row[x]):>9}" for x in columns))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--products", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--profiles", nargs="+", default=["legacy", "wal"], choices=list(SQLITE_PROFILES))
+    asyncio.run(main(parser.parse_args()))
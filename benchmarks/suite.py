@@ -0,0 +1,201 @@
+"""Набор замеров: методы менеджеров, отчёт, выручка и основные HTTP-маршруты
+
+БД заполняется benchmarks.seed во временном каталоге, затем каждый
+случай выполняется --repeat раз (после одного прогревочного вызова).
+Кэш продуктов сбрасывается перед случаями с пометкой «холодный». Записи
+(создание и оплата заказов) идут последними, чтобы не менять данные для
+чтений. Итог - таблица и JSON (--output) для сравнения коммитов:
+
+    python -m benchmarks.suite --products 1000 --orders 10000 --output before.json
+    python -m benchmarks.suite --products 1000 --orders 10000 --output after.json
+    python -m benchmarks.compare before.json after.json
+
+--only оставляет случаи, имя которых содержит одну из подстрок.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import random
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.common import measure, quiet_logs, summarize, temporary_database
+from benchmarks.seed import add_arguments, seed
+
+import httpx
+import sqlalchemy
+
+from src.api import create_app
+from src.core.database.models import OrderStatus
+from src.frontend import get_router
+from src.managers import OrderManager, ProductManager
+from src.schemas.order import CreateOrderSchema, OrderItemSchema
+from src.service.orders import OrderProductService
+
+
+@dataclass
+class Case:
+    group: str
+    name: str
+    func: Callable[[], Awaitable[object]]
+    before: Optional[Callable[[], None]] = None
+    repeat: Optional[int] = None  # None - общий --repeat
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_cases(Session, client: httpx.AsyncClient, sizes: Dict[str, int], args) -> List[Case]:
+    product_api = ProductManager(Session)
+    order_api = OrderManager(Session)
+    service = OrderProductService(Session)
+    cold = product_api.cache.invalidate
+    rng = random.Random(args.seed)
+
+    def product_id() -> int:
+        return rng.randint(1, sizes["products"])
+
+    def order_id() -> int:
+        return rng.randint(1, sizes["orders"])
+
+    def new_order() -> CreateOrderSchema:
+        return CreateOrderSchema(items=[
+            OrderItemSchema(product_id=x, count=1)
+            for x in rng.sample(range(1, sizes["products"] + 1), k=min(3, sizes["products"]))
+        ])
+
+    async def iter_products() -> None:
+        async for _ in product_api.iter_products():
+            pass
+
+    async def iter_order_totals() -> None:
+        async for _ in order_api.iter_order_totals():
+            pass
+
+    async def create_and_pay() -> None:
+        order = await order_api.create_order(new_order())
+        await order_api.pay_order(order.id)
+
+    async def generate_report() -> None:
+        # Отчёт пишется по относительному пути REPORT_PATH - во временный каталог
+        with contextlib.chdir(args.directory):
+            if not await service.generate_report():
+                raise RuntimeError("Отчёт не сформирован")
+
+    async def get(url: str) -> None:
+        (await client.get(url)).raise_for_status()
+
+    async def post_order() -> None:
+        response = await client.post("/api/v1/order", json=new_order().model_dump())
+        response.raise_for_status()
+
+    page = min(50, sizes["orders"])
+    return [
+        Case("products", "get_product (холодный)", lambda: product_api.get_product(product_id()), cold),
+        Case("products", "get_product (кэш)", lambda: product_api.get_product(1)),
+        Case("products", "get_products 50 ID (холодный)",
+             lambda: product_api.get_products(rng.sample(range(1, sizes["products"] + 1), k=min(50, sizes["products"]))),
+             cold),
+        Case("products", "get_all_products (холодный)", product_api.get_all_products, cold),
+        Case("products", "get_products_page price", lambda: product_api.get_products_page(limit=48, sort="price")),
+        Case("products", "iter_products", iter_products),
+        Case("orders", "get_order", lambda: order_api.get_order(order_id())),
+        Case("orders", f"get_orders limit={page}", lambda: order_api.get_orders(limit=page)),
+        Case("orders", "get_all_orders", order_api.get_all_orders),
+        Case("orders", "get_order_totals", order_api.get_order_totals),
+        Case("orders", "iter_order_totals", iter_order_totals),
+        Case("revenue", "OrderManager.get_revenue", order_api.get_revenue),
+        Case("revenue", "SalesLedger.get_revenue", service.get_revenue),
+        Case("revenue", "SalesLedger.get_summary", service.ledger.get_summary),
+        Case("report", "generate_report", generate_report, repeat=max(1, args.repeat // 2)),
+        Case("http", "GET /api/v1/productall (кэш)", lambda: get("/api/v1/productall")),
+        Case("http", "GET /api/v1/product/{id} (холодный)", lambda: get(f"/api/v1/product/{product_id()}"), cold),
+        Case("http", "GET /api/v1/catalog", lambda: get("/api/v1/catalog?sort=price")),
+        Case("http", "GET /catalog", lambda: get("/catalog?sort=price")),
+        Case("http", f"GET /api/v1/orders?limit={page}", lambda: get(f"/api/v1/orders?limit={page}")),
+        Case("http", "GET /api/v1/order/{id}", lambda: get(f"/api/v1/order/{order_id()}")),
+        Case("write", "create_order", lambda: order_api.create_order(new_order())),
+        Case("write", "create_order + pay_order", create_and_pay),
+        Case("write", "POST /api/v1/order", post_order),
+    ]
+
+
+async def run(args) -> dict:
+    async with temporary_database("suite", args.profile) as (engine, Session, directory):
+        (directory / "data").mkdir()
+        args.directory = directory
+        sizes = await seed(
+            Session, args.products, args.orders, args.items, args.paid_ratio, args.stock, args.seed
+        )
+
+        app = create_app(Session)
+        app.include_router(get_router(Session))
+        transport = httpx.ASGITransport(app=app)
+        results = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for case in build_cases(Session, client, sizes, args):
+                name = f"{case.group}: {case.name}"
+                if args.only and not any(x in name for x in args.only):
+                    continue
+                repeat = case.repeat or args.repeat
+                # Прогрев: соединения пула, кэш планов SQLite, ленивые импорты
+                await measure(case.func, 1, case.before)
+                results.append({
+                    "group": case.group,
+                    "name": case.name,
+                    **summarize(await measure(case.func, repeat, case.before))
+                })
+                print(f"{name:<52} {results[-1]['p50_ms']:>10.3f} мс", file=sys.stderr)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "profile": args.profile,
+            "repeat": args.repeat
+        },
+        "data": sizes,
+        "results": results
+    }
+
+
+def print_table(report: dict) -> None:
+    print(f"Коммит: {report['meta']['commit']}, данные: {report['data']}")
+    print(f"{'случай':<52} | {'p50, мс':>10} | {'p95, мс':>10} | {'мин, мс':>10}")
+    for row in report["results"]:
+        name = f"{row['group']}: {row['name']}"
+        print(f"{name:<52} | {row['p50_ms']:>10.3f} | {row['p95_ms']:>10.3f} | {row['min_ms']:>10.3f}")
+
+
+async def main(args) -> None:
+    quiet_logs()
+    report = await run(args)
+    print_table(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Результаты: {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--profile", default="wal", help="профиль PRAGMA SQLite")
+    parser.add_argument("--only", nargs="+", help="подстроки имён случаев")
+    parser.add_argument("--output", help="JSON с результатами")
+    asyncio.run(main(parser.parse_args()))
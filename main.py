@@ -2,13 +2,21 @@ import asyncio
 import os
 
 from src.frontend import get_router
+from src.frontend.precompress import precompress
+from src.frontend.static_files import PrecompressedStaticFiles
 from src.api import create_app
 from src.bot.bot import main as run_bot
-from src.core.database.models import Base
-from src.core.const import DATABASE_URL
+from src.core.database.engine import create_engine
+from src.core.database.migrations import migrate
+from src.core import config
+from src.core.logging import setup_logging
+from src.core.metrics import instrument_engine
+from src.core.database.profiler import enable_profiler
+from src.managers.cache import get_product_cache
+from src.managers.reservation import StockReservations
+from src.service.images import poster_images
 
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from fastapi.staticfiles import StaticFiles
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from loguru import logger
 
 import uvicorn
@@ -17,23 +25,35 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 STATIC_DIR = os.path.join(BASE_DIR, "src", "frontend", "static")
 
 
+async def backfill_posters(Session):
+    # Каталог пересобирается с srcset, только если появились новые варианты
+    if await poster_images.backfill():
+        get_product_cache(Session).invalidate()
+
+
 async def main():
+    setup_logging(config.LOG_LEVEL, config.LOG_JSON, config.LOG_SAMPLE_RATE)
     for path in ["data", "data/database", "data/img"]:
         try:
             os.mkdir(path)
         except Exception as e:
             continue
         
-    engine = create_async_engine(DATABASE_URL)
+    engine = create_engine(config.DATABASE_URL, profile=config.SQLITE_PROFILE, **config.pool_options)
+    instrument_engine(engine)
+    if config.SQL_PROFILE:
+        enable_profiler()
     Session = async_sessionmaker(engine)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await migrate(engine)
     app = create_app(Session)
-    app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+    await asyncio.to_thread(precompress, STATIC_DIR)
+    app.mount("/static", PrecompressedStaticFiles(directory=STATIC_DIR), name="static")
         
     app.include_router(get_router(Session))
-    config = uvicorn.Config(app, "0.0.0.0", port=8000)
-    server = uvicorn.Server(config)
+    backfill = asyncio.create_task(backfill_posters(Session))
+    sweeper = asyncio.create_task(StockReservations(Session).run_sweeper())
+    server_config = uvicorn.Config(app, "0.0.0.0", port=8000, log_config=None)
+    server = uvicorn.Server(server_config)
     await asyncio.gather(
         run_bot(Session),
         server.serve()
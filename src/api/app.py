@@ -4,11 +4,24 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.templating import Jinja2Templates
+from .compression import CompressionMiddleware
+from .metrics import MetricsMiddleware
+from .profiler import ProfilerMiddleware
+from .responses import ORJSONResponse
 from .routers import create
+from ..core.config import config
+from ..core.metrics import instrument_product_cache
+from ..managers.cache import get_product_cache
 
 
 def create_app(sessionmaker: async_sessionmaker[AsyncSession]) -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    if config.SQL_PROFILE:
+        app.add_middleware(ProfilerMiddleware, repeat_threshold=config.SQL_REPEAT_THRESHOLD)
+    # Добавлен последним - внешний слой: время запроса вместе со сжатием
+    app.add_middleware(MetricsMiddleware)
+    instrument_product_cache(get_product_cache(sessionmaker))
     for router in create(sessionmaker):
         app.include_router(router)
 
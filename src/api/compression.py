@@ -0,0 +1,112 @@
+"""Сжатие ответов (brotli / gzip) по Accept-Encoding"""
+from typing import Dict, Iterable, Optional
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """Accept-Encoding → {кодировка: q}; без q - 1, кривой q - 0"""
+    result: Dict[str, float] = {}
+    for part in header.split(","):
+        token, *params = [x.strip() for x in part.split(";")]
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        result[token.lower()] = q
+    return result
+
+
+def choose_encoding(header: str, available: Iterable[str]) -> Optional[str]:
+    """Кодировка из available с наибольшим q > 0 (при равенстве - первая в available)
+
+    Кодировки, не названные клиентом, берут q из "*", если он есть.
+    None - отдавать без сжатия.
+    """
+    accepted = accepted_encodings(header)
+    default = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = accepted.get(encoding, default)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _SelectiveResponder:
+    """Не сжимает то, что уже сжато (картинки, архивы и т.п.)"""
+    async def send_with_compression(self, message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            excluded = not content_type.startswith(COMPRESSIBLE_TYPES)
+            await super().send_with_compression(message)
+            self.content_type_is_excluded = self.content_type_is_excluded or excluded
+            return
+        await super().send_with_compression(message)
+
+
+class SelectiveGZipResponder(_SelectiveResponder, GZipResponder):
+    pass
+
+
+class BrotliResponder(_SelectiveResponder, IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int = 4) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self.compressor.process(body)
+        if not more_body:
+            data += self.compressor.finish()
+        return data
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Сжимает динамические ответы: brotli, если клиент и сервер его поддерживают, иначе gzip
+
+    Ответы с уже выставленным Content-Encoding (предсжатая статика,
+    снимок каталога) пропускаются как есть.
+    """
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 6, brotli_quality: int = 4) -> None:
+        super().__init__(app, minimum_size, compresslevel)
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = Headers(scope=scope).get("Accept-Encoding", "")
+        encoding = choose_encoding(accept, ("br", "gzip") if brotli is not None else ("gzip",))
+        if encoding == "br":
+            responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif encoding == "gzip":
+            responder = SelectiveGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+
+        await responder(scope, receive, send)
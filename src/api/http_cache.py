@@ -0,0 +1,78 @@
+"""Условные запросы (ETag / Last-Modified) по версии каталога"""
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from ..managers.cache import ProductCache
+
+CACHE_CONTROL = "no-cache"
+# Методы, для которых совпадение валидаторов означает 304 (RFC 9110, 13.1)
+SAFE_METHODS = ("GET", "HEAD")
+
+
+def catalog_headers(cache: ProductCache, *parts: str) -> Dict[str, str]:
+    """Заголовки-валидаторы для ответа, зависящего от каталога и parts"""
+    tag = cache.etag
+    if parts:
+        tag += "-" + hashlib.md5("|".join(parts).encode()).hexdigest()[:12]
+    return {
+        "ETag": f'"{tag}"',
+        "Last-Modified": formatdate(cache.updated_at, usegmt=True),
+        "Cache-Control": CACHE_CONTROL
+    }
+
+
+def is_not_modified(request: Request, headers: Dict[str, str]) -> bool:
+    """Совпадает ли версия клиента с headers
+
+    If-None-Match важнее If-Modified-Since: при обоих заголовках дата не
+    смотрится. If-Modified-Since учитывается только для GET и HEAD и
+    сравнивается строго: Last-Modified округлён вниз до секунды, и
+    изменение в ту же секунду, что и прошлый ответ, даёт ту же дату.
+    Клиент, повторивший Last-Modified, получает 304 только по ETag.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [x.strip().removeprefix("W/") for x in if_none_match.split(",")]
+        return "*" in tags or headers["ETag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and request.method in SAFE_METHODS:
+        try:
+            return parsedate_to_datetime(if_modified_since) > parsedate_to_datetime(headers["Last-Modified"])
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified(request: Request, headers: Dict[str, str]) -> Optional[Response]:
+    """Ответ на выполненное условие If-None-Match / If-Modified-Since или None
+
+    Для GET и HEAD - 304. Для остальных методов (POST /products)
+    совпадение If-None-Match - невыполненное предусловие, 412.
+    """
+    if not is_not_modified(request, headers):
+        return None
+    if request.method in SAFE_METHODS:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(
+        {
+            'ok': False,
+            'detail': "Не выполнено условие If-None-Match"
+        },
+        status_code=412,
+        headers=headers
+    )
+
+
+def check_catalog(request: Request, response: Response, cache: ProductCache, *parts: str) -> Optional[Response]:
+    """Ответ 304 (412), если у клиента актуальная версия, иначе проставляет заголовки в response"""
+    headers = catalog_headers(cache, *parts)
+    early = not_modified(request, headers)
+    if early is not None:
+        return early
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,43 @@
+"""Метрики HTTP-запросов: число, длительность по маршруту и запросы в обработке"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.metrics import HTTP_REQUESTS, HTTP_LATENCY, HTTP_IN_FLIGHT
+
+
+class MetricsMiddleware:
+    """Снимает метрики каждого HTTP-запроса
+
+    Маршрут берётся из шаблона пути (/api/v1/product/{id}), а не из URL,
+    чтобы число рядов метрик не росло с каждым ID. Запросы вне маршрутов
+    (статика, 404) собираются под одной меткой.
+    """
+    def __init__(self, app: ASGIApp, unmatched: str = "other") -> None:
+        self.app = app
+        self.unmatched = unmatched
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", None) or self.unmatched
+            HTTP_REQUESTS.inc(scope["method"], path, str(status))
+            HTTP_LATENCY.observe(elapsed, scope["method"], path)
@@ -0,0 +1,27 @@
+"""Профилирование SQL по HTTP-запросам (включается SQL_PROFILE)"""
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..core.database.profiler import profile
+
+
+class ProfilerMiddleware:
+    """Открывает единицу работы профилировщика SQL на каждый HTTP-запрос
+
+    Итог пишется в лог под шаблоном маршрута (GET /api/v1/product/{id}).
+    """
+    def __init__(self, app: ASGIApp, repeat_threshold: int) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profile(f"{scope['method']} {scope['path']}", self.repeat_threshold) as unit:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    unit.name = f"{scope['method']} {route.path}"
@@ -0,0 +1,43 @@
+"""JSON-ответы API через orjson"""
+__all__ = [
+    "ORJSONResponse",
+    "ok"
+]
+
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from ..schemas.response import ResponseSchema
+
+
+def _default(obj: Any) -> Any:
+    # Поля модели pydantic v2 лежат в __dict__: orjson обходит их сам,
+    # без промежуточного dict от model_dump / jsonable_encoder. Схемы API
+    # не используют алиасы и собственные сериализаторы полей.
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Тип {type(obj).__name__} не сериализуется в JSON")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON-ответ, сериализованный orjson (модели pydantic - по полям)"""
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def ok(result: Any, response: Optional[Response] = None) -> ORJSONResponse:
+    """Успешный ответ {'ok': True, 'result': result}
+
+    Ответ возвращается из обработчика готовым, поэтому FastAPI не
+    проверяет и не перекодирует result повторно (response_model маршрута
+    остаётся для документации). Заголовки, выставленные в response
+    (параметр обработчика), переносятся в ответ.
+    """
+    content = ORJSONResponse(ResponseSchema.model_construct(ok=True, result=result))
+    if response is not None:
+        content.headers.update(response.headers)
+    return content
@@ -7,10 +7,12 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from .product_api import prod_router_init
 from .order_api import order_router_init
 from .robots import router
+from .metrics import router as metrics_router
 
 def create(session: async_sessionmaker[AsyncSession]) -> List[APIRouter]:
     return [
         prod_router_init(session),
         order_router_init(session),
-        router
+        router,
+        metrics_router
     ]
\ No newline at end of file
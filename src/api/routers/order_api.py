@@ -1,24 +1,36 @@
-from typing import Literal
+from typing import Any, List, Literal, Optional
 
 from sqlalchemy.ext.asyncio import async_sessionmaker
-from fastapi import APIRouter
+from fastapi import APIRouter, Body, Query
 from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 
+from ...core.const import BULK_ORDERS_LIMIT
 from ...core.database.models import OrderStatus
+from ...core.exceptions import OrderNotFoundError, OrderAlreadyPaidError, OutOfStockError, ProductNotFoundError
 from ...managers import OrderManager
-from ...schemas.order import OrderItemSchema, CreateOrderSchema
+from ...schemas.order import (
+    OrderItemSchema, CreateOrderSchema, OrderSchema, OrderPageSchema, BulkOrderSchema, BulkOrderResultSchema
+)
+from ...schemas.response import ResponseSchema, DetailSchema
+from ..responses import ok
 
 def order_router_init(session_maker: async_sessionmaker):
     api = OrderManager(session_maker)
     router = APIRouter(prefix="/api/v1", tags=['Order'])
     
-    @router.post('/order')
+    @router.post('/order', response_model=ResponseSchema[OrderSchema])
     async def create_order(order: CreateOrderSchema):
         try:
-            return {
-                'ok': True,
-                'result': await api.create_order(order)
-            }
+            return ok(await api.create_order(order))
+        except OutOfStockError as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=409
+            )
         except Exception as e:
             return JSONResponse(
                 {
@@ -29,13 +41,79 @@ def order_router_init(session_maker: async_sessionmaker):
             )
     
     
-    @router.get("/order/{id}")
+    @router.post('/orders/bulk', response_model=ResponseSchema[BulkOrderSchema])
+    async def create_orders(orders: List[Any] = Body(...)):
+        """Пакетное создание заказов: каждый заказ проверяется отдельно"""
+        if len(orders) > BULK_ORDERS_LIMIT:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': f"Слишком много заказов в пакете: {len(orders)} (максимум {BULK_ORDERS_LIMIT})"
+                },
+                status_code=413
+            )
+        
+        results: List[BulkOrderResultSchema] = []
+        positions: List[int] = []
+        valid: List[CreateOrderSchema] = []
+        for index, raw in enumerate(orders):
+            try:
+                valid.append(CreateOrderSchema.model_validate(raw))
+                positions.append(index)
+            except ValidationError as e:
+                errors = "; ".join(
+                    f"{'.'.join(map(str, x['loc'])) or 'order'}: {x['msg']}" for x in e.errors()
+                )
+                results.append(BulkOrderResultSchema(index=index, error=errors))
+        
+        try:
+            for result in await api.create_orders(valid):
+                result.index = positions[result.index]
+                results.append(result)
+        except Exception as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=500
+            )
+        
+        results.sort(key=lambda x: x.index)
+        created = sum(1 for x in results if x.id is not None)
+        return ok(BulkOrderSchema(created=created, failed=len(results) - created, orders=results))
+    
+    @router.get('/orders', response_model=ResponseSchema[OrderPageSchema])
+    async def get_orders(
+        cursor: Optional[int] = None,
+        limit: int = Query(50, ge=1, le=500),
+        status: Optional[Literal["Оплачен", "Неоплаченный"]] = None,
+        min_id: Optional[int] = None,
+        max_id: Optional[int] = None,
+        items: bool = True
+    ):
+        try:
+            return ok(await api.get_orders(
+                cursor=cursor,
+                limit=limit,
+                status=OrderStatus(status) if status else None,
+                min_id=min_id,
+                max_id=max_id,
+                with_items=items
+            ))
+        except Exception as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=500
+            )
+    
+    @router.get("/order/{id}", response_model=ResponseSchema[Optional[OrderSchema]])
     async def ger_order(id: int):
         try:
-            return {
-                'ok': True,
-                'result': await api.get_order(id) 
-            }
+            return ok(await api.get_order(id))
         except Exception as e:
             return JSONResponse(
                 {
@@ -45,14 +123,11 @@ def order_router_init(session_maker: async_sessionmaker):
                 status_code=500
             )
             
-    @router.delete('/order/{id}')
+    @router.delete('/order/{id}', response_model=DetailSchema)
     async def delete_order(id: int):
         try:
-            ok, detail = await api.delete_order(id)
-            return {
-                'ok': ok,
-                'detail': detail
-            }
+            result, detail = await api.delete_order(id)
+            return DetailSchema(ok=result, detail=detail)
         except Exception as e:
             return JSONResponse(
                 {
@@ -63,14 +138,26 @@ def order_router_init(session_maker: async_sessionmaker):
             )
     
     
-    @router.patch('/order/{id}')
+    @router.patch('/order/{id}', response_model=ResponseSchema[OrderSchema])
     async def update_order(id: int, order: OrderItemSchema):
         try:
-            data = await api.update_order(id, order)
-            return {
-                'ok': True,
-                'result': data
-            }
+            return ok(await api.update_order(id, order))
+        except (OrderNotFoundError, ProductNotFoundError) as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=404
+            )
+        except OutOfStockError as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=409
+            )
         except Exception as e:
             return JSONResponse(
                 {
@@ -99,6 +186,51 @@ def order_router_init(session_maker: async_sessionmaker):
             return {
                 'ok': True
             }
+        except OrderNotFoundError as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=404
+            )
+        except OutOfStockError as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=409
+            )
+        except Exception as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=500
+            )
+
+    @router.post('/order/{id}/pay', response_model=ResponseSchema[OrderSchema])
+    async def pay_order(id: int):
+        try:
+            return ok(await api.pay_order(id))
+        except OrderNotFoundError as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=404
+            )
+        except (OrderAlreadyPaidError, OutOfStockError) as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=409
+            )
         except Exception as e:
             return JSONResponse(
                 {
@@ -1,25 +1,32 @@
-from typing import List
+from typing import List, Literal, Optional
 
 from sqlalchemy.ext.asyncio import async_sessionmaker
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from ...schemas.product import ProductCreateSchema, ProductUpdateSchema
+from ..http_cache import check_catalog
+from ..responses import ok
+from ...core.const import CATALOG_PAGE_SIZE
+from ...core.exceptions import ProductInUseError
+from ...managers.product_manager import SortField
+from ...schemas.product import (
+    ProductCreateSchema, ProductUpdateSchema, ProductSchema, ProductPageSchema, ProductImportSchema
+)
+from ...schemas.response import ResponseSchema, DetailSchema
+from ...service.images import poster_images
+from ...service.product_io import ProductTransferService, FORMATS
 
 def prod_router_init(session_maker: async_sessionmaker):
     from ...managers import ProductManager
     
     api = ProductManager(session_maker)
+    transfer = ProductTransferService(session_maker)
     router = APIRouter(prefix="/api/v1", tags=['Product'])
 
-    @router.patch("/product")       
+    @router.patch("/product", response_model=ResponseSchema[ProductSchema])
     async def update_product(product: ProductUpdateSchema):
         try:
-            result = await api.update_product(product)
-            return {
-                'ok': True,
-                'result': result
-            }
+            return ok(await api.update_product(product))
         except Exception as e:
             return JSONResponse(
                 {
@@ -29,14 +36,10 @@ def prod_router_init(session_maker: async_sessionmaker):
                 status_code=500
             )
 
-    @router.post("/product")
+    @router.post("/product", response_model=ResponseSchema[ProductSchema])
     async def create_product(product: ProductCreateSchema):
         try:
-            result = await api.create_product(product)
-            return {
-                'ok': True,
-                'result': result
-            }
+            return ok(await api.create_product(product))
         except Exception as e:
             return JSONResponse(
                 {
@@ -46,14 +49,13 @@ def prod_router_init(session_maker: async_sessionmaker):
                 status_code=500
             )
         
-    @router.get("/product/{id}")
-    async def get_product(id: int):
+    @router.get("/product/{id}", response_model=ResponseSchema[Optional[ProductSchema]])
+    async def get_product(id: int, request: Request, response: Response):
+        not_modified = check_catalog(request, response, api.cache)
+        if not_modified:
+            return not_modified
         try:
-            result = await api.get_product(id)
-            return {
-                'ok': True,
-                'result': result
-            }
+            return ok(await api.get_product(id), response)
         except Exception as e:
             return JSONResponse(
                 {
@@ -63,14 +65,19 @@ def prod_router_init(session_maker: async_sessionmaker):
                 status_code=500
             )
             
-    @router.delete("/product/{id}")
+    @router.delete("/product/{id}", response_model=DetailSchema)
     async def delete_product(id: int):
         try:
             result, detail = await api.delete_product(id)
-            return {
-                'ok': result,
-                'detail': detail
-            }
+            return DetailSchema(ok=result, detail=detail)
+        except ProductInUseError as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=409
+            )
         except Exception as e:
             return JSONResponse(
                 {
@@ -80,13 +87,13 @@ def prod_router_init(session_maker: async_sessionmaker):
                 status_code=500
             )
     
-    @router.get("/productall")
-    async def get_all_product():
+    @router.get("/productall", response_model=ResponseSchema[List[ProductSchema]])
+    async def get_all_product(request: Request, response: Response):
+        not_modified = check_catalog(request, response, api.cache)
+        if not_modified:
+            return not_modified
         try:
-            return {
-                'ok': True,
-                'result': await api.get_all_products()
-            }
+            return ok(await api.get_all_products(), response)
         except Exception as e:
             return JSONResponse(
                 {
@@ -96,13 +103,42 @@ def prod_router_init(session_maker: async_sessionmaker):
                 status_code=500
             )
     
-    @router.post("/products")
-    async def get_products(ids: List[int]):
+    @router.get("/catalog", response_model=ResponseSchema[ProductPageSchema])
+    async def get_catalog_page(
+        cursor: Optional[str] = None,
+        limit: int = Query(CATALOG_PAGE_SIZE, ge=1, le=200),
+        sort: SortField = "id",
+        desc: bool = False,
+        in_stock: bool = False
+    ):
+        try:
+            page = await api.get_products_page(cursor, limit, sort, desc, in_stock)
+            page.posters = {x.id: poster_images.srcset(x.poster) for x in page.products}
+            return ok(page)
+        except ValueError as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=400
+            )
+        except Exception as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=500
+            )
+    
+    @router.post("/products", response_model=ResponseSchema[List[ProductSchema]])
+    async def get_products(ids: List[int], request: Request, response: Response):
+        not_modified = check_catalog(request, response, api.cache, *map(str, sorted(set(ids))))
+        if not_modified:
+            return not_modified
         try: 
-            return {
-                'ok': True,
-                'result': await api.get_products(ids)
-            }
+            return ok(await api.get_products(ids), response)
         except Exception as e:
             return JSONResponse(
                 {
@@ -111,4 +147,34 @@ def prod_router_init(session_maker: async_sessionmaker):
                 },
                 status_code=500
             )
+    @router.post("/products/import", response_model=ResponseSchema[ProductImportSchema])
+    async def import_products(request: Request, format: Literal["csv", "jsonl"] = "csv"):
+        """Импорт каталога: тело запроса - файл CSV или JSONL (читается потоком)"""
+        try:
+            return ok(await transfer.import_products(request.stream(), format))
+        except ValueError as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=400
+            )
+        except Exception as e:
+            return JSONResponse(
+                {
+                    'ok': False,
+                    'detail': str(e)
+                },
+                status_code=500
+            )
+    
+    @router.get("/products/export")
+    async def export_products(format: Literal["csv", "jsonl"] = "csv"):
+        return StreamingResponse(
+            transfer.export_products(format),
+            media_type=FORMATS[format],
+            headers={"Content-Disposition": f'attachment; filename="products.{format}"'}
+        )
+    
     return router
\ No newline at end of file
@@ -12,6 +12,8 @@ HELP_TXT = \
 """
 <b>Основнеы команды</b>
 /report - Получить отчёт
+/revenue - Сводка продаж (мгновенно)
+/rebuild - Пересчитать сводку продаж по заказам
 /login - Авторизация в систему пример
 <code>/login [Ваш логин] [Пароль]</code>
 
@@ -24,6 +26,9 @@ HELP_TXT = \
 /delprod [ID] - Удалит продукт
 /setprod [ID] - Корректировать продукт
 /getprod [ID] - Получить продукт 
+/export [csv|jsonl] - Выгрузить каталог
+Пришлите файл .csv или .jsonl - импорт каталога
+(поиск по external_id, иначе по названию)
 
 <b>Работа с заказами</b>
 /getord [ID] - Получить заказ (Полная информация)
@@ -1,5 +1,3 @@
-import logging
-
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from aiogram import Bot, Dispatcher
 from aiogram.types import BotCommand
@@ -10,6 +8,8 @@ from loguru import logger
 
 from ..core.config import config
 from .handlers import init
+from .metrics import MetricsMiddleware
+from .profiler import ProfilerMiddleware
 
 async def set_command(bot: Bot):
     command = [
@@ -23,10 +23,6 @@ async def set_command(bot: Bot):
 
 async def main(session_maker: async_sessionmaker[AsyncSession]):
     logger.info("Запуск бота...")
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-    )
     bot = Bot(
         token=config.BOT_TOKEN,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
@@ -37,6 +33,12 @@ async def main(session_maker: async_sessionmaker[AsyncSession]):
     dp = Dispatcher(storage=storage)
     
     dp.include_routers(*init(session_maker))
+    # Внутренние middleware диспетчера действуют и во вложенных роутерах
+    dp.message.middleware(MetricsMiddleware())
+    dp.callback_query.middleware(MetricsMiddleware())
+    if config.SQL_PROFILE:
+        dp.message.middleware(ProfilerMiddleware(config.SQL_REPEAT_THRESHOLD))
+        dp.callback_query.middleware(ProfilerMiddleware(config.SQL_REPEAT_THRESHOLD))
     logger.info("Команды инициализированы")
     try:
         await bot.delete_webhook(drop_pending_updates=True)
@@ -9,6 +9,7 @@ from .create_product import product_add_router
 from .order import init_order_router
 from .login import get_auth_router
 from .report import get_report_router
+from .product_io import get_product_io_router
 from ...managers.login_manager import UserManager
 
 router = Router()
@@ -25,6 +26,7 @@ def init(session_maker: async_sessionmaker[AsyncSession]):
     product_api = product_api_router(session_maker, user_manager)
     order = init_order_router(session_maker, user_manager)
     login_api = get_auth_router(user_manager)
-    report_api = get_report_router(session_maker)
+    report_api = get_report_router(session_maker, user_manager)
+    product_io = get_product_io_router(session_maker, user_manager)
     
-    return [start_router, product_api, product_router, order, login_api, report_api, router]
\ No newline at end of file
+    return [start_router, product_api, product_router, order, login_api, report_api, product_io, router]
\ No newline at end of file
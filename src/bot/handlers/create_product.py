@@ -11,6 +11,7 @@ from aiogram.fsm.context import FSMContext
 from ..state import AddProduct
 from ...core.const import PATH_TO_SAVE_IMAGE
 from ...schemas import ProductCreateSchema
+from ...service.images import poster_images
 from ...tools import get_poster
 from ...managers.login_manager import UserManager
 
@@ -85,6 +86,8 @@ def product_add_router(session_maker: async_sessionmaker[AsyncSession], user_man
         download_path = PATH_TO_SAVE_IMAGE / (photo_id + Path(file.file_path).suffix if file.file_path else ".jpg")
         
         await message.bot.download_file(file.file_path, download_path)
+        download_path = await poster_images.store(download_path)
+        await poster_images.process(download_path)
         try:
             product = await add_data(data, download_path)
         except Exception as e:
@@ -6,9 +6,8 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
-from ...core.database.models import OrderStatus
+from ...core.exceptions import OrderError, OrderNotFoundError, OutOfStockError
 from ...managers.login_manager import UserManager
-from ...schemas.product import ProductUpdateSchema
 
 def create_manager(session_maker: async_sessionmaker[AsyncSession]):
     from ...managers import OrderManager
@@ -18,6 +17,11 @@ def product_manager(session_maker: async_sessionmaker[AsyncSession]):
     from ...managers import ProductManager
     return ProductManager(session_maker)
 
+def booked_prices(order, items):
+    """Цены, по которым продукты записаны в заказ (для старых позиций - текущие)"""
+    prices = {x.product_id: x.price for x in order.items}
+    return {x.id: x.price if prices.get(x.id) is None else prices[x.id] for x in items}
+
 def init_order_router(session_maker: async_sessionmaker[AsyncSession], user_manager: UserManager):
     api = create_manager(session_maker)
     product_api = product_manager(session_maker)
@@ -26,20 +30,17 @@ def init_order_router(session_maker: async_sessionmaker[AsyncSession], user_mana
     @router.callback_query(F.data.startswith("updord-"))
     async def update_order(call: CallbackQuery):
         order_id = int(call.data.split('-')[1])
-        await api.update_status(order_id, OrderStatus.PAID)
+        try:
+            order = await api.pay_order(order_id)
+        except (OrderError, OutOfStockError) as e:
+            await call.answer(str(e), show_alert=True)
+            return
+        
         await call.message.delete()
-        order = await api.get_order(order_id)
         ids = {x.product_id: x.count for x in order.items}
-        
-        for id, values in ids.items():
-            prod = await product_api.get_product(id)
-            if not prod:
-                continue
-            
-            await product_api.update_product(ProductUpdateSchema(id = prod.id, count=prod.count - values))
-            
         items = await product_api.get_products(list(ids.keys()))
-        total_price = sum([x.price * ids[x.id] for x in items])
+        prices = booked_prices(order, items)
+        total_price = sum([prices[x.id] * ids[x.id] for x in items])
         await call.message.answer(
 (
 f"""ID заказа <b>{order.id}</b>
@@ -47,7 +48,7 @@ f"""ID заказа <b>{order.id}</b>
 Итоговая цена заказа <b>{total_price} руб.</b>\n
 В заказ входят такие продукты как:\n
 {'\n'.join(
-    [f"{x.id} X {x.title} - {x.price} руб" for x in items]
+    [f"{x.id} X {x.title} - {prices[x.id]} руб" for x in items]
 )}
 """
 )
@@ -70,7 +71,8 @@ f"""ID заказа <b>{order.id}</b>
                 return
             ids = {x.product_id: x.count for x in order.items}
             items = await product_api.get_products([x for x in ids.keys()])
-            total_price = sum([x.price * ids[x.id] for x in items])
+            prices = booked_prices(order, items)
+            total_price = sum([prices[x.id] * ids[x.id] for x in items])
             await message.answer(
                 (
 f"""ID заказа <b>{order.id}</b>
@@ -78,7 +80,7 @@ f"""ID заказа <b>{order.id}</b>
 Итоговая цена заказа <b>{total_price} руб.</b>\n
 В заказ входят такие продукты как:\n
 {'\n'.join(
-    [f"{x.count} X {x.title} - {x.price * ids[x.id]} руб" if x.count else f"{x.title} - НЕТ В НАЛИЧИИ" for x in items]
+    [f"{x.count} X {x.title} - {prices[x.id] * ids[x.id]} руб" if x.count else f"{x.title} - НЕТ В НАЛИЧИИ" for x in items]
 )}
 """
                 ), reply_markup=InlineKeyboardMarkup(
@@ -107,19 +109,15 @@ f"""ID заказа <b>{order.id}</b>
             _, id = message.text.split()
             id = int(id)
 
-            order = await api.get_order(id)
-            if not order:
+            try:
+                await api.pay_order(id)
+            except OrderNotFoundError:
                 await message.answer(f"Не найден заказ по ID {id}")
                 return
+            except (OrderError, OutOfStockError) as e:
+                await message.answer(f"Не удалось оплатить заказ: {e}")
+                return
             
-            for id, values in {x.product_id: x.count for x in order.items}.items():
-                prod = await product_api.get_product(id)
-                if not prod:
-                    continue
-                
-                await product_api.update_product(ProductUpdateSchema(id = prod.id, count=prod.count - values))
-                
-            await api.update_status(id)
             await message.answer("Заказ оплачен!")
         except ValueError:
             await message.answer(
@@ -8,6 +8,7 @@ from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from .update import update_init
 from ...schemas import ProductSchema
 from ...tools import  get_poster
+from ...core.exceptions import ProductInUseError
 from ...managers.login_manager import UserManager
 
 def create_manager(session_maker: async_sessionmaker[AsyncSession]):
@@ -78,7 +79,10 @@ def product_api_router(session_maker: async_sessionmaker[AsyncSession], user_man
             if not id.isdigit():
                 await message.answer("ID должен быть числом")
                 return
-            ok, text = await manager.delete_product(int(id))
+            try:
+                ok, text = await manager.delete_product(int(id))
+            except ProductInUseError as e:
+                ok, text = False, str(e)
             await message.answer(
                 (
                     "Продукт удалён: " + ("✅" if ok else "❌") + "\n"
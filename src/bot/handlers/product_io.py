@@ -0,0 +1,78 @@
+from html import escape
+from typing import AsyncIterator, BinaryIO
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from aiogram import Router, F
+from aiogram.types import Message, BufferedInputFile
+from aiogram.filters import Command
+from loguru import logger
+
+from ...service.product_io import ProductTransferService, FORMATS, detect_format
+from ...managers.login_manager import UserManager
+
+
+async def read_chunks(file: BinaryIO, size: int = 1 << 16) -> AsyncIterator[bytes]:
+    while chunk := file.read(size):
+        yield chunk
+
+
+def get_product_io_router(session_maker: async_sessionmaker[AsyncSession], user_manager: UserManager):
+    router = Router()
+
+    api = ProductTransferService(session_maker)
+
+    @router.message(Command("export"))
+    async def export_products(message: Message):
+        if not await user_manager.is_auth(message.chat.id):
+            await message.answer(
+                "У вас нет прав на это действие"
+            )
+            return
+        parts = message.text.split()
+        format = parts[1].lower() if len(parts) > 1 else "csv"
+        if format not in FORMATS:
+            await message.answer("Пример: <code>/export csv</code> или <code>/export jsonl</code>")
+            return
+        try:
+            await message.bot.send_chat_action(message.chat.id, 'upload_document')
+            data = b"".join([chunk async for chunk in api.export_products(format)])
+            await message.answer_document(
+                BufferedInputFile(data, f"products.{format}"),
+                caption="Каталог продуктов. Исправьте файл и пришлите обратно для импорта"
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при выгрузке каталога: {e}")
+            await message.answer("Ой! У нас неполадки пожалуйста сделайте запрос позже")
+
+    @router.message(F.document.file_name.regexp(r"(?i)\.(csv|jsonl|ndjson)$"))
+    async def import_products(message: Message):
+        if not await user_manager.is_auth(message.chat.id):
+            await message.answer(
+                "У вас нет прав на это действие"
+            )
+            return
+        try:
+            await message.bot.send_chat_action(message.chat.id, 'typing')
+            file = await message.bot.download(message.document)
+            result = await api.import_products(read_chunks(file), detect_format(message.document.file_name))
+        except ValueError as e:
+            await message.answer(f"Не удалось разобрать файл: {escape(str(e))}")
+            return
+        except Exception as e:
+            logger.error(f"Ошибка при импорте каталога: {e}")
+            await message.answer("Ой! У нас неполадки пожалуйста сделайте запрос позже")
+            return
+
+        # В ошибках текст из файла: без экранирования "<" ломает HTML-разметку
+        errors = "\n".join(f"Строка {x.line}: {escape(x.error)}" for x in result.errors[:10])
+        await message.answer(
+            (
+                "Импорт завершён ✅\n"
+                f"Добавлено: <b>{result.created}</b>\n"
+                f"Обновлено: <b>{result.updated}</b>\n"
+                f"С ошибками: <b>{result.failed}</b>"
+                + (f"\n\n{errors}" if errors else "")
+            )
+        )
+
+    return router
@@ -8,9 +8,10 @@ from loguru import logger
 
 from ...service.orders import OrderProductService
 from ...core.const import REPORT_PATH
+from ...managers.login_manager import UserManager
 
 
-def get_report_router(session_maker: async_sessionmaker[AsyncSession]):
+def get_report_router(session_maker: async_sessionmaker[AsyncSession], user_manager: UserManager):
     router = Router()
     
     api = OrderProductService(session_maker)
@@ -28,4 +29,53 @@ def get_report_router(session_maker: async_sessionmaker[AsyncSession]):
             logger.error(f"Ошибка при попытке отправить отчёт: {e}")
             await message.answer("Ой! У нас неполадки пожалуйста сделайте запрос позже")
     
+    @router.message(Command("revenue"))
+    async def get_revenue(message: Message):
+        if not await user_manager.is_auth(message.chat.id):
+            await message.answer(
+                "У вас нет прав на это действие"
+            )
+            return
+        try:
+            summary = await api.ledger.get_summary()
+            statuses = "\n".join(
+                f"{x.status}: {x.orders} шт. на {round(x.amount, 2)} руб." for x in summary.statuses
+            ) or "Заказов пока нет"
+            days = "\n".join(
+                f"{x.day:%d.%m.%Y}: {x.orders} шт. - {round(x.revenue, 2)} руб." for x in summary.days
+            ) or "Оплат пока нет"
+            products = "\n".join(
+                f"ID {x.product_id}: {x.units} шт. - {round(x.revenue, 2)} руб." for x in summary.products
+            ) or "Продаж пока нет"
+            await message.answer(
+                (
+                    f"<b>Сводка продаж</b>\n{statuses}\n\n"
+                    f"<b>По дням</b>\n{days}\n\n"
+                    f"<b>Популярные продукты</b>\n{products}"
+                )
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при получении сводки: {e}")
+            await message.answer("Ой! У нас неполадки пожалуйста сделайте запрос позже")
+    
+    @router.message(Command("rebuild"))
+    async def rebuild_ledger(message: Message):
+        if not await user_manager.is_auth(message.chat.id):
+            await message.answer(
+                "У вас нет прав на это действие"
+            )
+            return
+        try:
+            result = await api.ledger.rebuild()
+            await message.answer(
+                (
+                    "Сводка пересчитана ✅\n"
+                    f"Выручка: {result.revenue_before} → {result.revenue_after} руб.\n"
+                    f"Корректировка за сегодня: {result.daily_adjustment} руб."
+                )
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при пересчёте сводки: {e}")
+            await message.answer("Ой! У нас неполадки пожалуйста сделайте запрос позже")
+    
     return router
\ No newline at end of file
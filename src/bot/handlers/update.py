@@ -7,6 +7,7 @@ from aiogram.fsm.context import FSMContext
 from ...schemas.product import ProductUpdateSchema
 from ...managers import ProductManager
 from ...core.const import PATH_TO_SAVE_IMAGE
+from ...service.images import poster_images
 from ..state import Update
 
 def update_init(api: ProductManager):
@@ -168,6 +169,8 @@ def update_init(api: ProductManager):
             PATH_TO_SAVE_IMAGE.mkdir(parents=True, exist_ok=True)
             download_path = PATH_TO_SAVE_IMAGE / (photo_id + Path(file.file_path).suffix if file.file_path else ".jpg")
             await message.bot.download_file(file.file_path, download_path)
+            download_path = await poster_images.store(download_path)
+            await poster_images.process(download_path)
             
             upd = ProductUpdateSchema(id=data['product_id'], poster = str(download_path))
             await api.update_product(upd)
@@ -0,0 +1,35 @@
+"""Метрики обработчиков бота: число вызовов, ошибки и длительность"""
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from ..core.metrics import BOT_UPDATES, BOT_LATENCY, BOT_IN_FLIGHT
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """Внутренний middleware: вызывается только для найденного обработчика
+
+    Метка - имя функции обработчика (get_report, pay_order...): она
+    различает и команды, и шаги FSM, у которых нет текста команды.
+    """
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        handler_object = data.get("handler")
+        name = getattr(getattr(handler_object, "callback", None), "__name__", "unknown")
+        status = "error"
+        BOT_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            result = await handler(event, data)
+            status = "ok"
+            return result
+        finally:
+            BOT_IN_FLIGHT.dec()
+            BOT_LATENCY.observe(time.perf_counter() - started, name)
+            BOT_UPDATES.inc(name, status)
@@ -0,0 +1,24 @@
+"""Профилирование SQL по событиям бота (включается SQL_PROFILE)"""
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from ..core.database.profiler import profile
+
+
+class ProfilerMiddleware(BaseMiddleware):
+    """Открывает единицу работы профилировщика SQL на каждый вызов обработчика"""
+    def __init__(self, repeat_threshold: int):
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        handler_object = data.get("handler")
+        name = getattr(getattr(handler_object, "callback", None), "__name__", "unknown")
+        with profile(f"бот: {name}", self.repeat_threshold):
+            return await handler(event, data)
@@ -1,11 +1,34 @@
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from dotenv import load_dotenv
 
+from .const import DATABASE_URL, LOG_SAMPLE_RATE, SQL_REPEAT_THRESHOLD
+
 load_dotenv()
 
+
+def _get_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} должен быть целым числом, получено: {value}")
+
+
+def _get_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} должен быть числом, получено: {value}")
+
+
 @dataclass
 class Config:
     """Конфигурация приложения"""
@@ -16,6 +39,25 @@ class Config:
         self.BOT_TOKEN = os.getenv("BOT_TOKEN")
         self.API_TOKEN = os.getenv("API_TOKEN")
         self.DEBUG = bool(os.getenv("DEBUG")) if os.getenv("DEBUG") else False
+        # БД: по умолчанию файл SQLite, для PostgreSQL - postgresql+asyncpg://...
+        self.DATABASE_URL = os.getenv("DATABASE_URL", DATABASE_URL)
+        # Профиль PRAGMA для SQLite: wal, durable или legacy (см. database/engine.py)
+        self.SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "wal")
+        # Пул соединений; пустое значение - значение по умолчанию для драйвера
+        self.DB_POOL_SIZE = _get_int("DB_POOL_SIZE")
+        self.DB_MAX_OVERFLOW = _get_int("DB_MAX_OVERFLOW")
+        self.DB_POOL_RECYCLE = _get_int("DB_POOL_RECYCLE")
+        self.DB_POOL_PRE_PING = (
+            os.getenv("DB_POOL_PRE_PING").lower() in ("1", "true", "yes")
+            if os.getenv("DB_POOL_PRE_PING") else None
+        )
+        # Логи: уровень, JSON-строки вместо текста и доля сообщений частых чтений
+        self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+        self.LOG_JSON = os.getenv("LOG_JSON", "").lower() in ("1", "true", "yes")
+        self.LOG_SAMPLE_RATE = _get_float("LOG_SAMPLE_RATE", LOG_SAMPLE_RATE)
+        # Профилировщик SQL (для разработки): запросы на HTTP-запрос и событие бота
+        self.SQL_PROFILE = os.getenv("SQL_PROFILE", "").lower() in ("1", "true", "yes")
+        self.SQL_REPEAT_THRESHOLD = _get_int("SQL_REPEAT_THRESHOLD") or SQL_REPEAT_THRESHOLD
         self._validate()
     
     def _validate(self):
@@ -25,6 +67,17 @@ class Config:
         if not self.API_TOKEN:
             raise ValueError("API_TOKEN не установлен")
     
+    @property
+    def pool_options(self) -> Dict[str, Any]:
+        """Явно заданные параметры пула для create_engine"""
+        options = {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING
+        }
+        return {key: value for key, value in options.items() if value is not None}
+
     @property
     def is_configured(self) -> bool:
         """Проверка, что все обязательные параметры установлены"""
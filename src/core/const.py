@@ -10,4 +10,38 @@ DATA_BASE_NAME = "db.db"
 DATABASE_URL = f"sqlite+aiosqlite:///{PATH_TO_DATABASE / DATA_BASE_NAME}"
 
 # Путь к отчётам
-REPORT_PATH = DATA_DIR / "report.xlsx"
\ No newline at end of file
+REPORT_PATH = DATA_DIR / "report.xlsx"
+
+# Размер порции заказов при потоковой генерации отчёта
+REPORT_CHUNK_SIZE = 1000
+
+# Количество продуктов на одной странице каталога
+CATALOG_PAGE_SIZE = 48
+
+# Снимок каталога пересобирается не чаще раза в столько секунд
+CATALOG_SNAPSHOT_INTERVAL = 2.0
+
+# Кэш продуктов: время жизни записи (сек.) и максимальный размер
+PRODUCT_CACHE_TTL = 60
+PRODUCT_CACHE_SIZE = 4096
+
+# Ширины вариантов постера (px) для srcset
+POSTER_WIDTHS = (320, 640, 1280)
+
+# Максимум заказов в одном запросе /api/v1/orders/bulk
+BULK_ORDERS_LIMIT = 1000
+
+# Импорт продуктов: размер пакета записи и сколько ошибок возвращать
+IMPORT_BATCH_SIZE = 500
+IMPORT_ERRORS_LIMIT = 100
+
+# Резерв остатков под неоплаченный заказ: время жизни (сек.) и период проверки истёкших
+RESERVATION_TTL = 15 * 60
+RESERVATION_SWEEP_INTERVAL = 30
+
+# Доля сообщений DEBUG/INFO, которые пишут частые чтения (get_product, get_products)
+LOG_SAMPLE_RATE = 0.1
+
+# Профилировщик SQL: сколько раз одна форма запроса может повториться
+# в одном HTTP-запросе или событии бота до предупреждения о N+1
+SQL_REPEAT_THRESHOLD = 10
\ No newline at end of file
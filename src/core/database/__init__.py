@@ -1,9 +1,17 @@
 """Классы для хранение информации sqlalchemy"""
 
-from .models import Product, Order, OrderItem
+from .models import Product, Order, OrderItem, StockReservation, OrderSummary, DailyRevenue, ProductSales
+from .engine import SQLiteProfile, SQLITE_PROFILES, create_engine
 
 __all__ = [
     "Product",
     "Order",
-    "OrderItem"
+    "OrderItem",
+    "StockReservation",
+    "OrderSummary",
+    "DailyRevenue",
+    "ProductSales",
+    "SQLiteProfile",
+    "SQLITE_PROFILES",
+    "create_engine"
 ]
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""Фабрика движка БД: SQLite с настройками под одновременную работу бота и сайта или PostgreSQL"""
+__all__ = [
+    "SQLiteProfile",
+    "SQLITE_PROFILES",
+    "create_engine"
+]
+
+from dataclasses import dataclass
+from typing import Any, Dict, Union
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from ..const import DATABASE_URL
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """PRAGMA, применяемые к каждому новому соединению SQLite
+
+    В режиме WAL читатели не блокируют писателя и наоборот: запись
+    из бота не останавливает чтение каталога на сайте. synchronous=NORMAL
+    в режиме WAL не повреждает БД при сбое, но последние транзакции
+    могут потеряться при отключении питания.
+    """
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024  # байт
+    cache_size: int = -64 * 1024  # отрицательное значение - размер в КиБ
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000  # мс
+    pool_size: int = 5
+    max_overflow: int = 5
+
+    def pragmas(self) -> Dict[str, Any]:
+        return {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "temp_store": self.temp_store,
+            "busy_timeout": self.busy_timeout
+        }
+
+
+SQLITE_PROFILES: Dict[str, SQLiteProfile] = {
+    # Основной режим: WAL и отложенный fsync
+    "wal": SQLiteProfile(),
+    # WAL с fsync на каждый коммит
+    "durable": SQLiteProfile(synchronous="FULL"),
+    # Поведение SQLite по умолчанию (журнал отката), для сравнения
+    "legacy": SQLiteProfile(
+        journal_mode="DELETE", synchronous="FULL", mmap_size=0,
+        cache_size=-2000, temp_store="DEFAULT", busy_timeout=5000
+    )
+}
+
+
+# Пул для серверных СУБД (PostgreSQL): соединения переживают рестарт БД
+# и не упираются в idle-таймауты прокси
+SERVER_POOL: Dict[str, Any] = {
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_recycle": 1800,
+    "pool_pre_ping": True
+}
+
+
+def create_engine(
+    url: str = DATABASE_URL,
+    profile: Union[str, SQLiteProfile] = "wal",
+    **kwargs: Any
+) -> AsyncEngine:
+    """Создать асинхронный движок; для SQLite применяются PRAGMA профиля
+
+    kwargs передаются в create_async_engine и переопределяют настройки пула
+    (профиля SQLite или SERVER_POOL для остальных СУБД).
+    """
+    if make_url(url).get_backend_name() != "sqlite":
+        for key, value in SERVER_POOL.items():
+            kwargs.setdefault(key, value)
+        logger.debug(f"Движок {make_url(url).get_backend_name()} создан: {kwargs}")
+        return create_async_engine(url, **kwargs)
+
+    if isinstance(profile, str):
+        if profile not in SQLITE_PROFILES:
+            raise ValueError(f"Неизвестный профиль SQLite: {profile} (доступны: {', '.join(SQLITE_PROFILES)})")
+        profile = SQLITE_PROFILES[profile]
+    # Каждое соединение aiosqlite - отдельный поток; в WAL их может
+    # читать несколько одновременно, писатель ждёт не дольше busy_timeout
+    kwargs.setdefault("pool_size", profile.pool_size)
+    kwargs.setdefault("max_overflow", profile.max_overflow)
+    engine = create_async_engine(url, **kwargs)
+
+    pragmas = profile.pragmas()
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    logger.debug(f"Движок SQLite создан: {', '.join(f'{k}={v}' for k, v in pragmas.items())}")
+    return engine
@@ -0,0 +1,73 @@
+"""Версионированные миграции схемы БД
+
+Версия схемы хранится в таблице schema_version, поэтому при запуске
+достаточно одного запроса, чтобы понять, нужно ли что-то применять:
+
+    await migrate(engine)
+
+Применить миграции или посмотреть состояние можно и отдельно:
+
+    python -m src.core.database.migrations [--status] [--url ...]
+"""
+__all__ = [
+    "Migration",
+    "MIGRATIONS",
+    "LATEST_VERSION",
+    "get_version",
+    "migrate"
+]
+
+from datetime import datetime, timezone
+
+from loguru import logger
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .versions import Migration, MIGRATIONS
+from ...exceptions import SchemaVersionError
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+# Отдельные метаданные: таблица версий не относится к моделям и create_all
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer(), primary_key=True, autoincrement=False),
+    Column("name", String(255)),
+    Column("applied_at", DateTime())
+)
+
+
+async def get_version(engine: AsyncEngine) -> int:
+    """Текущая версия схемы (0 - миграции ещё не применялись)"""
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: schema_version.create(sync_conn, checkfirst=True))
+        return await conn.scalar(select(func.coalesce(func.max(schema_version.c.version), 0)))
+
+
+async def migrate(engine: AsyncEngine) -> int:
+    """Применить недостающие миграции, вернуть итоговую версию схемы"""
+    version = await get_version(engine)
+    if version > LATEST_VERSION:
+        raise SchemaVersionError(
+            f"Версия схемы БД {version} новее последней известной миграции {LATEST_VERSION}"
+        )
+    if version == LATEST_VERSION:
+        logger.debug(f"Схема БД актуальна (версия {version})")
+        return version
+
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        logger.info(f"🧱 Миграция {migration.version}: {migration.name}")
+        await migration.upgrade(engine)
+        async with engine.begin() as conn:
+            await conn.execute(insert(schema_version).values(
+                version=migration.version,
+                name=migration.name,
+                applied_at=datetime.now(timezone.utc).replace(tzinfo=None)
+            ))
+        version = migration.version
+
+    logger.success(f"✅ Схема БД обновлена до версии {version}")
+    return version
@@ -0,0 +1,28 @@
+import argparse
+import asyncio
+
+from . import LATEST_VERSION, MIGRATIONS, get_version, migrate
+from ..engine import create_engine
+from ...config import config
+
+
+async def main(url: str, status: bool) -> None:
+    engine = create_engine(url, profile=config.SQLITE_PROFILE)
+    try:
+        if not status:
+            await migrate(engine)
+        version = await get_version(engine)
+    finally:
+        await engine.dispose()
+
+    print(f"Версия схемы: {version} (последняя: {LATEST_VERSION})")
+    for migration in MIGRATIONS:
+        print(f"  [{'x' if migration.version <= version else ' '}] {migration.version:>3} {migration.name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Миграции схемы БД")
+    parser.add_argument("--url", default=config.DATABASE_URL)
+    parser.add_argument("--status", action="store_true", help="только показать версию, ничего не применять")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.status))
@@ -0,0 +1,147 @@
+"""Идемпотентные операции над схемой для миграций
+
+Каждая операция проверяет текущее состояние БД, поэтому миграцию,
+прерванную на середине, можно безопасно запустить ещё раз.
+"""
+__all__ = [
+    "has_table",
+    "has_column",
+    "create_table",
+    "add_column",
+    "create_index",
+    "drop_index",
+    "create_index_concurrently",
+    "drop_index_concurrently",
+    "backfill"
+]
+
+from typing import Any, Dict
+
+from loguru import logger
+from sqlalchemy import Column, ColumnElement, Index, MetaData, Table, inspect, select, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+
+async def has_table(conn: AsyncConnection, table: str) -> bool:
+    return await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(table))
+
+
+async def has_column(conn: AsyncConnection, table: str, column: str) -> bool:
+    columns = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_columns(table))
+    return any(x["name"] == column for x in columns)
+
+
+async def create_table(conn: AsyncConnection, table: Table) -> None:
+    """CREATE TABLE по таблице модели (вместе с её индексами), если её ещё нет"""
+    await conn.run_sync(lambda sync_conn: table.create(sync_conn, checkfirst=True))
+    logger.info(f"🧱 Таблица {table.name} на месте")
+
+
+async def add_column(conn: AsyncConnection, column: Column) -> bool:
+    """ALTER TABLE ... ADD COLUMN по колонке модели, если её ещё нет
+
+    Колонка должна допускать NULL или иметь server_default: иначе
+    добавить её в таблицу с данными нельзя.
+    """
+    table = column.table.name
+    if await has_column(conn, table, column.name):
+        return False
+    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+    await conn.execute(text(f"ALTER TABLE {conn.dialect.identifier_preparer.quote(table)} ADD COLUMN {ddl}"))
+    logger.info(f"🧱 Добавлена колонка {table}.{column.name}")
+    return True
+
+
+async def create_index(conn: AsyncConnection, index: Index) -> None:
+    """CREATE INDEX по индексу модели, если его ещё нет"""
+    await conn.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
+    logger.info(f"🧱 Индекс {index.name} на месте")
+
+
+async def drop_index(conn: AsyncConnection, name: str) -> None:
+    await conn.execute(text(f"DROP INDEX IF EXISTS {conn.dialect.identifier_preparer.quote(name)}"))
+
+
+async def create_index_concurrently(engine: AsyncEngine, index: Index) -> None:
+    """CREATE INDEX, не блокирующий запись в таблицу
+
+    На PostgreSQL - CREATE INDEX CONCURRENTLY вне транзакции: обычный
+    CREATE INDEX держит блокировку записи в таблицу всё время
+    построения. Прерванное построение оставляет индекс INVALID, его
+    удаляем и строим заново. На других СУБД - обычный create_index в
+    отдельной короткой транзакции.
+    """
+    if engine.dialect.name != "postgresql":
+        async with engine.begin() as conn:
+            await create_index(conn, index)
+        return
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        valid = await conn.scalar(
+            text(
+                "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name"
+            ),
+            {"name": index.name}
+        )
+        if valid is False:
+            logger.warning(f"⚠️ Индекс {index.name} построен не до конца, строим заново")
+            await _drop_index_concurrently(conn, index.name)
+        await conn.execute(CreateIndex(_concurrent_copy(index), if_not_exists=True))
+    logger.info(f"🧱 Индекс {index.name} на месте")
+
+
+async def drop_index_concurrently(engine: AsyncEngine, name: str) -> None:
+    """DROP INDEX без блокировки таблицы (на PostgreSQL - CONCURRENTLY вне транзакции)"""
+    if engine.dialect.name != "postgresql":
+        async with engine.begin() as conn:
+            await drop_index(conn, name)
+        return
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await _drop_index_concurrently(conn, name)
+
+
+def _concurrent_copy(index: Index) -> Index:
+    """Тот же индекс с postgresql_concurrently=True
+
+    Индекс модели не меняем: копия строится на отдельной таблице с теми же
+    колонками, чтобы не попасть в метаданные моделей.
+    """
+    table = Table(index.table.name, MetaData(), *(Column(x.name, x.type) for x in index.columns))
+    return Index(
+        index.name, *(table.c[x.name] for x in index.columns), unique=index.unique,
+        **{**index.dialect_kwargs, "postgresql_concurrently": True}
+    )
+
+
+async def _drop_index_concurrently(conn: AsyncConnection, name: str) -> None:
+    await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {conn.dialect.identifier_preparer.quote(name)}"))
+
+
+async def backfill(
+    engine: AsyncEngine,
+    table: Table,
+    values: Dict[str, Any],
+    where: ColumnElement[bool],
+    batch_size: int = 1000
+) -> int:
+    """Заполнить колонку порциями, каждая порция - отдельная короткая транзакция
+
+    Запись из бота и сайта ждёт не дольше одной порции, а не всё
+    заполнение. where должно перестать выполняться для обновлённых строк
+    (например, "колонка IS NULL"), иначе цикл не закончится.
+    """
+    key = table.primary_key.columns.values()[0]
+    total = 0
+    while True:
+        async with engine.begin() as conn:
+            batch = select(key).where(where).limit(batch_size).scalar_subquery()
+            result = await conn.execute(update(table).where(key.in_(batch)).values(values))
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            logger.info(f"🧱 {table.name}: заполнено строк {total}")
+            return total
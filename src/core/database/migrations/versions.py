@@ -0,0 +1,179 @@
+"""Список миграций схемы (только добавлять в конец, номера не менять)"""
+__all__ = [
+    "Migration",
+    "MIGRATIONS"
+]
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Awaitable, Callable, List
+
+from loguru import logger
+from sqlalchemy import Index, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .ops import (
+    add_column, backfill, create_index_concurrently, create_table, drop_index_concurrently, has_column
+)
+from ..models import (
+    Base, DailyRevenue, Order, OrderItem, OrderStatus, OrderSummary, Product, ProductSales, StockReservation
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[AsyncEngine], Awaitable[None]]
+
+
+def model_index(name: str) -> Index:
+    """Индекс, объявленный в моделях (миграция ссылается на него по имени)"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name == name:
+                return index
+    raise KeyError(f"Индекс {name} не объявлен в моделях")
+
+
+async def initial_schema(engine: AsyncEngine) -> None:
+    """Таблицы моделей (на существующей БД создаются только недостающие)"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def order_item_indexes(engine: AsyncEngine) -> None:
+    """Индексы горячих запросов и уникальная позиция (order_id, product_id)
+
+    Перед уникальным индексом повторяющиеся позиции заказа
+    объединяются в одну с суммарным количеством. Индексы строятся после
+    этой транзакции, на PostgreSQL - CONCURRENTLY, без блокировки записи.
+    Миграции выполняются при запуске до приёма запросов, поэтому новых
+    повторов между объединением и уникальным индексом не появится.
+    """
+    async with engine.begin() as conn:
+        duplicates = (await conn.execute(
+            select(
+                OrderItem.order_id, OrderItem.product_id,
+                func.min(OrderItem.id).label("keep"),
+                func.sum(OrderItem.count).label("total")
+            )
+            .group_by(OrderItem.order_id, OrderItem.product_id)
+            .having(func.count() > 1)
+        )).all()
+        for row in duplicates:
+            await conn.execute(update(OrderItem).where(OrderItem.id == row.keep).values(count=row.total))
+            await conn.execute(
+                delete(OrderItem).where(
+                    OrderItem.order_id == row.order_id,
+                    OrderItem.product_id == row.product_id,
+                    OrderItem.id != row.keep
+                )
+            )
+        if duplicates:
+            logger.warning(f"⚠️ Объединены повторяющиеся позиции заказов: {len(duplicates)}")
+
+    # Индексы по первичным ключам, которые create_all создавал раньше
+    for name in ("ix_product_id", "ix_order_id", "ix_order_item_id"):
+        await drop_index_concurrently(engine, name)
+    for name in ("ix_order_status", "ix_product_price", "uq_order_item_order_product", "ix_order_item_product_id"):
+        await create_index_concurrently(engine, model_index(name))
+
+
+async def product_external_id(engine: AsyncEngine) -> None:
+    """Колонка product.external_id для импорта и её уникальный индекс"""
+    async with engine.begin() as conn:
+        await add_column(conn, Product.__table__.c.external_id)
+    await create_index_concurrently(engine, model_index("uq_product_external_id"))
+
+
+async def stock_reservations(engine: AsyncEngine) -> None:
+    """Таблица резервов остатков
+
+    У существующих неоплаченных заказов резерва нет: их остатки
+    списываются при оплате, как раньше.
+    """
+    async with engine.begin() as conn:
+        await create_table(conn, StockReservation.__table__)
+
+
+async def ledger_rebuild(engine: AsyncEngine) -> None:
+    """Заполнить агрегаты продаж по уже существующим заказам
+
+    Тот же пересчёт, что SalesLedger.rebuild, но записан здесь: миграция
+    не должна меняться вместе с кодом менеджеров. Разбивки по дням нет,
+    вся выручка записывается корректировкой за сегодня.
+    """
+    paid = OrderStatus.PAID.value
+    async with engine.begin() as conn:
+        if not await has_column(conn, OrderItem.__tablename__, OrderItem.price.name):
+            # Пересборка считает по order_item.price: её выполнит order_item_price
+            logger.info("🧱 Пересборка агрегатов отложена до миграции order_item_price")
+            return
+
+        line_total = OrderItem.count * func.coalesce(OrderItem.price, 0)
+        totals = (
+            select(Order.id, Order.status, func.coalesce(func.sum(line_total), 0).label("total"))
+            .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+            .group_by(Order.id, Order.status)
+            .subquery()
+        )
+        await conn.execute(delete(OrderSummary))
+        await conn.execute(insert(OrderSummary).from_select(
+            ["status", "orders", "amount"],
+            select(totals.c.status, func.count(), func.sum(totals.c.total)).group_by(totals.c.status)
+        ))
+        await conn.execute(delete(ProductSales))
+        await conn.execute(insert(ProductSales).from_select(
+            ["product_id", "units", "revenue"],
+            select(OrderItem.product_id, func.sum(OrderItem.count), func.sum(line_total))
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(Order.status == paid)
+            .group_by(OrderItem.product_id)
+        ))
+
+        summary = (await conn.execute(
+            select(OrderSummary.orders, OrderSummary.amount).where(OrderSummary.status == paid)
+        )).one_or_none()
+        daily = (await conn.execute(select(
+            func.coalesce(func.sum(DailyRevenue.orders), 0), func.coalesce(func.sum(DailyRevenue.revenue), 0)
+        ))).one()
+        orders = (summary.orders if summary else 0) - daily[0]
+        revenue = round((summary.amount if summary else 0) - daily[1], 2)
+        if orders or revenue:
+            result = await conn.execute(
+                update(DailyRevenue)
+                .where(DailyRevenue.day == date.today())
+                .values(orders=DailyRevenue.orders + orders, revenue=DailyRevenue.revenue + revenue)
+            )
+            if result.rowcount == 0:
+                await conn.execute(insert(DailyRevenue).values(day=date.today(), orders=orders, revenue=revenue))
+    logger.info(f"🧱 Агрегаты продаж пересобраны, корректировка за день {revenue}")
+
+
+async def order_item_price(engine: AsyncEngine) -> None:
+    """Цена позиции заказа на момент добавления и пересборка агрегатов по ней
+
+    Существующим позициям записывается текущая цена продукта (позициям
+    удалённых продуктов - 0): раньше заказы считались именно по ней.
+    """
+    async with engine.begin() as conn:
+        await add_column(conn, OrderItem.__table__.c.price)
+    price = select(Product.price).where(Product.id == OrderItem.product_id).scalar_subquery()
+    await backfill(
+        engine,
+        OrderItem.__table__,
+        {"price": func.coalesce(price, 0)},
+        OrderItem.price.is_(None)
+    )
+    await ledger_rebuild(engine)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "initial_schema", initial_schema),
+    Migration(2, "order_item_indexes", order_item_indexes),
+    Migration(3, "ledger_rebuild", ledger_rebuild),
+    Migration(4, "product_external_id", product_external_id),
+    Migration(5, "stock_reservations", stock_reservations),
+    Migration(6, "order_item_price", order_item_price),
+]
@@ -1,16 +1,21 @@
 from dataclasses import dataclass
-from typing import List, Iterable
+from datetime import date, datetime
+from typing import List, Iterable, Optional
 from enum import Enum
 
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, Integer, String, Float, Text
+from sqlalchemy import ForeignKey, Integer, String, Float, Text, Date, DateTime, Index
 
 
 __all__ = [
     "Product",
     "Order",
-    "OrderItem"
+    "OrderItem",
+    "StockReservation",
+    "OrderSummary",
+    "DailyRevenue",
+    "ProductSales"
 ]
 
 class OrderStatus(Enum):
@@ -25,13 +30,21 @@ class Base(DeclarativeBase): ...
 class Product(Base):
     """Класс для хранения продуктов"""
     __tablename__ = "product"
+    __table_args__ = (
+        # Сортировка каталога по цене (keyset по price, id)
+        Index("ix_product_price", "price"),
+        # Поиск при импорте; NULL не участвует в уникальности
+        Index("uq_product_external_id", "external_id", unique=True),
+    )
     
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(255), index=True)
     poster: Mapped[str] = mapped_column(String(1024))
     price: Mapped[float] = mapped_column(Float())
     count: Mapped[int] = mapped_column(Integer())
     description: Mapped[str] = mapped_column(Text())
+    # Идентификатор во внешней системе (меню кассы, таблица), задаётся импортом
+    external_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     
     def as_dict(self):
         return {
@@ -40,15 +53,20 @@ class Product(Base):
             'poster': self.poster,
             'price': self.price,
             'count': self.count,
-            'description': self.description  
+            'description': self.description,
+            'external_id': self.external_id
         }
 
 
 class Order(Base):
     """Класс для хранения заказов"""
     __tablename__ = "order"
+    __table_args__ = (
+        # Выручка и страницы заказов по статусу
+        Index("ix_order_status", "status"),
+    )
     
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     items: Mapped[List["OrderItem"]] = relationship("OrderItem", back_populates="order")
     status: Mapped[str] = mapped_column(String(32), default=OrderStatus.UNPAID.value)
     
@@ -77,17 +95,26 @@ class Order(Base):
 class OrderItem(Base):
     """Класс для хранения данных о части заказа"""
     __tablename__ = "order_item"
+    __table_args__ = (
+        # Одна позиция на продукт в заказе (на это рассчитывает update_order);
+        # индекс также обслуживает выборку позиций по order_id
+        Index("uq_order_item_order_product", "order_id", "product_id", unique=True),
+        # Заказы, в которых есть продукт
+        Index("ix_order_item_product_id", "product_id"),
+    )
     
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     order_id: Mapped[int] = mapped_column(ForeignKey("order.id"))
     product_id: Mapped[int] = mapped_column(ForeignKey("product.id"))
     count: Mapped[int] = mapped_column(Integer()) 
+    # Цена за единицу на момент добавления в заказ: по ней заказ учтён в агрегатах
+    price: Mapped[Optional[float]] = mapped_column(Float(), nullable=True)
     
     order: Mapped["Order"] = relationship("Order", back_populates="items")
     product: Mapped["Product"] = relationship("Product")
     
     def __repr__(self):
-        return f"OrderItem(id={self.id}, order_id={self.order_id}, product_id={self.product_id}, count={self.count})"
+        return f"OrderItem(id={self.id}, order_id={self.order_id}, product_id={self.product_id}, count={self.count}, price={self.price})"
         
     def as_dict(self):
         return {
@@ -95,4 +122,68 @@ class OrderItem(Base):
             'order_id': self.order_id,
             'product_id': self.product_id,
             'count': self.count,
-        }
\ No newline at end of file
+            'price': self.price,
+        }
+
+
+class StockReservation(Base):
+    """Класс для хранения резерва остатков под неоплаченный заказ
+
+    Пока резерв жив, его количество уже вычтено из Product.count.
+    Истёкший резерв возвращается на склад, при оплате - удаляется.
+    """
+    __tablename__ = "stock_reservation"
+    __table_args__ = (
+        Index("uq_stock_reservation_order_product", "order_id", "product_id", unique=True),
+        # Поиск истёкших резервов
+        Index("ix_stock_reservation_expires_at", "expires_at"),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    order_id: Mapped[int] = mapped_column(ForeignKey("order.id"))
+    product_id: Mapped[int] = mapped_column(ForeignKey("product.id"))
+    count: Mapped[int] = mapped_column(Integer())
+    # UTC без часового пояса
+    expires_at: Mapped[datetime] = mapped_column(DateTime())
+    
+    def __repr__(self):
+        return (
+            f"StockReservation(order_id={self.order_id}, product_id={self.product_id}, "
+            f"count={self.count}, expires_at={self.expires_at})"
+        )
+
+
+class OrderSummary(Base):
+    """Агрегат: количество и сумма заказов по статусу"""
+    __tablename__ = "order_summary"
+    
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    orders: Mapped[int] = mapped_column(Integer(), default=0)
+    amount: Mapped[float] = mapped_column(Float(), default=0)
+    
+    def __repr__(self):
+        return f"OrderSummary(status='{self.status}', orders={self.orders}, amount={self.amount})"
+
+
+class DailyRevenue(Base):
+    """Агрегат: выручка по дням (день, когда изменилась оплата)"""
+    __tablename__ = "daily_revenue"
+    
+    day: Mapped[date] = mapped_column(Date(), primary_key=True)
+    orders: Mapped[int] = mapped_column(Integer(), default=0)
+    revenue: Mapped[float] = mapped_column(Float(), default=0)
+    
+    def __repr__(self):
+        return f"DailyRevenue(day={self.day}, orders={self.orders}, revenue={self.revenue})"
+
+
+class ProductSales(Base):
+    """Агрегат: продажи продукта в оплаченных заказах"""
+    __tablename__ = "product_sales"
+    
+    product_id: Mapped[int] = mapped_column(Integer(), primary_key=True, autoincrement=False)
+    units: Mapped[int] = mapped_column(Integer(), default=0)
+    revenue: Mapped[float] = mapped_column(Float(), default=0)
+    
+    def __repr__(self):
+        return f"ProductSales(product_id={self.product_id}, units={self.units}, revenue={self.revenue})"
@@ -0,0 +1,180 @@
+"""Профилировщик SQL: запросы на единицу работы (HTTP-запрос, событие бота) и поиск N+1
+
+Включается переменной SQL_PROFILE (см. config.py) или вызовом
+enable_profiler(). Хуки вешаются на все движки сразу (класс Engine), а
+запросы приписываются текущей единице работы из contextvar: её открывает
+profile() - middleware сайта и бота или код теста. Запросы вне единицы
+работы не учитываются.
+
+Одинаковые по форме запросы (литералы и списки IN заменены на ?) в одной
+единице работы считаются вместе; если форма повторилась больше
+repeat_threshold раз, это похоже на запросы в цикле (N+1) и пишется
+предупреждение.
+
+query_budget() проверяет, что блок кода укладывается в заданное число
+запросов - для тестов менеджеров (фикстура в pytest_plugin.py).
+"""
+__all__ = [
+    "QueryBudgetExceeded",
+    "StatementStats",
+    "UnitOfWork",
+    "normalize",
+    "enable_profiler",
+    "disable_profiler",
+    "current_unit",
+    "profile",
+    "query_budget"
+]
+
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..const import SQL_REPEAT_THRESHOLD
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+# IN (?, ?, ?) после раскрытия списка и многострочный VALUES (...), (...)
+_IN_LIST_RE = re.compile(r"\bIN \((?:\?|\$\d+|%s)(?:, (?:\?|\$\d+|%s))*\)", re.IGNORECASE)
+_PARAM_RE = re.compile(r"\$\d+|%s|%\(\w+\)s|:\w+")
+_VALUES_RE = re.compile(r"(\([^()]*\))(?:, \1)+")
+_SPACE_RE = re.compile(r"\s+")
+
+_current: ContextVar[Optional["UnitOfWork"]] = ContextVar("sql_unit_of_work", default=None)
+_enabled = False
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Блок кода выполнил больше запросов, чем разрешено бюджетом"""
+
+
+def normalize(statement: str) -> str:
+    """Форма запроса: литералы и параметры → ?, списки IN и VALUES свёрнуты"""
+    statement = _SPACE_RE.sub(" ", statement).strip()
+    statement = _STRING_RE.sub("?", statement)
+    statement = _NUMBER_RE.sub("?", statement)
+    statement = _PARAM_RE.sub("?", statement)
+    statement = _IN_LIST_RE.sub("IN (?)", statement)
+    return _VALUES_RE.sub(r"\1", statement)
+
+
+@dataclass
+class StatementStats:
+    """Сколько раз выполнялась форма запроса и сколько это заняло"""
+    count: int = 0
+    duration: float = 0.0  # сек.
+
+
+@dataclass
+class UnitOfWork:
+    """Запросы одной единицы работы, сгруппированные по форме"""
+    name: str
+    repeat_threshold: int = SQL_REPEAT_THRESHOLD
+    statements: Dict[str, StatementStats] = field(default_factory=dict)
+    count: int = 0
+    duration: float = 0.0  # сек.
+
+    def record(self, statement: str, duration: float) -> None:
+        shape = normalize(statement)
+        stats = self.statements.get(shape)
+        if stats is None:
+            stats = self.statements[shape] = StatementStats()
+        stats.count += 1
+        stats.duration += duration
+        self.count += 1
+        self.duration += duration
+
+    @property
+    def repeated(self) -> Dict[str, StatementStats]:
+        """Формы, повторившиеся больше repeat_threshold раз"""
+        return {
+            shape: stats for shape, stats in self.statements.items()
+            if stats.count > self.repeat_threshold
+        }
+
+    def report(self) -> List[str]:
+        """Формы запросов, от самых затратных"""
+        ordered = sorted(self.statements.items(), key=lambda x: x[1].duration, reverse=True)
+        return [
+            f"{stats.count:>4} × {stats.duration * 1000:8.2f} мс  {shape}"
+            for shape, stats in ordered
+        ]
+
+
+def enable_profiler() -> None:
+    """Повесить хуки на все движки (повторный вызов ничего не делает)"""
+    global _enabled
+    if _enabled:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_execute)
+    event.listen(Engine, "after_cursor_execute", _after_execute)
+    _enabled = True
+    logger.info("🧮 Профилировщик SQL включён")
+
+
+def disable_profiler() -> None:
+    global _enabled
+    if not _enabled:
+        return
+    event.remove(Engine, "before_cursor_execute", _before_execute)
+    event.remove(Engine, "after_cursor_execute", _after_execute)
+    _enabled = False
+
+
+def current_unit() -> Optional[UnitOfWork]:
+    return _current.get()
+
+
+@contextmanager
+def profile(name: str, repeat_threshold: int = SQL_REPEAT_THRESHOLD) -> Iterator[UnitOfWork]:
+    """Собрать запросы блока в UnitOfWork и записать итог в лог
+
+    Вложенный profile() открывает свою единицу работы; запросы внешней
+    в неё не попадают и наоборот.
+    """
+    unit = UnitOfWork(name, repeat_threshold)
+    token = _current.set(unit)
+    try:
+        yield unit
+    finally:
+        _current.reset(token)
+        if unit.count:
+            logger.debug("🧮 SQL {}: {} запросов, {:.2f} мс", name, unit.count, unit.duration * 1000)
+        for shape, stats in unit.repeated.items():
+            logger.warning(
+                "⚠️ Возможный N+1 в {}: запрос выполнен {} раз ({:.2f} мс): {}",
+                name, stats.count, stats.duration * 1000, shape
+            )
+
+
+@contextmanager
+def query_budget(max_queries: int, name: str = "query_budget") -> Iterator[UnitOfWork]:
+    """Упасть с QueryBudgetExceeded, если блок выполнил больше max_queries запросов"""
+    enable_profiler()
+    with profile(name) as unit:
+        yield unit
+    if unit.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{name}: {unit.count} запросов при бюджете {max_queries}\n" + "\n".join(unit.report())
+        )
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        # Время на контексте выполнения: запрос с ошибкой не оставит мусора
+        context._profiler_started = time.perf_counter()
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    unit = _current.get()
+    started = getattr(context, "_profiler_started", None)
+    if unit is None or started is None:
+        return
+    unit.record(statement, time.perf_counter() - started)
@@ -0,0 +1,53 @@
+"""Плагин pytest: бюджеты SQL-запросов для методов менеджеров
+
+Подключается в conftest.py (pytest_plugins = ["src.core.database.pytest_plugin"])
+или из командной строки: pytest -p src.core.database.pytest_plugin
+
+Бюджет на блок кода - фикстура query_budget:
+
+    async def test_get_product(product_manager, query_budget):
+        with query_budget(1):
+            await product_manager.get_product(1)
+
+Бюджет на весь тест - маркер:
+
+    @pytest.mark.query_budget(4)
+    async def test_pay_order(order_manager): ...
+
+При превышении тест падает с QueryBudgetExceeded, в сообщении - формы
+запросов с числом повторов.
+"""
+from typing import Callable, ContextManager, Iterator
+
+import pytest
+
+from .profiler import UnitOfWork, disable_profiler, enable_profiler, query_budget as _query_budget
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "query_budget(max_queries): тест должен выполнить не больше max_queries SQL-запросов"
+    )
+    enable_profiler()
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    disable_profiler()
+
+
+@pytest.fixture
+def query_budget(request: pytest.FixtureRequest) -> Callable[[int], ContextManager[UnitOfWork]]:
+    """query_budget(n): блок with должен выполнить не больше n запросов"""
+    def budget(max_queries: int) -> ContextManager[UnitOfWork]:
+        return _query_budget(max_queries, request.node.nodeid)
+    return budget
+
+
+@pytest.fixture(autouse=True)
+def _query_budget_marker(request: pytest.FixtureRequest) -> Iterator[None]:
+    marker = request.node.get_closest_marker("query_budget")
+    if marker is None:
+        yield
+        return
+    with _query_budget(*marker.args, name=request.node.nodeid, **marker.kwargs):
+        yield
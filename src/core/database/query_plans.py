@@ -0,0 +1,122 @@
+"""Проверка планов горячих запросов (EXPLAIN QUERY PLAN в SQLite)
+
+Запускается без тестовой инфраструктуры и завершается с кодом 1, если
+какой-то из запросов читает таблицу целиком:
+
+    python -m src.core.database.query_plans [--url sqlite+aiosqlite:///data/database/db.db]
+
+По умолчанию схема создаётся в памяти из моделей, т.е. проверяются
+индексы, объявленные в models.py.
+"""
+__all__ = [
+    "HOT_QUERIES",
+    "find_full_scans"
+]
+
+import argparse
+import asyncio
+import re
+import sys
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from .models import Base, Order, OrderItem, OrderStatus, Product, StockReservation
+
+# "SCAN order_item" (SQLite >= 3.36) или "SCAN TABLE order_item" - без индекса
+FULL_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?"?(?P<table>\w+)"?(?: AS \w+)?$')
+
+PAID = OrderStatus.PAID.value
+
+HOT_QUERIES: Dict[str, Callable[[], Select]] = {
+    # selectinload(Order.items)
+    "order_items_by_order": lambda: select(OrderItem).where(OrderItem.order_id.in_([1, 2, 3])),
+    # Заказы, в которых есть продукт
+    "orders_with_product": lambda: select(OrderItem.order_id).where(OrderItem.product_id == 1),
+    # StockReservations.consume / adjust
+    "reservations_by_order": lambda: (
+        select(StockReservation.product_id, StockReservation.count)
+        .where(StockReservation.order_id == 1)
+    ),
+    # StockReservations.sweep
+    "expired_reservations": lambda: (
+        select(StockReservation.id)
+        .where(StockReservation.expires_at <= datetime(2025, 1, 1))
+        .limit(500)
+    ),
+    # OrderManager.get_orders(status=...)
+    "orders_page_by_status": lambda: (
+        select(Order.id, Order.status)
+        .where(Order.status == PAID, Order.id > 100)
+        .order_by(Order.id)
+        .limit(51)
+    ),
+    # OrderManager.get_revenue
+    "revenue_by_status": lambda: (
+        select(func.coalesce(func.sum(OrderItem.count * OrderItem.price), 0))
+        .select_from(Order)
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .where(Order.status == PAID)
+    ),
+    # ProductManager.get_products_page(sort="price")
+    "catalog_page_by_price": lambda: (
+        select(Product)
+        .where(or_(Product.price > 100, and_(Product.price == 100, Product.id > 10)))
+        .order_by(Product.price, Product.id)
+        .limit(49)
+    ),
+    # ProductManager.get_products_page(sort="title")
+    "catalog_page_by_title": lambda: (
+        select(Product)
+        .where(or_(Product.title > "a", and_(Product.title == "a", Product.id > 10)))
+        .order_by(Product.title, Product.id)
+        .limit(49)
+    ),
+}
+
+
+async def explain(engine: AsyncEngine, stmt: Select) -> List[str]:
+    """Строки detail из EXPLAIN QUERY PLAN"""
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in result]
+
+
+async def find_full_scans(engine: AsyncEngine) -> Dict[str, List[str]]:
+    """Имя запроса → строки плана с полным чтением таблицы"""
+    if engine.dialect.name != "sqlite":
+        raise NotImplementedError("Проверка планов реализована только для SQLite")
+
+    problems = {}
+    for name, build in HOT_QUERIES.items():
+        scans = [x for x in await explain(engine, build()) if FULL_SCAN_RE.match(x)]
+        if scans:
+            problems[name] = scans
+    return problems
+
+
+async def main(url: str) -> int:
+    engine = create_async_engine(url)
+    try:
+        if url == "sqlite+aiosqlite://":
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+        problems = await find_full_scans(engine)
+    finally:
+        await engine.dispose()
+
+    for name in HOT_QUERIES:
+        print(f"{'FULL SCAN' if name in problems else 'ok':>9}  {name}")
+        for detail in problems.get(name, []):
+            print(f"{'':>11}{detail}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Проверка планов горячих запросов")
+    parser.add_argument("--url", default="sqlite+aiosqlite://", help="БД для проверки (по умолчанию - схема моделей в памяти)")
+    sys.exit(asyncio.run(main(parser.parse_args().url)))
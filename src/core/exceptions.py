@@ -8,4 +8,16 @@ class OrderError(Exception):
     """Базовый класс для обазночение проблем с заказом"""
     
 class OrderNotFoundError(OrderError):
-    """Ошибка обозночающая что заказ не найден"""
\ No newline at end of file
+    """Ошибка обозночающая что заказ не найден"""
+    
+class OrderAlreadyPaidError(OrderError):
+    """Ошибка обозночающая что заказ уже оплачен"""
+    
+class OutOfStockError(ProductError):
+    """Ошибка обозночающая что продукта не хватает на складе"""
+    
+class ProductInUseError(ProductError):
+    """Ошибка обозночающая что продукт нельзя удалить: он есть в заказах"""
+    
+class SchemaVersionError(Exception):
+    """Ошибка обозночающая что версия схемы БД новее, чем известно приложению"""
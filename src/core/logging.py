@@ -0,0 +1,99 @@
+"""Настройка логов: вывод в отдельном потоке, JSON и выборка сообщений горячих путей"""
+__all__ = [
+    "setup_logging",
+    "InterceptHandler",
+    "SampledLogger"
+]
+
+import inspect
+import logging
+import sys
+from itertools import count
+from typing import Any, Dict, TextIO
+
+from loguru import logger
+
+# Уровни, которые SampledLogger пишет выборочно; WARNING и выше - всегда
+SAMPLED_LEVELS = ("TRACE", "DEBUG", "INFO", "SUCCESS")
+
+_sample_rates: Dict[str, float] = {}
+
+
+def setup_logging(
+    level: str = "INFO",
+    json: bool = False,
+    sample_rate: float = 1.0,
+    sink: TextIO = sys.stderr
+) -> None:
+    """Заменить стандартный вывод loguru
+
+    Сообщения кладутся в очередь (enqueue) и пишутся в sink отдельным
+    потоком, поэтому запись в stderr не блокирует цикл событий. json -
+    каждая запись одной строкой JSON (serialize loguru). sample_rate -
+    доля сообщений SampledLogger уровней до SUCCESS включительно.
+    Логи стандартного logging (aiogram, uvicorn) идут в тот же вывод.
+    """
+    _sample_rates.clear()
+    _sample_rates.update({name: sample_rate for name in SAMPLED_LEVELS})
+
+    logger.remove()
+    logger.add(sink, level=level, serialize=json, enqueue=True)
+    # Библиотеки не формируют сообщения ниже уровня вывода
+    logging.basicConfig(handlers=[InterceptHandler()], level=logger.level(level).no, force=True)
+    logger.debug(f"Логи: уровень {level}, JSON: {json}, выборка горячих путей: {sample_rate}")
+
+
+class InterceptHandler(logging.Handler):
+    """Перенаправляет записи стандартного logging в loguru"""
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+
+        # Глубина - первый кадр вне модуля logging, чтобы loguru указал источник
+        frame, depth = inspect.currentframe(), 0
+        while frame is not None and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+            frame = frame.f_back
+            depth += 1
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+
+class SampledLogger:
+    """Логгер для частых вызовов на чтение (поиск продукта, каталог)
+
+    Сообщения уровней SAMPLED_LEVELS пишутся через одно на каждые
+    1 / sample_rate вызовов, остальные отбрасываются до формирования
+    записи. WARNING и выше пишутся всегда. Сообщения форматируются
+    loguru по аргументам: logger.info("ID: {}", id).
+    """
+    def __init__(self):
+        self._counters = {name: count() for name in SAMPLED_LEVELS}
+
+    def _take(self, level: str) -> bool:
+        rate = _sample_rates.get(level, 1.0)
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        return next(self._counters[level]) % round(1 / rate) == 0
+
+    def _log(self, level: str, message: str, args: Any, kwargs: Any) -> None:
+        if level not in _sample_rates or self._take(level):
+            # depth=2: источник записи - вызывающий метод менеджера
+            logger.opt(depth=2).log(level, message, *args, **kwargs)
+
+    def debug(self, message: str, *args: Any, **kwargs: Any) -> None:
+        self._log("DEBUG", message, args, kwargs)
+
+    def info(self, message: str, *args: Any, **kwargs: Any) -> None:
+        self._log("INFO", message, args, kwargs)
+
+    def success(self, message: str, *args: Any, **kwargs: Any) -> None:
+        self._log("SUCCESS", message, args, kwargs)
+
+    def warning(self, message: str, *args: Any, **kwargs: Any) -> None:
+        self._log("WARNING", message, args, kwargs)
+
+    def error(self, message: str, *args: Any, **kwargs: Any) -> None:
+        self._log("ERROR", message, args, kwargs)
@@ -0,0 +1,227 @@
+"""Метрики процесса в текстовом формате Prometheus (сайт, бот и БД)
+
+Все метрики живут в одном реестре REGISTRY и отдаются на /metrics.
+Значения меняются из цикла событий (ASGI, aiogram, события SQLAlchemy
+при async-движке вызываются в нём же), поэтому блокировки не нужны.
+"""
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "REGISTRY",
+    "HTTP_REQUESTS",
+    "HTTP_LATENCY",
+    "HTTP_IN_FLIGHT",
+    "DB_QUERIES",
+    "DB_LATENCY",
+    "BOT_UPDATES",
+    "BOT_LATENCY",
+    "BOT_IN_FLIGHT",
+    "instrument_engine",
+    "instrument_product_cache"
+]
+
+import math
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Границы гистограмм, сек.
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._function: Optional[Callable[[], float]] = None
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Читать значение при каждой выгрузке (для метрик без меток)"""
+        self._function = function
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """(суффикс имени, метки, значение)"""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(f"{self.name}{suffix}{labels} {_format_value(value)}" for suffix, labels, value in self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Монотонно растущий счётчик"""
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        # Метрика без меток выгружается сразу, с нулём
+        self._values: Dict[LabelValues, float] = {} if self.label_names else {(): 0}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        if self._function is not None:
+            yield "", "", self._function()
+            return
+        for labels, value in self._values.items():
+            yield "", _labels(self.label_names, labels), value
+
+
+class Gauge(Counter):
+    """Значение, которое может расти и уменьшаться"""
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Распределение длительностей по корзинам (кумулятивно при выгрузке)"""
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = REQUEST_BUCKETS
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # метки → [счётчики корзин (последняя - +Inf), сумма]
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        names = self.label_names + ("le",)
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield "_bucket", _labels(names, labels + (_format_value(bound),)), cumulative
+            yield "_sum", _labels(self.label_names, labels), total[0]
+            yield "_count", _labels(self.label_names, labels), cumulative
+
+
+class Registry:
+    """Набор метрик с общей выгрузкой"""
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Метрика {metric.name} уже зарегистрирована")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP-запросы по маршруту и коду ответа", ("method", "route", "status")
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Время обработки HTTP-запроса", ("method", "route")
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP-запросы в обработке"
+))
+DB_QUERIES = REGISTRY.register(Counter(
+    "db_queries_total", "SQL-запросы по типу", ("operation",)
+))
+DB_LATENCY = REGISTRY.register(Histogram(
+    "db_query_duration_seconds", "Время выполнения SQL-запроса", ("operation",), QUERY_BUCKETS
+))
+BOT_UPDATES = REGISTRY.register(Counter(
+    "bot_updates_total", "Обработанные ботом события по обработчику", ("handler", "status")
+))
+BOT_LATENCY = REGISTRY.register(Histogram(
+    "bot_handler_duration_seconds", "Время работы обработчика бота", ("handler",)
+))
+BOT_IN_FLIGHT = REGISTRY.register(Gauge(
+    "bot_handlers_in_flight", "Обработчики бота в работе"
+))
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Считать запросы движка и их длительность (по первому слову SQL)"""
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        DB_QUERIES.inc(operation)
+        DB_LATENCY.observe(elapsed, operation)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def on_error(context):
+        # Запрос с ошибкой не дошёл до after_cursor_execute
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+        DB_QUERIES.inc("ERROR")
+
+
+def instrument_product_cache(cache) -> None:
+    """Попадания и промахи кэша продуктов (ProductCache.stats) при каждой выгрузке"""
+    for name, documentation, key, cls in (
+        ("product_cache_hits_total", "Попадания в кэш продуктов", "hits", Counter),
+        ("product_cache_misses_total", "Промахи кэша продуктов", "misses", Counter),
+        ("product_cache_size", "Продуктов в кэше", "size", Gauge),
+        ("product_cache_hit_ratio", "Доля попаданий в кэш продуктов", "hit_ratio", Gauge)
+    ):
+        # Приложение может пересоздаваться (тесты, замеры): метрика следует за последним кэшем
+        metric = REGISTRY.get(name) or REGISTRY.register(cls(name, documentation))
+        metric.set_function(lambda key=key: cache.stats[key])
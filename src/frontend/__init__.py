@@ -1,4 +1,6 @@
+import asyncio
 import os
+from urllib.parse import urlencode
 
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from fastapi import APIRouter, Request
@@ -6,7 +8,11 @@ from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from fastapi.responses import FileResponse
 from fastapi import HTTPException
-from ..core.const import PATH_TO_SAVE_IMAGE
+from .snapshot import CatalogSnapshot
+from ..api.http_cache import catalog_headers, not_modified
+from ..core.const import CATALOG_PAGE_SIZE
+from ..managers.product_manager import SortField
+from ..service.images import poster_images
 
 
 def get_router(session: async_sessionmaker[AsyncSession]):
@@ -26,13 +32,44 @@ def get_router(session: async_sessionmaker[AsyncSession]):
     async def index(request: Request):
         return templates.TemplateResponse("index.html", {"request": request})
 
+    async def catalog_context(sort: SortField = "id", desc: bool = False, in_stock: bool = False):
+        page = await api.get_products_page(limit=CATALOG_PAGE_SIZE, sort=sort, desc=desc, in_stock=in_stock)
+        query = {'sort': sort, 'desc': str(desc).lower(), 'in_stock': str(in_stock).lower()}
+        return {
+            "products": [x.model_dump() for x in page.products],
+            "posters": {x.id: poster_images.srcset(x.poster) for x in page.products},
+            "next_cursor": page.next_cursor,
+            "query": urlencode(query),
+            "sort": sort,
+            "desc": desc,
+            "in_stock": in_stock
+        }
+    
+    async def render_catalog() -> str:
+        context = await catalog_context()
+        return await asyncio.to_thread(templates.get_template("catalog.html").render, context)
+    
+    snapshot = CatalogSnapshot(api.cache, render_catalog)
+    snapshot.schedule()
+
     @router.get("/catalog", response_class=HTMLResponse)
-    async def catalog(request: Request):
-        products = await api.get_all_products()
+    async def catalog(request: Request, sort: SortField = "id", desc: bool = False, in_stock: bool = False):
+        if not request.url.query:
+            cached = snapshot.response(request)
+            if cached:
+                return cached
+        
+        headers = catalog_headers(api.cache, str(request.url.query))
+        early = not_modified(request, headers)
+        if early is not None:
+            return early
+        
+        context = await catalog_context(sort, desc, in_stock)
         return templates.TemplateResponse("catalog.html", {
                                             "request": request,
-                                            "products": [x.model_dump() for x in products]
-                                        }
+                                            **context
+                                        },
+                                        headers=headers
                                         )
 
     @router.get("/order/{id}", response_class=HTMLResponse)
@@ -52,12 +89,14 @@ def get_router(session: async_sessionmaker[AsyncSession]):
             for order_item in data.items:
                 product = products.get(order_item.product_id)
                 if product:
-                    result += order_item.count * product.price
+                    # Цена, по которой позиция записана в заказ
+                    price = product.price if order_item.price is None else order_item.price
+                    result += order_item.count * price
                     items.append(
                         {
                             'title': product.title,
                             'poster': product.poster if product.poster.startswith('http') else "/" + product.poster,
-                            'price': product.price,
+                            'price': price,
                             'count': order_item.count
                         }
                     )
@@ -81,12 +120,15 @@ def get_router(session: async_sessionmaker[AsyncSession]):
         return templates.TemplateResponse("login.html", {"request": request})
     
     @router.get("/data/img/{poster}", response_class=FileResponse)
-    async def get_poster(poster: str):
-        image_path = PATH_TO_SAVE_IMAGE / poster
+    async def get_poster(poster: str, request: Request):
+        file = poster_images.lookup(poster)
         
-        if not image_path.exists():
+        if file is None:
             raise HTTPException(status_code=404, detail="Image not found")
         
-        return FileResponse(image_path)
+        early = not_modified(request, file.headers)
+        if early is not None:
+            return early
+        return FileResponse(file.path, headers=file.headers, stat_result=file.stat)
     
     return router
\ No newline at end of file
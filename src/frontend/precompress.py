@@ -0,0 +1,91 @@
+"""Создаёт .gz и .br копии статических файлов
+
+Запуск: python src/frontend/precompress.py [папка]
+"""
+import gzip
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+EXTENSIONS = {".js", ".css", ".html", ".svg", ".json", ".txt", ".ico"}
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+# Копия нужна, только если она хотя бы на столько меньше исходного файла
+MIN_SAVING = 0.05
+# Копии, которые не стоило создавать: {имя копии: mtime_ns исходного файла}
+SKIPPED_MANIFEST = ".precompress-skipped.json"
+
+
+def precompress(directory: Path = STATIC_DIR) -> int:
+    """Сжать изменившиеся файлы, вернуть количество записанных копий
+
+    Если сжатие почти ничего не даёт (уже сжатые .ico с PNG внутри),
+    копия не создаётся, а результат запоминается в SKIPPED_MANIFEST:
+    при следующем запуске файл не сжимается заново, пока не изменится.
+    """
+    directory = Path(directory)
+    manifest_path = directory / SKIPPED_MANIFEST
+    skipped = _load_manifest(manifest_path)
+    seen: Dict[str, int] = {}
+    written = 0
+    for path in directory.rglob("*"):
+        if not path.is_file() or path.suffix not in EXTENSIONS or path.name == SKIPPED_MANIFEST:
+            continue
+
+        data = None
+        mtime = path.stat().st_mtime_ns
+        variants = [(".gz", lambda body: gzip.compress(body, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", lambda body: brotli.compress(body, quality=11)))
+
+        for suffix, compress in variants:
+            target = path.with_name(path.name + suffix)
+            key = target.relative_to(directory).as_posix()
+            if target.exists() and target.stat().st_mtime_ns >= mtime:
+                continue
+            if skipped.get(key) == mtime:
+                seen[key] = mtime
+                continue
+            if data is None:
+                data = path.read_bytes()
+
+            compressed = compress(data)
+            if len(compressed) > len(data) * (1 - MIN_SAVING):
+                target.unlink(missing_ok=True)
+                seen[key] = mtime
+                continue
+            tmp = target.with_name(target.name + ".tmp")
+            tmp.write_bytes(compressed)
+            os.replace(tmp, target)
+            written += 1
+
+    if seen != skipped:
+        _save_manifest(manifest_path, seen)
+    return written
+
+
+def _load_manifest(path: Path) -> Dict[str, int]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path: Path, skipped: Dict[str, int]) -> None:
+    if not skipped:
+        path.unlink(missing_ok=True)
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(skipped, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+if __name__ == "__main__":
+    directory = Path(sys.argv[1]) if len(sys.argv) > 1 else STATIC_DIR
+    print(f"Сжато файлов: {precompress(directory)}")
@@ -0,0 +1,119 @@
+"""Готовый HTML каталога в памяти (с gzip/brotli вариантами)"""
+import asyncio
+import gzip
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from loguru import logger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from ..api.compression import choose_encoding
+from ..api.http_cache import catalog_headers, not_modified
+from ..core.const import CATALOG_SNAPSHOT_INTERVAL
+from ..managers.cache import ProductCache
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    headers: Dict[str, str]
+    body: bytes
+    gzip: bytes
+    br: Optional[bytes]
+
+
+class CatalogSnapshot:
+    """Снимок страницы каталога, пересобираемый в фоне после изменений продуктов
+
+    Пока идёт пересборка, отдаётся предыдущий снимок (с его же ETag),
+    поэтому рендер Jinja никогда не выполняется в обработчике запроса.
+    Каждый заказ меняет остатки и сбрасывает кэш продуктов, поэтому
+    пересборки идут не чаще раза в interval секунд (инвалидации за это
+    время склеиваются), а если HTML не изменился (заказаны продукты не с
+    первой страницы), остаётся прежний снимок без повторного сжатия.
+    """
+    def __init__(
+        self,
+        cache: ProductCache,
+        render: Callable[[], Awaitable[str]],
+        interval: float = CATALOG_SNAPSHOT_INTERVAL
+    ):
+        self.cache = cache
+        self.current: Optional[Snapshot] = None
+        self.interval = interval
+        self.rebuilds = 0
+        self._render = render
+        self._task: Optional[asyncio.Task] = None
+        self._dirty = False
+        self._built_at = 0.0
+        cache.subscribe(self.schedule)
+
+    def schedule(self) -> None:
+        """Запланировать пересборку (повторные вызовы склеиваются)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._task and not self._task.done():
+            self._dirty = True
+            return
+        self._task = loop.create_task(self._run())
+
+    async def rebuild(self) -> Snapshot:
+        headers = catalog_headers(self.cache, "")
+        body = (await self._render()).encode()
+        self._built_at = time.monotonic()
+        if self.current is not None and self.current.body == body:
+            # Тот же HTML: прежний ETag остаётся верным, кэши клиентов тоже
+            return self.current
+
+        compressed_gzip, compressed_br = await asyncio.to_thread(_compress, body)
+        self.current = Snapshot(headers, body, compressed_gzip, compressed_br)
+        self.rebuilds += 1
+        logger.debug(f"Снимок каталога пересобран: {headers['ETag']} ({len(body)} байт)")
+        return self.current
+
+    def response(self, request: Request) -> Optional[Response]:
+        """Ответ из снимка или None, если снимок ещё не готов"""
+        snapshot = self.current
+        if snapshot is None:
+            self.schedule()
+            return None
+
+        headers = {**snapshot.headers, "Vary": "Accept-Encoding"}
+        early = not_modified(request, headers)
+        if early is not None:
+            return early
+
+        accept = request.headers.get("accept-encoding", "")
+        encoding = choose_encoding(accept, ("br", "gzip") if snapshot.br is not None else ("gzip",))
+        if encoding == "br":
+            body, headers["Content-Encoding"] = snapshot.br, "br"
+        elif encoding == "gzip":
+            body, headers["Content-Encoding"] = snapshot.gzip, "gzip"
+        else:
+            body = snapshot.body
+        return Response(body, media_type="text/html; charset=utf-8", headers=headers)
+
+    async def _run(self) -> None:
+        while True:
+            wait = self._built_at + self.interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._dirty = False
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logger.error(f"Ошибка при пересборке снимка каталога: {e}")
+            if not self._dirty:
+                return
+
+
+def _compress(body: bytes) -> Tuple[bytes, Optional[bytes]]:
+    compressed_br = brotli.compress(body, quality=11) if brotli else None
+    return gzip.compress(body, compresslevel=9), compressed_br
@@ -269,6 +269,11 @@ async function placeOrder() {
         
         console.log('Ответ сервера:', response);
         
+        if (response.status === 409) {
+            // Товар закончился, пока он лежал в корзине
+            const conflict = await response.json();
+            throw new Error(conflict.detail || 'Товара не хватает на складе');
+        }
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -0,0 +1,89 @@
+// Подгрузка каталога при прокрутке (страницы из /api/v1/catalog)
+document.addEventListener('DOMContentLoaded', function() {
+    const sentinel = document.getElementById('catalogSentinel');
+    const grid = document.querySelector('.catalog-grid');
+    if (!sentinel || !grid) return;
+
+    let nextCursor = sentinel.dataset.nextCursor;
+    const query = sentinel.dataset.query;
+    let loading = false;
+
+    function createCard(product, posters) {
+        const inStock = product.count > 0;
+        const description = product.description.length > 100
+            ? product.description.slice(0, 100) + '...'
+            : product.description;
+
+        const card = document.createElement('div');
+        card.className = 'product-card';
+        card.dataset.productId = product.id;
+        card.dataset.productName = product.title;
+        card.dataset.productPrice = product.price;
+        card.dataset.productImage = product.poster;
+        card.dataset.productDescription = product.description;
+        card.dataset.productCount = product.count;
+
+        card.innerHTML = `
+            <div class="product-image">
+                <picture><img alt="" loading="lazy" decoding="async"></picture>
+                ${inStock ? '' : '<div class="out-of-stock-badge">Нет в наличии</div>'}
+            </div>
+            <div class="product-info">
+                <h3 class="product-title"></h3>
+                <div class="product-price">
+                    <span class="current-price"></span>
+                </div>
+                <div class="product-meta">
+                    ${inStock ? '<div class="in-stock">В наличии</div>' : '<div class="out-of-stock">Отсутствует</div>'}
+                </div>
+                <p class="product-description"></p>
+                <button class="quick-view-btn" type="button">
+                    <span class="quick-view-icon"></span>
+                    Быстрый просмотр
+                </button>
+            </div>`;
+
+        const image = card.querySelector('img');
+        Object.entries(posters || {}).forEach(([type, srcset]) => {
+            const source = document.createElement('source');
+            source.type = type;
+            source.srcset = srcset;
+            source.sizes = '(max-width: 600px) 100vw, 320px';
+            image.before(source);
+        });
+        image.src = product.poster;
+        image.alt = product.title;
+        card.querySelector('.product-title').textContent = product.title;
+        card.querySelector('.current-price').textContent = `${product.price} руб.`;
+        card.querySelector('.product-description').textContent = description;
+        return card;
+    }
+
+    async function loadNextPage() {
+        if (loading || !nextCursor) return;
+        loading = true;
+        try {
+            const response = await fetch(`/api/v1/catalog?${query}&cursor=${encodeURIComponent(nextCursor)}`);
+            const data = await response.json();
+            if (!data.ok) throw new Error(data.detail);
+
+            data.result.products.forEach(product => grid.appendChild(
+                createCard(product, data.result.posters[product.id])
+            ));
+            nextCursor = data.result.next_cursor;
+            observer.unobserve(sentinel);
+            // Повторное наблюдение проверит, виден ли маркер после подгрузки
+            if (nextCursor) observer.observe(sentinel);
+        } catch (error) {
+            console.error('Error loading catalog page:', error);
+        } finally {
+            loading = false;
+        }
+    }
+
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) loadNextPage();
+    }, { rootMargin: '600px' });
+
+    if (nextCursor) observer.observe(sentinel);
+});
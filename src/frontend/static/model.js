@@ -1,7 +1,6 @@
 document.addEventListener('DOMContentLoaded', function() {
     const modal = document.getElementById('productModal');
     const closeBtn = document.querySelector('.close');
-    const quickViewButtons = document.querySelectorAll('.quick-view-btn');
     
     // Элементы модального окна
     const modalProductImage = document.getElementById('modalProductImage');
@@ -91,21 +90,23 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // Открытие модального окна при клике на кнопку быстрого просмотра
-    quickViewButtons.forEach(button => {
-        button.addEventListener('click', function(e) {
-            e.stopPropagation(); // Предотвращаем всплытие
-            const productCard = this.closest('.product-card');
-            
-            // Проверяем, есть ли товар в наличии
-            const inStock = parseInt(productCard.dataset.productCount) > 0;
-            
-            if (!inStock) {
-                showNotification('Этот товар временно отсутствует', 'warning');
-                return;
-            }
-            
-            openModal(productCard);
-        });
+    // (делегирование: карточки могут подгружаться при прокрутке)
+    document.addEventListener('click', function(e) {
+        const button = e.target.closest('.quick-view-btn');
+        if (!button) return;
+        
+        e.stopPropagation(); // Предотвращаем всплытие
+        const productCard = button.closest('.product-card');
+        
+        // Проверяем, есть ли товар в наличии
+        const inStock = parseInt(productCard.dataset.productCount) > 0;
+        
+        if (!inStock) {
+            showNotification('Этот товар временно отсутствует', 'warning');
+            return;
+        }
+        
+        openModal(productCard);
     });
     
     // Закрытие модального окна
@@ -0,0 +1,42 @@
+"""Раздача статики с заранее сжатыми копиями (.br / .gz)"""
+import stat
+from mimetypes import guess_type
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Scope
+
+from ..api.compression import accepted_encodings
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles, который отдаёт соседний .br/.gz файл, если клиент его принимает
+
+    Сами копии создаются заранее скриптом precompress.py.
+    """
+    ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        default = accepted.get("*", 0.0)
+        # По убыванию q; при равенстве br раньше gzip (sorted устойчив)
+        encodings = sorted(self.ENCODINGS, key=lambda x: -accepted.get(x[0], default))
+        for encoding, suffix in encodings:
+            if accepted.get(encoding, default) <= 0:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                continue
+
+            response = self.file_response(full_path, stat_result, scope)
+            media_type = guess_type(path)[0] or "application/octet-stream"
+            if media_type.startswith("text/") or media_type.endswith("javascript"):
+                media_type += "; charset=utf-8"
+            response.headers["content-type"] = media_type
+            response.headers["content-encoding"] = encoding
+            response.headers.add_vary_header("Accept-Encoding")
+            return response
+
+        return await super().get_response(path, scope)
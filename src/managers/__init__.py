@@ -2,8 +2,12 @@
 
 __all__ = [
     "ProductManager",  
-    "OrderManager" 
+    "OrderManager",
+    "SalesLedger",
+    "StockReservations"
 ]
 
 from .product_manager import ProductManager
-from .order_manager import OrderManager
\ No newline at end of file
+from .order_manager import OrderManager
+from .ledger import SalesLedger
+from .reservation import StockReservations
\ No newline at end of file
@@ -0,0 +1,137 @@
+__all__ = [
+    "ProductCache",
+    "get_product_cache"
+]
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from ..core.const import PRODUCT_CACHE_TTL, PRODUCT_CACHE_SIZE
+from ..schemas.product import ProductSchema
+
+
+class ProductCache:
+    """Кэш продуктов в памяти процесса (id → ProductSchema и полный список)
+
+    Записи живут ttl секунд, по ID хранится не больше max_size продуктов
+    (вытесняются давно не использованные). Каждая инвалидация увеличивает
+    version: значение, прочитанное из БД до инвалидации, в кэш уже не попадёт.
+    Эта же версия (вместе с updated_at) служит валидатором для HTTP-кэша.
+    """
+    def __init__(self, ttl: float = PRODUCT_CACHE_TTL, max_size: int = PRODUCT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.version = 0
+        self.updated_at = time.time()
+        self._boot = format(time.time_ns(), "x")
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[int, Tuple[float, ProductSchema]]" = OrderedDict()
+        self._all: Optional[Tuple[float, List[ProductSchema]]] = None
+        self._listeners: List[Callable[[], None]] = []
+
+    def get(self, id: int) -> Optional[ProductSchema]:
+        product = self._get(id)
+        if product is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return product
+
+    def get_many(self, ids: Iterable[int]) -> Tuple[Dict[int, ProductSchema], List[int]]:
+        """Найденные продукты и ID, которых нет в кэше"""
+        found, missing = {}, []
+        for id in dict.fromkeys(ids):
+            product = self._get(id)
+            if product is None:
+                missing.append(id)
+            else:
+                found[id] = product
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def get_all(self) -> Optional[List[ProductSchema]]:
+        if self._all is not None and self._all[0] > time.monotonic():
+            self.hits += 1
+            return list(self._all[1])
+        self._all = None
+        self.misses += 1
+        return None
+
+    def put(self, product: ProductSchema, version: Optional[int] = None) -> None:
+        self.put_many([product], version)
+
+    def put_many(self, products: Iterable[ProductSchema], version: Optional[int] = None) -> None:
+        if version is not None and version != self.version:
+            return
+        expires = time.monotonic() + self.ttl
+        for product in products:
+            self._items[product.id] = (expires, product)
+            self._items.move_to_end(product.id)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def put_all(self, products: List[ProductSchema], version: Optional[int] = None) -> None:
+        if version is not None and version != self.version:
+            return
+        self._all = (time.monotonic() + self.ttl, list(products))
+        self.put_many(products[:self.max_size])
+
+    def invalidate(self, ids: Optional[Iterable[int]] = None) -> None:
+        """Сбросить продукты по ID (или весь кэш) и полный список"""
+        self.version += 1
+        self.updated_at = time.time()
+        self._all = None
+        if ids is None:
+            self._items.clear()
+        else:
+            for id in ids:
+                self._items.pop(id, None)
+        
+        for listener in self._listeners:
+            listener()
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """Вызывать listener после каждой инвалидации"""
+        self._listeners.append(listener)
+
+    @property
+    def etag(self) -> str:
+        """Версия каталога, уникальная между перезапусками"""
+        return f"{self._boot}-{self.version}"
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._items),
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0
+        }
+
+    def _get(self, id: int) -> Optional[ProductSchema]:
+        entry = self._items.get(id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._items[id]
+            return None
+        self._items.move_to_end(id)
+        return entry[1]
+
+
+_caches: "WeakKeyDictionary[async_sessionmaker[AsyncSession], ProductCache]" = WeakKeyDictionary()
+
+
+def get_product_cache(session_maker: async_sessionmaker[AsyncSession]) -> ProductCache:
+    """Общий кэш для всех менеджеров, работающих с одной БД"""
+    cache = _caches.get(session_maker)
+    if cache is None:
+        cache = _caches[session_maker] = ProductCache()
+    return cache
@@ -0,0 +1,249 @@
+__all__ = [
+    "SalesLedger",
+    "order_lines",
+    "line_prices",
+    "current_prices"
+]
+
+from datetime import date
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy import select, delete, func, insert, update
+from loguru import logger
+
+from ..core import Order, OrderItem, Product
+from ..core.database.models import OrderStatus, OrderSummary, DailyRevenue, ProductSales
+from ..schemas.ledger import (
+    SalesSummarySchema, StatusSummarySchema, DailyRevenueSchema,
+    ProductSalesSchema, LedgerReconcileSchema
+)
+
+
+def order_lines(items: Iterable[Any]) -> Dict[int, int]:
+    """Позиции заказа в виде {product_id: количество}"""
+    lines: Dict[int, int] = {}
+    for item in items:
+        lines[item.product_id] = lines.get(item.product_id, 0) + item.count
+    return lines
+
+
+def line_prices(items: Iterable[Any]) -> Dict[int, float]:
+    """Цены позиций заказа, по которым они учтены: {product_id: цена за единицу}"""
+    return {item.product_id: item.price or 0 for item in items}
+
+
+async def current_prices(session: AsyncSession, product_ids: Iterable[int]) -> Dict[int, float]:
+    """Текущие цены продуктов (для новых позиций заказа)"""
+    product_ids = list(product_ids)
+    if not product_ids:
+        return {}
+    result = await session.execute(select(Product.id, Product.price).where(Product.id.in_(product_ids)))
+    return {row.id: row.price for row in result}
+
+
+class SalesLedger:
+    """Инкрементальные агрегаты по продажам
+
+    Агрегаты обновляются в той же транзакции, что и заказ (см. record),
+    поэтому чтение выручки не требует пересчёта всех заказов. Суммы
+    считаются по цене позиции (OrderItem.price), зафиксированной при
+    добавлении в заказ: отмена вычитает ровно учтённую сумму, а смена
+    цены продукта не меняет уже оформленные заказы. rebuild сверяет
+    агрегаты с текущими таблицами заказов.
+    """
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self.Session = session_maker
+        logger.debug("Инициализирован SalesLedger")
+
+    @staticmethod
+    async def record(
+        session: AsyncSession,
+        status: str,
+        lines: Dict[int, int],
+        prices: Dict[int, float],
+        sign: int = 1,
+        orders: int = 1
+    ) -> None:
+        """Учесть изменение заказа внутри текущей транзакции
+
+        prices - цены, по которым позиции записаны в заказ (line_prices),
+        а не текущие цены продуктов.
+        """
+        lines = {product_id: count * sign for product_id, count in lines.items() if count}
+        orders *= sign
+        if not lines and not orders:
+            return
+
+        amount = sum(prices.get(product_id, 0) * count for product_id, count in lines.items())
+
+        await _upsert(session, OrderSummary, ["status"], [
+            {"status": status, "orders": orders, "amount": amount}
+        ])
+        if status != OrderStatus.PAID.value:
+            return
+
+        await _upsert(session, DailyRevenue, ["day"], [
+            {"day": date.today(), "orders": orders, "revenue": amount}
+        ])
+        if lines:
+            await _upsert(session, ProductSales, ["product_id"], [
+                {"product_id": product_id, "units": count, "revenue": prices.get(product_id, 0) * count}
+                for product_id, count in lines.items()
+            ])
+
+    async def get_revenue(self) -> float:
+        """Выручка по оплаченным заказам (1 строка агрегата)"""
+        try:
+            async with self.Session() as session:
+                revenue = await session.scalar(
+                    select(OrderSummary.amount).where(OrderSummary.status == OrderStatus.PAID.value)
+                )
+                return round(revenue or 0, 2)
+        except Exception as e:
+            logger.error(f"❌ Ошибка при получении выручки {e}")
+            raise
+
+    async def get_summary(self, days: int = 7, top: int = 10) -> SalesSummarySchema:
+        """Сводка: статусы, последние дни и самые продаваемые продукты"""
+        try:
+            async with self.Session() as session:
+                statuses = (await session.execute(
+                    select(OrderSummary).order_by(OrderSummary.status)
+                )).scalars().all()
+                daily = (await session.execute(
+                    select(DailyRevenue).order_by(DailyRevenue.day.desc()).limit(days)
+                )).scalars().all()
+                products = (await session.execute(
+                    select(ProductSales).order_by(ProductSales.units.desc()).limit(top)
+                )).scalars().all()
+
+                return SalesSummarySchema(
+                    statuses=[StatusSummarySchema.model_validate(x) for x in statuses],
+                    days=[DailyRevenueSchema.model_validate(x) for x in daily],
+                    products=[ProductSalesSchema.model_validate(x) for x in products]
+                )
+        except Exception as e:
+            logger.error(f"❌ Ошибка при получении сводки продаж {e}")
+            raise
+
+    async def rebuild(self) -> LedgerReconcileSchema:
+        """Пересобрать агрегаты по таблицам заказов
+
+        Сводка по статусам и продажи продуктов пересчитываются полностью.
+        Разбивку по дням восстановить нельзя, поэтому расхождение с
+        итоговой выручкой записывается корректировкой за сегодня.
+        """
+        logger.info("🔄 Пересборка агрегатов продаж")
+        paid = OrderStatus.PAID.value
+        try:
+            async with self.Session() as session:
+                async with session.begin():
+                    revenue_before = await session.scalar(
+                        select(OrderSummary.amount).where(OrderSummary.status == paid)
+                    ) or 0
+
+                    totals = (
+                        select(
+                            Order.id, Order.status,
+                            func.coalesce(func.sum(OrderItem.count * OrderItem.price), 0).label("total")
+                        )
+                        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+                        .group_by(Order.id, Order.status)
+                        .subquery()
+                    )
+                    await session.execute(delete(OrderSummary))
+                    await session.execute(
+                        insert(OrderSummary).from_select(
+                            ["status", "orders", "amount"],
+                            select(totals.c.status, func.count(), func.sum(totals.c.total))
+                            .group_by(totals.c.status)
+                        )
+                    )
+
+                    await session.execute(delete(ProductSales))
+                    await session.execute(
+                        insert(ProductSales).from_select(
+                            ["product_id", "units", "revenue"],
+                            select(
+                                OrderItem.product_id,
+                                func.sum(OrderItem.count),
+                                func.sum(OrderItem.count * func.coalesce(OrderItem.price, 0))
+                            )
+                            .join(Order, Order.id == OrderItem.order_id)
+                            .where(Order.status == paid)
+                            .group_by(OrderItem.product_id)
+                        )
+                    )
+
+                    summary = await session.get(OrderSummary, paid)
+                    revenue_after = summary.amount if summary else 0
+                    paid_orders = summary.orders if summary else 0
+
+                    daily = (await session.execute(
+                        select(
+                            func.coalesce(func.sum(DailyRevenue.revenue), 0).label("revenue"),
+                            func.coalesce(func.sum(DailyRevenue.orders), 0).label("orders")
+                        )
+                    )).one()
+                    adjustment = round(revenue_after - daily.revenue, 2)
+                    adjustment_orders = paid_orders - daily.orders
+                    if adjustment or adjustment_orders:
+                        await _upsert(session, DailyRevenue, ["day"], [
+                            {"day": date.today(), "orders": adjustment_orders, "revenue": adjustment}
+                        ])
+
+                    logger.success(
+                        f"✅ Агрегаты пересобраны: выручка {round(revenue_before, 2)} → "
+                        f"{round(revenue_after, 2)}, корректировка за день {adjustment}"
+                    )
+                    return LedgerReconcileSchema(
+                        revenue_before=round(revenue_before, 2),
+                        revenue_after=round(revenue_after, 2),
+                        daily_adjustment=adjustment
+                    )
+        except Exception as e:
+            logger.error(f"❌ Ошибка при пересборке агрегатов {e}")
+            raise
+
+
+# INSERT ... ON CONFLICT DO UPDATE есть только в диалектах этих СУБД
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert
+}
+
+
+async def _upsert(session: AsyncSession, model: Any, keys: List[str], rows: List[Dict[str, Any]]) -> None:
+    """Добавить строки агрегата или прибавить значения к существующим"""
+    dialect = session.get_bind().dialect.name
+    table = model.__table__
+    if dialect not in _UPSERT_INSERTS:
+        await _update_or_insert(session, table, keys, rows)
+        return
+    stmt = _UPSERT_INSERTS[dialect](table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            column: table.c[column] + stmt.excluded[column]
+            for column in rows[0] if column not in keys
+        }
+    )
+    await session.execute(stmt, rows)
+
+
+async def _update_or_insert(session: AsyncSession, table: Any, keys: List[str], rows: List[Dict[str, Any]]) -> None:
+    """То же без ON CONFLICT: UPDATE строки, а если её нет - INSERT
+
+    По два запроса на строку. Одновременная вставка той же строки упадёт
+    на первичном ключе и откатит транзакцию заказа целиком.
+    """
+    for row in rows:
+        result = await session.execute(
+            update(table)
+            .where(*(table.c[key] == row[key] for key in keys))
+            .values({column: table.c[column] + value for column, value in row.items() if column not in keys})
+        )
+        if result.rowcount == 0:
+            await session.execute(insert(table).values(row))
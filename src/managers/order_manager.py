@@ -2,59 +2,143 @@ __all__ = [
     "OrderManager"
 ]
 
-from typing import Literal, Optional, Tuple, List
+from typing import Any, AsyncIterator, Dict, Literal, Optional, Tuple, List, Iterable
 
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, select, update, insert, func
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from loguru import logger
 
 from ..core import Order, OrderItem
 from ..core.database.models import OrderStatus
-from ..core.exceptions import OrderNotFoundError
-from ..schemas.order import CreateOrderSchema, OrderItemSchema, OrderSchema, OrderItemResponseSchema
+from ..core.exceptions import OrderNotFoundError, OrderAlreadyPaidError, OutOfStockError, ProductNotFoundError
+from ..core.logging import SampledLogger
+from .cache import get_product_cache
+from .ledger import SalesLedger, order_lines, line_prices, current_prices
+from .reservation import StockReservations
+from ..schemas.order import (
+    CreateOrderSchema, OrderItemSchema, OrderSchema, OrderItemResponseSchema,
+    OrderTotalSchema, OrderShortSchema, OrderPageSchema, BulkOrderResultSchema
+)
+from ..schemas.read import schema_columns, from_rows, from_object, from_values
+
+# Колонки в порядке полей схем: чтение заказов без объектов ORM
+ORDER_COLUMNS = schema_columns(OrderShortSchema, Order)
+ORDER_ITEM_COLUMNS = schema_columns(OrderItemResponseSchema, OrderItem)
+
+# Поиск заказа вызывается на каждый просмотр корзины: пишем только часть сообщений
+read_logger = SampledLogger()
 
 class OrderManager:
     def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
         self.Session = session_maker
+        self.product_cache = get_product_cache(session_maker)
+        self.reservations = StockReservations(session_maker)
         logger.debug("Инициализирован Order")
         
     async def create_order(self, order: CreateOrderSchema) -> OrderSchema:
-        """Создать заказ"""
-        logger.debug(f"🆕 Количество продуктов заказа: {len(order.items)}")
+        """Создать заказ и зарезервировать остатки (OutOfStockError, если не хватает)"""
+        logger.debug("🆕 Количество продуктов заказа: {}", len(order.items))
+        # Повторы одного продукта объединяются в одну позицию
+        lines = order_lines(order.items)
         try:
             async with self.Session() as session:
                 async with session.begin():
+                    # Сначала запись: условный UPDATE сразу берёт блокировку
+                    missing = await StockReservations.take(session, lines)
+                    if missing:
+                        raise await StockReservations.shortage(session, lines, missing)
+                    
+                    prices = await current_prices(session, lines)
                     sql_order = Order()
-                    for item in order.items:
+                    for product_id, count in lines.items():
                         sql_order.append(
-                            OrderItem(**item.model_dump())
+                            OrderItem(product_id=product_id, count=count, price=prices[product_id])
                         )
                     session.add(sql_order)
                     await session.flush()
+                    await StockReservations.reserve(session, sql_order.id, lines, self.reservations.ttl)
+                    await SalesLedger.record(session, sql_order.status, lines, prices)
                     
                     logger.success(
-                        f"✅ Заказ создан: '{sql_order.id}' "
-                        f"(ID: {sql_order.id}, Кол-во продуктов: {len(sql_order.items)})"
-                    )
-                    return OrderSchema(
-                        id = sql_order.id,
-                        status= sql_order.status,
-                        items = [OrderItemResponseSchema(
-                            id = x.id,
-                            product_id=x.product_id,
-                            count=x.count
-                        ) for x in sql_order.items]
+                        "✅ Заказ создан: '{}' (ID: {}, Кол-во продуктов: {})",
+                        sql_order.id, sql_order.id, len(sql_order.items)
                     )
+                    result = self._to_schema(sql_order)
+                    
+            self.product_cache.invalidate(lines)
+            return result
                     
+        except OutOfStockError as e:
+            logger.warning("⚠️ Заказ не создан: {}", e)
+            raise
+        
         except Exception as e:
-            logger.error(
-                f"❌ Ошибка создания заказа: {str(e)}"
-            )
+            logger.error("❌ Ошибка создания заказа: {}", e)
             raise
         
+    async def create_orders(self, orders: List[CreateOrderSchema]) -> List[BulkOrderResultSchema]:
+        """Создать пакет заказов в одной транзакции
+
+        Заказы и позиции вставляются пакетными INSERT (executemany) без ORM.
+        Заказы с несуществующими продуктами или без остатков пропускаются,
+        их ошибка возвращается на месте заказа (index - позиция в orders).
+        Остатки резервируются по порядку заказов в пакете.
+        """
+        logger.debug("🆕 Пакет заказов: {}", len(orders))
+        results: List[BulkOrderResultSchema] = []
+        valid: List[Tuple[int, Dict[int, int]]] = []
+        total_lines: Dict[int, int] = {}
+        try:
+            async with self.Session() as session:
+                async with session.begin():
+                    prices = await current_prices(session, {x.product_id for order in orders for x in order.items})
+
+                    for index, order in enumerate(orders):
+                        lines = order_lines(order.items)
+                        missing = sorted(set(lines) - set(prices))
+                        if missing:
+                            error = f"Не найдены продукты: {', '.join(map(str, missing))}"
+                        elif shortage := await StockReservations.take(session, lines):
+                            error = str(await StockReservations.shortage(session, lines, shortage))
+                        else:
+                            valid.append((index, lines))
+                            continue
+                        results.append(BulkOrderResultSchema(index=index, error=error))
+
+                    if valid:
+                        ids = (await session.scalars(
+                            insert(Order).returning(Order.id, sort_by_parameter_order=True),
+                            [{"status": OrderStatus.UNPAID.value}] * len(valid)
+                        )).all()
+
+                        item_rows = []
+                        for order_id, (index, lines) in zip(ids, valid):
+                            for product_id, count in lines.items():
+                                item_rows.append({
+                                    "order_id": order_id, "product_id": product_id,
+                                    "count": count, "price": prices[product_id]
+                                })
+                                total_lines[product_id] = total_lines.get(product_id, 0) + count
+                            results.append(BulkOrderResultSchema(index=index, id=order_id))
+
+                        await session.execute(insert(OrderItem), item_rows)
+                        await StockReservations.reserve_many(session, item_rows, self.reservations.ttl)
+                        await SalesLedger.record(
+                            session, OrderStatus.UNPAID.value, total_lines, prices, orders=len(valid)
+                        )
+
+            self.product_cache.invalidate(total_lines)
+            logger.success("✅ Пакет заказов: создано {}, с ошибками {}", len(valid), len(orders) - len(valid))
+            return sorted(results, key=lambda x: x.index)
+
+        except Exception as e:
+            logger.error("❌ Ошибка пакетного создания заказов: {}", e)
+            raise
+
     async def get_order(self, id: int) -> Optional[OrderSchema]:
-        logger.info(f"🔍 Поиск заказа ID: {id}")
+        read_logger.info("🔍 Поиск заказа ID: {}", id)
         try:
             async with self.Session() as session:
                 stmt = select(Order).options(selectinload(Order.items)).where(Order.id == id)
@@ -62,30 +146,22 @@ class OrderManager:
                 order = result.scalar_one_or_none()
                 
                 if order:
-                    logger.info(
-                        f"✅ Найден заказ: '{id}' "
-                        f"(ID: {order.id}, Кол-во продуктов: {len(order.items)})"
+                    read_logger.info(
+                        "✅ Найден заказ: '{}' (ID: {}, Кол-во продуктов: {})",
+                        id, order.id, len(order.items)
                     )
                 else:
-                    logger.warning(f"⚠️ заказ ID: {id} не найден")
-                    
-                return OrderSchema(
-                    id = order.id,
-                    status= order.status,
-                    items = [OrderItemResponseSchema(
-                        id = x.id,
-                        product_id=x.product_id,
-                        count=x.count
-                    ) for x in order.items]
-                ) if order else None
+                    logger.warning("⚠️ заказ ID: {} не найден", id)
+                    
+                return self._to_schema(order) if order else None
                 
         except Exception as e:
-            logger.error(f"❌ Ошибка поиска заказа ID: {id}: {str(e)}")
+            logger.error("❌ Ошибка поиска заказа ID: {}: {}", id, e)
             raise
         
     async def delete_order(self, id: int) -> Tuple[bool, str]:
         """Удаление заказа"""
-        logger.info(f"🗑️ Удаление заказа ID: {id}")
+        logger.info("🗑️ Удаление заказа ID: {}", id)
         
         try:
             async with self.Session() as session:
@@ -94,24 +170,34 @@ class OrderManager:
                     result = await session.execute(stmt)
                     order = result.scalar_one_or_none()
                     if not order:
-                        logger.warning(f"⚠️ заказ ID: {id} не найден для удаления")
+                        logger.warning("⚠️ заказ ID: {} не найден для удаления", id)
                         return False, f"заказ ID: {id} не найден для удаления"
                     
+                    released = await StockReservations.release(session, id)
+                    await SalesLedger.record(session, order.status, order_lines(order), line_prices(order), sign=-1)
                     await session.delete(order)
                     for items in order:
                         await session.delete(items)
                     
-                    logger.success(f"✅ Удален заказ: (ID: {id})")
-                    return True, f"Удален заказ: (ID: {id})"
+                    logger.success("✅ Удален заказ: (ID: {})", id)
+                    
+            self.product_cache.invalidate(released)
+            return True, f"Удален заказ: (ID: {id})"
                 
         except Exception as e:
-            logger.error(f"❌ Ошибка удаления заказа ID: {id}: {str(e)}")
+            logger.error("❌ Ошибка удаления заказа ID: {}: {}", id, e)
             raise
         
     async def update_order(self, id: int, item_data: OrderItemSchema) -> OrderSchema:
-        """Добавить продукт в заказ"""
-        logger.info(f"🛒 Добавление продукта в заказ ID: {id}")
-        logger.debug(f"Данные позиции: {item_data.model_dump()}")
+        """Добавить продукт в заказ или изменить его количество
+
+        У неоплаченного заказа меняется резерв, у оплаченного разница
+        сразу списывается со склада или возвращается на него
+        (OutOfStockError, если не хватает). ProductNotFoundError, если
+        добавляемого продукта нет.
+        """
+        logger.info("🛒 Добавление продукта в заказ ID: {}", id)
+        logger.opt(lazy=True).debug("Данные позиции: {}", item_data.model_dump)
         
         try:
             async with self.Session() as session:
@@ -120,7 +206,7 @@ class OrderManager:
                     result = await session.execute(stmt)
                     order = result.scalar_one_or_none()
                     if order is None:
-                        logger.error(f"❌ Заказ ID: {id} не найден")
+                        logger.error("❌ Заказ ID: {} не найден", id)
                         raise OrderNotFoundError(f"Заказ {id} не найден")
                     
                     existing_items = {item.product_id: item for item in order}
@@ -131,81 +217,315 @@ class OrderManager:
                         existing_item = existing_items[new_item.product_id]
                         old_count = existing_item.count
                         existing_item.count = new_item.count
+                        delta = new_item.count - old_count
+                        # Позиция остаётся по цене, по которой уже учтена
+                        price = existing_item.price or 0
                         logger.info(
-                            f"📦 Обновлено количество продукта {new_item.product_id} "
-                            f"в заказе {id}: {old_count} → {new_item.count}"
+                            "📦 Обновлено количество продукта {} в заказе {}: {} → {}",
+                            new_item.product_id, id, old_count, new_item.count
                         )
                 
                     else:
+                        prices = await current_prices(session, [new_item.product_id])
+                        if new_item.product_id not in prices:
+                            raise ProductNotFoundError(f"Продукт {new_item.product_id} не найден")
+                        price = new_item.price = prices[new_item.product_id]
                         order.items.append(new_item)
+                        delta = new_item.count
                         logger.info(
-                            f"📥 Добавлен новый продукт {new_item.product_id} "
-                            f"в заказ {id} (кол-во: {new_item.count})"
+                            "📥 Добавлен новый продукт {} в заказ {} (кол-во: {})",
+                            new_item.product_id, id, new_item.count
+                        )
+                    if order.status != OrderStatus.PAID.value:
+                        await StockReservations.adjust(
+                            session, id, new_item.product_id, delta, self.reservations.ttl
                         )
+                    # У оплаченного заказа резерва нет: отмена оплаты вернёт всё количество
+                    elif delta > 0:
+                        change = {new_item.product_id: delta}
+                        if await StockReservations.take(session, change):
+                            raise await StockReservations.shortage(session, change, change)
+                    elif delta < 0:
+                        await StockReservations.give_back(session, {new_item.product_id: -delta})
                     await session.flush()
-                    logger.success(f"✅ Заказ ID: {id} успешно обновлен")
-                    return OrderSchema(
-                        id = order.id,
-                        status= order.status,
-                        items = [OrderItemResponseSchema(
-                            id = x.id,
-                            product_id=x.product_id,
-                            count=x.count
-                        ) for x in order.items]
+                    await SalesLedger.record(
+                        session, order.status, {new_item.product_id: delta}, {new_item.product_id: price}, orders=0
                     )
+                    logger.success("✅ Заказ ID: {} успешно обновлен", id)
+                    result = self._to_schema(order)
                     
-        except OrderNotFoundError:
+            # new_item после коммита истёк: берём ID из запроса
+            self.product_cache.invalidate([item_data.product_id])
+            return result
+                    
+        except (OrderNotFoundError, OutOfStockError, ProductNotFoundError):
             raise
         
         except Exception as e:
-            logger.error(f"❌ Ошибка добавления продукта в заказ {id}: {str(e)}")
+            logger.error("❌ Ошибка добавления продукта в заказ {}: {}", id, e)
             raise
         
     async def update_status(self, id: int, status: Literal[OrderStatus.PAID, OrderStatus.UNPAID] = OrderStatus.PAID) -> None:
-        """Обновление статуса"""
-        logger.info(f"🔄 Обновление статуса об заказе ID: {id}")
+        """Обновление статуса
+
+        Оплата идёт через pay_order (списание остатков без резерва,
+        OutOfStockError, если их уже нет). Отмена оплаты возвращает всё
+        количество заказа на склад: резерва у оплаченного заказа нет, а
+        повторная оплата снова спишет остатки.
+        """
+        logger.info("🔄 Обновление статуса об заказе ID: {}", id)
         if not hasattr(status, 'value'):
             raise AttributeError("Переданный тип не является Enum")
         
+        if status == OrderStatus.PAID:
+            try:
+                await self.pay_order(id)
+            except OrderAlreadyPaidError:
+                logger.warning("Статуса заказа одинаковы")
+            return
+        
+        unpaid, paid = OrderStatus.UNPAID.value, OrderStatus.PAID.value
+        lines: Dict[int, int] = {}
         try:
             async with self.Session() as session:
                 async with session.begin():
-                    order = await session.get(Order, id)
+                    stmt = select(Order).options(selectinload(Order.items)).where(Order.id == id)
+                    order = (await session.execute(stmt)).scalar_one_or_none()
                     if not order:
                         raise OrderNotFoundError(f"Не найден заказ с ID {id}")
                     
-                    if order.status == status.value:
+                    # Условный UPDATE: одновременная отмена вернёт остатки только один раз
+                    result = await session.execute(
+                        update(Order)
+                        .where(Order.id == id, Order.status == paid)
+                        .values(status=unpaid)
+                        .execution_options(synchronize_session=False)
+                    )
+                    if result.rowcount == 0:
                         logger.warning("Статуса заказа одинаковы")
+                        return
                     
-                    else:
-                        order.status = status.value
-                        logger.success(f"Изменение статуса заказа на {status.value}")
-                    
+                    lines, prices = order_lines(order), line_prices(order)
+                    await StockReservations.give_back(session, lines)
+                    await SalesLedger.record(session, paid, lines, prices, sign=-1)
+                    await SalesLedger.record(session, unpaid, lines, prices)
+                    logger.success("Изменение статуса заказа на {}, остатки возвращены", unpaid)
                     
+            self.product_cache.invalidate(lines)
                     
         except OrderNotFoundError:
             raise
             
         except Exception as e:
-            logger.error(f"❌ Ошибка при обновлении статуса {e}")
+            logger.error("❌ Ошибка при обновлении статуса {}", e)
+            raise
+        
+    async def pay_order(self, id: int) -> OrderSchema:
+        """Оплатить заказ: сменить статус и списать остатки одной транзакцией
+
+        Зарезервированное при создании количество уже списано, отдельно
+        списывается только часть без резерва (резерв истёк).
+        """
+        logger.info("💳 Оплата заказа ID: {}", id)
+        paid = OrderStatus.PAID.value
+        
+        try:
+            async with self.Session() as session:
+                async with session.begin():
+                    stmt = select(Order).options(selectinload(Order.items)).where(Order.id == id)
+                    order = (await session.execute(stmt)).scalar_one_or_none()
+                    if not order:
+                        raise OrderNotFoundError(f"Не найден заказ с ID {id}")
+                    if order.status == paid:
+                        raise OrderAlreadyPaidError(f"Заказ {id} уже оплачен")
+                    
+                    old_status = order.status
+                    result = await session.execute(
+                        update(Order)
+                        .where(Order.id == id, Order.status == old_status)
+                        .values(status=paid)
+                        .execution_options(synchronize_session=False)
+                    )
+                    if result.rowcount == 0:
+                        raise OrderAlreadyPaidError(f"Статус заказа {id} уже изменён")
+                    
+                    lines = order_lines(order)
+                    reserved = await StockReservations.consume(session, id)
+                    unreserved = {
+                        product_id: count - reserved.get(product_id, 0)
+                        for product_id, count in lines.items()
+                        if count > reserved.get(product_id, 0)
+                    }
+                    missing = await StockReservations.take(session, unreserved)
+                    if missing:
+                        raise await StockReservations.shortage(session, unreserved, missing)
+                    
+                    prices = line_prices(order)
+                    await SalesLedger.record(session, old_status, lines, prices, sign=-1)
+                    await SalesLedger.record(session, paid, lines, prices)
+                    set_committed_value(order, "status", paid)
+                    
+                    logger.success("✅ Заказ ID: {} оплачен, остатки списаны", id)
+                    result = self._to_schema(order)
+                    
+            self.product_cache.invalidate(lines)
+            return result
+                    
+        except (OrderNotFoundError, OrderAlreadyPaidError, OutOfStockError) as e:
+            logger.warning("⚠️ Не удалось оплатить заказ ID: {}: {}", id, e)
+            raise
+        
+        except Exception as e:
+            logger.error("❌ Ошибка при оплате заказа ID: {}: {}", id, e)
             raise
         
     async def get_all_orders(self) -> List[OrderSchema]:
         try:
             async with self.Session() as session:
-                stmt = select(Order).options(selectinload(Order.items))
-                result = await session.execute(stmt)
-                orders = result.scalars()
+                orders = (await session.execute(select(*ORDER_COLUMNS).order_by(Order.id))).all()
+                return await self._with_items(session, orders)
+        except Exception as e:
+            logger.error("❌ Ошибка при получении всех заказов {}", e)
+            raise
+        
+    async def get_orders(
+        self,
+        cursor: Optional[int] = None,
+        limit: int = 50,
+        status: Optional[OrderStatus] = None,
+        min_id: Optional[int] = None,
+        max_id: Optional[int] = None,
+        with_items: bool = True
+    ) -> OrderPageSchema:
+        """Страница заказов (keyset-пагинация по ID)"""
+        stmt = select(*ORDER_COLUMNS)
+        
+        if cursor is not None:
+            stmt = stmt.where(Order.id > cursor)
+        if min_id is not None:
+            stmt = stmt.where(Order.id >= min_id)
+        if max_id is not None:
+            stmt = stmt.where(Order.id <= max_id)
+        if status is not None:
+            stmt = stmt.where(Order.status == status.value)
+        stmt = stmt.order_by(Order.id).limit(limit + 1)
+        
+        try:
+            async with self.Session() as session:
+                rows = (await session.execute(stmt)).all()
                 
-                return [OrderSchema(
-                    id = order.id,
-                    status= order.status,
-                    items = [OrderItemResponseSchema(
-                        id = x.id,
-                        product_id=x.product_id,
-                        count=x.count
-                    ) for x in order.items]
-                ) for order in orders]
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+                if with_items:
+                    orders = await self._with_items(session, rows, [x.id for x in rows])
+                else:
+                    orders = from_rows(OrderShortSchema, rows)
+                return OrderPageSchema(
+                    orders=orders,
+                    next_cursor=orders[-1].id if has_more else None
+                )
+        except Exception as e:
+            logger.error("❌ Ошибка при получении страницы заказов {}", e)
+            raise
+        
+    async def get_order_totals(
+        self,
+        status: Optional[OrderStatus] = None,
+        ids: Optional[Iterable[int]] = None
+    ) -> List[OrderTotalSchema]:
+        """Суммы заказов одним агрегирующим запросом"""
+        stmt = self._totals_stmt(status)
+        if ids is not None:
+            stmt = stmt.where(Order.id.in_(list(ids)))
+        return await self._fetch_totals(stmt)
+    
+    async def iter_order_totals(
+        self,
+        status: Optional[OrderStatus] = None,
+        chunk_size: int = 500
+    ) -> AsyncIterator[List[OrderTotalSchema]]:
+        """Суммы заказов порциями (keyset-пагинация по ID)"""
+        last_id = 0
+        while True:
+            stmt = self._totals_stmt(status).where(Order.id > last_id).limit(chunk_size)
+            chunk = await self._fetch_totals(stmt)
+            if not chunk:
+                return
+            
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            last_id = chunk[-1].id
+            
+    def _totals_stmt(self, status: Optional[OrderStatus] = None) -> Select:
+        total = func.coalesce(func.sum(OrderItem.count * OrderItem.price), 0)
+        stmt = (
+            select(Order.id, Order.status, total.label("total"))
+            .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+            .group_by(Order.id, Order.status)
+            .order_by(Order.id)
+        )
+        if status is not None:
+            stmt = stmt.where(Order.status == status.value)
+        return stmt
+    
+    async def _fetch_totals(self, stmt: Select) -> List[OrderTotalSchema]:
+        try:
+            async with self.Session() as session:
+                result = await session.execute(stmt)
+                return [
+                    OrderTotalSchema(id=row.id, status=row.status, total=round(row.total, 2))
+                    for row in result
+                ]
         except Exception as e:
-            logger.error(f"❌ Ошибка при получении всех заказов {e}")
-            raise
\ No newline at end of file
+            logger.error("❌ Ошибка при подсчёте сумм заказов {}", e)
+            raise
+        
+    async def get_revenue(self, status: OrderStatus = OrderStatus.PAID) -> float:
+        """Общая сумма заказов с указанным статусом (1 запрос)"""
+        stmt = (
+            select(func.coalesce(func.sum(OrderItem.count * OrderItem.price), 0))
+            .select_from(Order)
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .where(Order.status == status.value)
+        )
+        try:
+            async with self.Session() as session:
+                revenue = await session.scalar(stmt)
+                return round(revenue, 2)
+        except Exception as e:
+            logger.error("❌ Ошибка при подсчёте выручки {}", e)
+            raise
+        
+    @staticmethod
+    def _to_schema(order: Order) -> OrderSchema:
+        return from_values(OrderSchema, {
+            "id": order.id,
+            "status": order.status,
+            "items": [from_object(OrderItemResponseSchema, x) for x in order.items]
+        })
+    
+    @staticmethod
+    async def _with_items(
+        session: AsyncSession,
+        orders: List[Any],
+        ids: Optional[List[int]] = None
+    ) -> List[OrderSchema]:
+        """Заказы из строк (id, status) с позициями, прочитанными одним запросом
+
+        ids - заказы, позиции которых нужны; None - позиции всех заказов.
+        """
+        # Порядок индекса (order_id, product_id) - тот же, что у selectinload
+        stmt = select(OrderItem.order_id, *ORDER_ITEM_COLUMNS).order_by(OrderItem.order_id, OrderItem.product_id)
+        if ids is not None:
+            if not ids:
+                return []
+            stmt = stmt.where(OrderItem.order_id.in_(ids))
+        rows = (await session.execute(stmt)).all()
+        
+        items: Dict[int, List[OrderItemResponseSchema]] = {x.id: [] for x in orders}
+        for row, item in zip(rows, from_rows(OrderItemResponseSchema, (x[1:] for x in rows))):
+            if row.order_id in items:
+                items[row.order_id].append(item)
+        # Позиции уже схемы: пакетная проверка заказов здесь медленнее, чем по одному
+        return [from_values(OrderSchema, {"id": x.id, "status": x.status, "items": items[x.id]}) for x in orders]
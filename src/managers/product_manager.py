@@ -1,25 +1,46 @@
 __all__ = [
     "ProductManager"
 ]
-from typing import Optional, List, Tuple
+import base64
+import json
+from typing import Any, AsyncIterator, Dict, Literal, Optional, List, Tuple
 
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, or_, and_, func
+from sqlalchemy.exc import IntegrityError
 from loguru import logger
 
-from ..core import Product
-from ..core.exceptions import ProductNotFoundError
-from ..schemas.product import ProductCreateSchema, ProductUpdateSchema, ProductSchema
+from ..core import OrderItem, Product
+from ..core.exceptions import ProductNotFoundError, ProductInUseError
+from ..core.logging import SampledLogger
+from .cache import get_product_cache
+from ..schemas.product import ProductCreateSchema, ProductUpdateSchema, ProductSchema, ProductPageSchema
+from ..schemas.read import schema_columns, from_rows, from_object
+
+SortField = Literal["id", "price", "title"]
+
+SORT_COLUMNS = {
+    "id": Product.id,
+    "price": Product.price,
+    "title": Product.title
+}
+
+# Колонки продукта в порядке полей ProductSchema: чтение без объектов ORM
+PRODUCT_COLUMNS = schema_columns(ProductSchema, Product)
+
+# Чтения каталога вызываются на каждый запрос: пишем только часть сообщений
+read_logger = SampledLogger()
 
 class ProductManager:
     def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
         self.Session = session_maker
+        self.cache = get_product_cache(session_maker)
         logger.debug("Инициализирован ProductManager")
         
     async def create_product(self, product_data: ProductCreateSchema) -> ProductSchema:
         """Создать продукт"""
-        logger.info(f"🆕 Создание продукта: '{product_data.title}'")
-        logger.debug(f"Данные продукта: {product_data.model_dump()}")
+        logger.info("🆕 Создание продукта: '{}'", product_data.title)
+        logger.opt(lazy=True).debug("Данные продукта: {}", product_data.model_dump)
         
         try:
             async with self.Session() as session:
@@ -29,50 +50,61 @@ class ProductManager:
                     await session.flush()
                     
                     logger.success(
-                        f"✅ Продукт создан: '{product_data.title}' "
-                        f"(ID: {product.id}, Цена: {product.price}, Кол-во: {product.count})"
+                        "✅ Продукт создан: '{}' (ID: {}, Цена: {}, Кол-во: {})",
+                        product_data.title, product.id, product.price, product.count
                     )
-                    return ProductSchema(**product.as_dict())
+                    result = from_object(ProductSchema, product)
+                    
+            self.cache.invalidate([result.id])
+            return result
                     
         except Exception as e:
-            logger.error(
-                f"❌ Ошибка создания продукта '{product_data.title}': {str(e)}"
-            )
+            logger.error("❌ Ошибка создания продукта '{}': {}", product_data.title, e)
             raise
     
     async def get_product(self, id: int) -> Optional[ProductSchema]:
         """Получение продукта"""
-        logger.info(f"🔍 Поиск продукта ID: {id}")
+        read_logger.info("🔍 Поиск продукта ID: {}", id)
+        
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
         
         try:
+            version = self.cache.version
             async with self.Session() as session:
                 product = await session.get(Product, id)
                 
                 if product:
-                    logger.info(
-                        f"✅ Найден продукт: '{product.title}' "
-                        f"(ID: {product.id}, Цена: {product.price}, В наличии: {product.count})"
+                    read_logger.info(
+                        "✅ Найден продукт: '{}' (ID: {}, Цена: {}, В наличии: {})",
+                        product.title, product.id, product.price, product.count
                     )
                 else:
-                    logger.warning(f"⚠️ Продукт ID: {id} не найден")
+                    logger.warning("⚠️ Продукт ID: {} не найден", id)
+                    return None
                     
-                return ProductSchema(**product.as_dict()) if product else None
+                result = from_object(ProductSchema, product)
+                self.cache.put(result, version)
+                return result
                 
         except Exception as e:
-            logger.error(f"❌ Ошибка поиска продукта ID: {id}: {str(e)}")
+            logger.error("❌ Ошибка поиска продукта ID: {}: {}", id, e)
             raise
         
     async def update_product(self, product_data: ProductUpdateSchema) -> ProductSchema:
         """Обновление продукта"""
-        logger.info(f"🔄 Обновление продукта ID: {product_data.id}")
-        logger.debug(f"Данные для обновления: {product_data.model_dump(exclude_unset=True)}")
+        logger.info("🔄 Обновление продукта ID: {}", product_data.id)
+        logger.opt(lazy=True).debug(
+            "Данные для обновления: {}", lambda: product_data.model_dump(exclude_unset=True)
+        )
         
         try:
             async with self.Session() as session:
                 async with session.begin():
                     product = await session.get(Product, product_data.id)
                     if not product:
-                        logger.error(f"❌ Продукт ID: {product_data.id} не найден для обновления")
+                        logger.error("❌ Продукт ID: {} не найден для обновления", product_data.id)
                         raise ProductNotFoundError(f"Продукт {product_data.id} не найден")
                     
                     update_data = product_data.model_dump(exclude_unset=True, exclude_none=True)
@@ -86,69 +118,240 @@ class ProductManager:
                     
                     if changes:
                         logger.info(
-                            f"✅ Обновлен продукт ID: {product_data.id} "
-                            f"('{product.title}'). Изменения: {', '.join(changes)}"
+                            "✅ Обновлен продукт ID: {} ('{}'). Изменения: {}",
+                            product_data.id, product.title, ", ".join(changes)
                         )
                     else:
-                        logger.info(f"ℹ️ Продукт ID: {product_data.id} не требует изменений")
+                        logger.info("ℹ️ Продукт ID: {} не требует изменений", product_data.id)
                     
-                    return ProductSchema(**product.as_dict())
+                    result = from_object(ProductSchema, product)
+                    
+            if changes:
+                self.cache.invalidate([result.id])
+            return result
                     
         except ProductNotFoundError:
             raise
         
         except Exception as e:
-            logger.error(f"❌ Ошибка обновления продукта ID: {product_data.id}: {str(e)}")
+            logger.error("❌ Ошибка обновления продукта ID: {}: {}", product_data.id, e)
             raise
     
     async def delete_product(self, id: int) -> Tuple[bool, str]:
-        """Удаление продукта"""
-        logger.info(f"🗑️ Удаление продукта ID: {id}")
+        """Удаление продукта
+
+        Продукт из заказов не удаляется (ProductInUseError): на него
+        ссылаются позиции заказов. Проверка явная, потому что SQLite
+        без PRAGMA foreign_keys внешние ключи не проверяет; на PostgreSQL
+        заказ, созданный одновременно с удалением, остановит внешний ключ.
+        """
+        logger.info("🗑️ Удаление продукта ID: {}", id)
+        in_use = f"Продукт ID: {id} есть в заказах, удалить его нельзя (можно обнулить остаток)"
         
         try:
             async with self.Session() as session:
                 async with session.begin():
                     product = await session.get(Product, id)
                     if not product:
-                        logger.warning(f"⚠️ Продукт ID: {id} не найден для удаления")
+                        logger.warning("⚠️ Продукт ID: {} не найден для удаления", id)
                         return False, f"Продукт ID: {id} не найден для удаления"
                     
+                    orders = await session.scalar(
+                        select(func.count()).select_from(OrderItem).where(OrderItem.product_id == id)
+                    )
+                    if orders:
+                        raise ProductInUseError(f"{in_use}; заказов: {orders}")
+                    
                     product_title = product.title
                     await session.delete(product)
                     
-                    logger.success(f"✅ Удален продукт: '{product_title}' (ID: {id})")
-                    return True, f"Удален продукт: '{product_title}' (ID: {id})"
+                    logger.success("✅ Удален продукт: '{}' (ID: {})", product_title, id)
+                    
+            self.cache.invalidate([id])
+            return True, f"Удален продукт: '{product_title}' (ID: {id})"
+        
+        except IntegrityError as e:
+            logger.warning("⚠️ Продукт ID: {} не удалён, на него ссылаются: {}", id, e.orig)
+            raise ProductInUseError(in_use) from e
+        
+        except ProductInUseError as e:
+            logger.warning("⚠️ {}", e)
+            raise
                 
         except Exception as e:
-            logger.error(f"❌ Ошибка удаления продукта ID: {id}: {str(e)}")
+            logger.error("❌ Ошибка удаления продукта ID: {}: {}", id, e)
             raise
     
     async def get_all_products(self) -> List[ProductSchema]:
         """Получение всех продуктов"""
-        logger.info("📋 Получение списка всех продуктов")
+        read_logger.info("📋 Получение списка всех продуктов")
+        
+        cached = self.cache.get_all()
+        if cached is not None:
+            return cached
         
         try:
+            version = self.cache.version
             async with self.Session() as session:
-                result = await session.execute(select(Product))
-                products = result.scalars().all()
+                result = await session.execute(select(*PRODUCT_COLUMNS).order_by(Product.id))
+                products = from_rows(ProductSchema, result)
                 
-                logger.info(f"📊 Загружено продуктов: {len(products)}")
-                return [ProductSchema(**x.as_dict()) for x in products]
+                read_logger.info("📊 Загружено продуктов: {}", len(products))
+                self.cache.put_all(products, version)
+                return list(products)
                 
         except Exception as e:
-            logger.error(f"❌ Ошибка получения списка продуктов: {str(e)}")
+            logger.error("❌ Ошибка получения списка продуктов: {}", e)
             raise
         
     async def get_products(self, order_ids: List[int]) -> List[ProductSchema]:
         """Получить несколько заказов с продуктами (1 запрос)"""
         
-        async with self.Session() as session:
-            stmt = (
-                select(Product)
-                .where(Product.id.in_(order_ids))
-                .order_by(Product.id)
-            )
-            result = await session.execute(stmt)
-            orders = result.scalars().all()
+        found, missing = self.cache.get_many(order_ids)
+        read_logger.debug("🔍 Поиск продуктов: {}, нет в кэше: {}", len(order_ids), len(missing))
+        if missing:
+            version = self.cache.version
+            async with self.Session() as session:
+                stmt = (
+                    select(*PRODUCT_COLUMNS)
+                    .where(Product.id.in_(missing))
+                    .order_by(Product.id)
+                )
+                result = await session.execute(stmt)
+                loaded = from_rows(ProductSchema, result)
+                
+            self.cache.put_many(loaded, version)
+            found.update((x.id, x) for x in loaded)
+        
+        return [found[id] for id in sorted(found)]
+        
+    async def upsert_products(self, rows: List[ProductCreateSchema]) -> Tuple[int, int]:
+        """Добавить или обновить пакет продуктов (одна транзакция), вернуть (создано, обновлено)
+
+        Продукт ищется по external_id, если он указан, иначе по названию
+        (из нескольких продуктов с одним названием берётся с меньшим ID).
+        Повторы ключа внутри пакета схлопываются, побеждает последний.
+        """
+        by_key: Dict[Tuple[str, str], ProductCreateSchema] = {}
+        for row in rows:
+            key = ("external_id", row.external_id) if row.external_id else ("title", row.title)
+            by_key[key] = row
+        external_ids = [value for field, value in by_key if field == "external_id"]
+        titles = [value for field, value in by_key if field == "title"]
+        
+        try:
+            async with self.Session() as session:
+                async with session.begin():
+                    existing: Dict[Tuple[str, str], int] = {}
+                    if external_ids:
+                        result = await session.execute(
+                            select(Product.id, Product.external_id).where(Product.external_id.in_(external_ids))
+                        )
+                        existing.update((("external_id", x.external_id), x.id) for x in result)
+                    if titles:
+                        result = await session.execute(
+                            select(Product.id, Product.title)
+                            .where(Product.title.in_(titles))
+                            .order_by(Product.id.desc())
+                        )
+                        existing.update((("title", x.title), x.id) for x in result)
+                    
+                    updates, inserts = [], []
+                    for key, row in by_key.items():
+                        if key in existing:
+                            # Строка без external_id не стирает уже заданный
+                            updates.append({"id": existing[key], **row.model_dump(exclude_none=True)})
+                        else:
+                            inserts.append(row.model_dump())
+                    
+                    if updates:
+                        await session.execute(update(Product), updates)
+                    if inserts:
+                        await session.execute(insert(Product), inserts)
+                        
+            logger.info("📥 Импорт продуктов: создано {}, обновлено {}", len(inserts), len(updates))
+            self.cache.invalidate([x["id"] for x in updates])
+            return len(inserts), len(updates)
+        
+        except Exception as e:
+            logger.error("❌ Ошибка импорта продуктов: {}", e)
+            raise
+    
+    async def iter_products(self, chunk_size: int = 500) -> AsyncIterator[List[ProductSchema]]:
+        """Все продукты порциями по ID (без загрузки каталога целиком)"""
+        last_id = 0
+        while True:
+            async with self.Session() as session:
+                result = await session.execute(
+                    select(*PRODUCT_COLUMNS)
+                    .where(Product.id > last_id)
+                    .order_by(Product.id)
+                    .limit(chunk_size)
+                )
+                chunk = from_rows(ProductSchema, result)
+            if not chunk:
+                return
+            yield chunk
+            last_id = chunk[-1].id
+    
+    async def get_products_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        sort: SortField = "id",
+        desc: bool = False,
+        in_stock: bool = False
+    ) -> ProductPageSchema:
+        """Страница каталога (keyset-пагинация по полю сортировки и ID)"""
+        column = SORT_COLUMNS[sort]
+        stmt = select(*PRODUCT_COLUMNS)
+        if in_stock:
+            stmt = stmt.where(Product.count > 0)
             
-            return [ProductSchema(**order.as_dict()) for order in orders]
\ No newline at end of file
+        if cursor:
+            value, last_id = _decode_cursor(cursor)
+            if sort == "id":
+                stmt = stmt.where(Product.id < last_id if desc else Product.id > last_id)
+            elif desc:
+                stmt = stmt.where(or_(column < value, and_(column == value, Product.id < last_id)))
+            else:
+                stmt = stmt.where(or_(column > value, and_(column == value, Product.id > last_id)))
+        
+        if sort == "id":
+            order_by = [Product.id.desc() if desc else Product.id]
+        else:
+            order_by = [column.desc(), Product.id.desc()] if desc else [column, Product.id]
+        stmt = stmt.order_by(*order_by).limit(limit + 1)
+        
+        try:
+            async with self.Session() as session:
+                result = await session.execute(stmt)
+                products = from_rows(ProductSchema, result)
+                
+                has_more = len(products) > limit
+                products = products[:limit]
+                next_cursor = None
+                if has_more:
+                    last = products[-1]
+                    next_cursor = _encode_cursor(getattr(last, sort), last.id)
+                    
+                read_logger.info("📊 Страница каталога: {} продуктов (сортировка: {})", len(products), sort)
+                return ProductPageSchema(products=products, next_cursor=next_cursor)
+                
+        except Exception as e:
+            logger.error("❌ Ошибка получения страницы каталога: {}", e)
+            raise
+
+
+def _encode_cursor(value: Any, id: int) -> str:
+    raw = json.dumps([value, id], ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, id = json.loads(raw)
+        return value, int(id)
+    except Exception:
+        raise ValueError(f"Некорректный курсор: {cursor}")
@@ -0,0 +1,242 @@
+__all__ = [
+    "StockReservations"
+]
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import case, select, update, delete, insert
+from loguru import logger
+
+from ..core import Product
+from ..core.const import RESERVATION_TTL, RESERVATION_SWEEP_INTERVAL
+from ..core.database.models import StockReservation
+from ..core.exceptions import OutOfStockError
+from .cache import get_product_cache
+
+
+def utcnow() -> datetime:
+    """Текущее время UTC без часового пояса (так хранится expires_at)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class StockReservations:
+    """Резерв остатков под неоплаченные заказы
+
+    Остаток списывается условным UPDATE (count >= нужного количества)
+    в транзакции создания заказа, поэтому одновременные заказы не могут
+    уйти в минус: каждый либо получает товар, либо OutOfStockError.
+    Резерв живёт ttl секунд; истёкшие резервы возвращает на склад sweep,
+    при оплате резерв превращается в окончательное списание (consume).
+    """
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession], ttl: int = RESERVATION_TTL):
+        self.Session = session_maker
+        self.ttl = ttl
+        self.product_cache = get_product_cache(session_maker)
+        logger.debug("Инициализирован StockReservations")
+
+    @staticmethod
+    async def take(session: AsyncSession, lines: Dict[int, int]) -> List[int]:
+        """Списать остатки внутри текущей транзакции: всё или ничего
+
+        Один UPDATE на все продукты: count уменьшается только там, где
+        count >= нужного количества (CASE по ID). Возвращает ID продуктов,
+        которых не хватило; в этом случае списанное этим же запросом
+        возвращается. Строки находятся по первичному ключу, список IN
+        PostgreSQL обходит по возрастанию ID, поэтому встречные
+        транзакции блокируют продукты в одном порядке.
+        """
+        lines = {product_id: count for product_id, count in lines.items() if count > 0}
+        if not lines:
+            return []
+        needed = case(lines, value=Product.id)
+        taken = (await session.scalars(
+            update(Product)
+            .where(Product.id.in_(lines), Product.count >= needed)
+            .values(count=Product.count - needed)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )).all()
+        if len(taken) == len(lines):
+            return []
+
+        if taken:
+            await _give_back(session, {product_id: lines[product_id] for product_id in taken})
+        return sorted(set(lines) - set(taken))
+
+    @staticmethod
+    async def shortage(session: AsyncSession, lines: Dict[int, int], missing: Iterable[int]) -> OutOfStockError:
+        """Ошибка с перечнем продуктов, которых не хватило"""
+        missing = list(missing)
+        found = {
+            x.id: x for x in await session.execute(
+                select(Product.id, Product.title, Product.count).where(Product.id.in_(missing))
+            )
+        }
+        return OutOfStockError(
+            "Не хватает на складе: " + ", ".join(
+                f"{found[id].title} (нужно {lines[id]}, осталось {found[id].count} шт.)"
+                if id in found else f"продукт {id} не найден"
+                for id in missing
+            )
+        )
+
+    @staticmethod
+    async def reserve(
+        session: AsyncSession,
+        order_id: int,
+        lines: Dict[int, int],
+        ttl: int = RESERVATION_TTL
+    ) -> None:
+        """Записать резерв под заказ (остатки уже списаны через take)"""
+        rows = [
+            {"order_id": order_id, "product_id": product_id, "count": count}
+            for product_id, count in lines.items() if count > 0
+        ]
+        await StockReservations.reserve_many(session, rows, ttl)
+
+    @staticmethod
+    async def reserve_many(session: AsyncSession, rows: List[Dict[str, int]], ttl: int = RESERVATION_TTL) -> None:
+        """Записать резервы пакетом: строки {order_id, product_id, count}"""
+        if not rows:
+            return
+        expires_at = utcnow() + timedelta(seconds=ttl)
+        await session.execute(insert(StockReservation), [{**x, "expires_at": expires_at} for x in rows])
+
+    @staticmethod
+    async def adjust(
+        session: AsyncSession,
+        order_id: int,
+        product_id: int,
+        delta: int,
+        ttl: int = RESERVATION_TTL
+    ) -> None:
+        """Изменить резерв позиции на delta (OutOfStockError, если не хватает)
+
+        При уменьшении возвращается не больше, чем было зарезервировано:
+        часть заказа без резерва (истёк) остатки не занимает.
+        """
+        if not delta:
+            return
+        reservation = (await session.execute(
+            select(StockReservation)
+            .where(StockReservation.order_id == order_id, StockReservation.product_id == product_id)
+        )).scalar_one_or_none()
+
+        if delta > 0:
+            missing = await StockReservations.take(session, {product_id: delta})
+            if missing:
+                raise await StockReservations.shortage(session, {product_id: delta}, missing)
+            expires_at = utcnow() + timedelta(seconds=ttl)
+            if reservation is None:
+                session.add(StockReservation(
+                    order_id=order_id, product_id=product_id, count=delta, expires_at=expires_at
+                ))
+            else:
+                reservation.count += delta
+                reservation.expires_at = expires_at
+            return
+
+        if reservation is None:
+            return
+        released = min(-delta, reservation.count)
+        await _give_back(session, {product_id: released})
+        if released == reservation.count:
+            await session.delete(reservation)
+        else:
+            reservation.count -= released
+
+    @staticmethod
+    async def consume(session: AsyncSession, order_id: int) -> Dict[int, int]:
+        """Удалить резерв заказа без возврата на склад (оплата)
+
+        Возвращает {product_id: зарезервированное количество}; остальное
+        количество позиций нужно списать отдельно.
+        """
+        result = await session.execute(
+            delete(StockReservation)
+            .where(StockReservation.order_id == order_id)
+            .returning(StockReservation.product_id, StockReservation.count)
+        )
+        return {row.product_id: row.count for row in result}
+
+    @staticmethod
+    async def release(session: AsyncSession, order_id: int) -> Dict[int, int]:
+        """Удалить резерв заказа и вернуть остатки на склад"""
+        lines = await StockReservations.consume(session, order_id)
+        await _give_back(session, lines)
+        return lines
+
+    @staticmethod
+    async def give_back(session: AsyncSession, lines: Dict[int, int]) -> None:
+        """Вернуть на склад списанное без резерва (отмена оплаты)"""
+        await _give_back(session, lines)
+
+    async def sweep(self, now: Optional[datetime] = None, batch_size: int = 500) -> int:
+        """Вернуть на склад истёкшие резервы, возвращает число резервов
+
+        Резерв удаляется DELETE ... RETURNING, поэтому одновременная оплата
+        и проверка не вернут один резерв дважды: кто удалил строку, тот и
+        распоряжается остатком.
+        """
+        now = now or utcnow()
+        total = 0
+        products: Dict[int, int] = {}
+        try:
+            while True:
+                async with self.Session() as session:
+                    async with session.begin():
+                        expired = (
+                            select(StockReservation.id)
+                            .where(StockReservation.expires_at <= now)
+                            .limit(batch_size)
+                            .scalar_subquery()
+                        )
+                        rows = (await session.execute(
+                            delete(StockReservation)
+                            .where(StockReservation.id.in_(expired))
+                            .returning(StockReservation.product_id, StockReservation.count)
+                        )).all()
+                        lines: Dict[int, int] = {}
+                        for row in rows:
+                            lines[row.product_id] = lines.get(row.product_id, 0) + row.count
+                        await _give_back(session, lines)
+
+                total += len(rows)
+                for product_id, count in lines.items():
+                    products[product_id] = products.get(product_id, 0) + count
+                if len(rows) < batch_size:
+                    break
+        except Exception as e:
+            logger.error(f"❌ Ошибка при возврате истёкших резервов {e}")
+            raise
+
+        if products:
+            self.product_cache.invalidate(products)
+            logger.info(f"⏳ Истёк резерв {total} позиций, возвращено на склад: {sum(products.values())} шт.")
+        return total
+
+    async def run_sweeper(self, interval: float = RESERVATION_SWEEP_INTERVAL) -> None:
+        """Фоновая задача: проверять истёкшие резервы каждые interval секунд"""
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                # Ошибка уже записана в лог, следующая попытка через interval
+                pass
+            await asyncio.sleep(interval)
+
+
+async def _give_back(session: AsyncSession, lines: Dict[int, int]) -> None:
+    """Вернуть количество на склад одним UPDATE"""
+    lines = {product_id: count for product_id, count in lines.items() if count > 0}
+    if not lines:
+        return
+    await session.execute(
+        update(Product)
+        .where(Product.id.in_(lines))
+        .values(count=Product.count + case(lines, value=Product.id))
+        .execution_options(synchronize_session=False)
+    )
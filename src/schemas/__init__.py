@@ -1,3 +1,3 @@
-from .product import ProductSchema, ProductCreateSchema, ProductUpdateSchema
+from .product import ProductSchema, ProductCreateSchema, ProductUpdateSchema, ProductPageSchema
 
-__all__ = ["ProductSchema", "ProductCreateSchema", "ProductUpdateSchema"]
\ No newline at end of file
+__all__ = ["ProductSchema", "ProductCreateSchema", "ProductUpdateSchema", "ProductPageSchema"]
\ No newline at end of file
@@ -0,0 +1,44 @@
+from datetime import date
+from typing import List
+from pydantic import BaseModel, ConfigDict
+
+
+class StatusSummarySchema(BaseModel):
+    """Количество и сумма заказов по статусу"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    status: str
+    orders: int
+    amount: float
+
+
+class DailyRevenueSchema(BaseModel):
+    """Выручка за день"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    day: date
+    orders: int
+    revenue: float
+
+
+class ProductSalesSchema(BaseModel):
+    """Продажи продукта"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    product_id: int
+    units: int
+    revenue: float
+
+
+class SalesSummarySchema(BaseModel):
+    """Сводка по продажам из агрегатов"""
+    statuses: List[StatusSummarySchema]
+    days: List[DailyRevenueSchema]
+    products: List[ProductSalesSchema]
+
+
+class LedgerReconcileSchema(BaseModel):
+    """Результат сверки агрегатов с заказами"""
+    revenue_before: float
+    revenue_after: float
+    daily_adjustment: float
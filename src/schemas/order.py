@@ -1,16 +1,16 @@
-from typing import List
-from pydantic import BaseModel, ConfigDict
+from typing import List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class OrderItemSchema(BaseModel):
     """Схема для обозночение продукта"""
     product_id: int
-    count: int
+    count: int = Field(gt=0)
 
 
 class CreateOrderSchema(BaseModel):
     """Схема для создание заказа"""
-    items: List[OrderItemSchema]
+    items: List[OrderItemSchema] = Field(min_length=1)
     
     
 class OrderItemResponseSchema(BaseModel):
@@ -19,10 +19,43 @@ class OrderItemResponseSchema(BaseModel):
     id: int
     product_id: int
     count: int
+    # Цена за единицу, по которой позиция учтена в заказе
+    price: Optional[float] = None
 
-class OrderSchema(BaseModel):
+class OrderShortSchema(BaseModel):
+    """Схема заказа без позиций"""
     model_config = ConfigDict(from_attributes=True)
     
     id: int
     status: str
-    items: List[OrderItemResponseSchema]
\ No newline at end of file
+
+
+class OrderSchema(OrderShortSchema):
+    items: List[OrderItemResponseSchema]
+
+
+class OrderPageSchema(BaseModel):
+    """Страница заказов, next_cursor - ID для следующего запроса"""
+    orders: List[Union[OrderSchema, OrderShortSchema]]
+    next_cursor: Optional[int] = None
+
+
+class OrderTotalSchema(BaseModel):
+    """Схема суммы заказа"""
+    id: int
+    status: str
+    total: float
+
+
+class BulkOrderResultSchema(BaseModel):
+    """Результат по одному заказу из пакета: id созданного заказа или ошибка"""
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkOrderSchema(BaseModel):
+    """Итог пакетного создания заказов"""
+    created: int
+    failed: int
+    orders: List[BulkOrderResultSchema]
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, field_validator, ConfigDict, model_validator
 
 
@@ -31,6 +31,16 @@ class Validator:
             raise ValueError("Количество слишком большое")
         return value
     
+    @staticmethod
+    def validate_external_id(value: Optional[str]) -> Optional[str]:
+        """Валидация внешнего ID (пустая строка - нет ID)"""
+        if value is None:
+            return None
+        value = value.strip()
+        if len(value) > 64:
+            raise ValueError("Внешний ID слишком длинный")
+        return value or None
+    
     @staticmethod
     def validate_poster(value: str) -> str:
         """Валидация постера"""
@@ -48,6 +58,7 @@ class ProductBaseSchema(BaseModel):
     price: float
     count: int
     description: str
+    external_id: Optional[str] = None
     
     @field_validator('title')
     def validate_title(cls, value: str) -> str:
@@ -64,6 +75,10 @@ class ProductBaseSchema(BaseModel):
     @field_validator('poster')
     def validate_poster(cls, value: str) -> str:
         return Validator.validate_poster(value)
+    
+    @field_validator('external_id')
+    def validate_external_id(cls, value: Optional[str]) -> Optional[str]:
+        return Validator.validate_external_id(value)
 
 
 class ProductSchema(ProductBaseSchema):
@@ -71,6 +86,16 @@ class ProductSchema(ProductBaseSchema):
     id: int
 
 
+class ProductPageSchema(BaseModel):
+    """Страница каталога, next_cursor - курсор для следующего запроса
+
+    posters - srcset вариантов постеров по ID продукта ({MIME-тип: srcset})
+    """
+    products: List[ProductSchema]
+    next_cursor: Optional[str] = None
+    posters: Dict[int, Dict[str, str]] = {}
+
+
 class ProductCreateSchema(ProductBaseSchema):
     """Схема для создания продукта (без ID)"""
     pass
@@ -121,4 +146,17 @@ class ProductUpdateSchema(BaseModel):
         if all(value is None for value in self.model_dump().values()):
             raise ValueError("Хотя бы одно поле должно быть указано для обновления")
         return self
-  
\ No newline at end of file
+  
+
+class ProductImportErrorSchema(BaseModel):
+    """Ошибка в строке файла импорта"""
+    line: int
+    error: str
+
+
+class ProductImportSchema(BaseModel):
+    """Итог импорта продуктов (errors - первые ошибки, всего их failed)"""
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[ProductImportErrorSchema] = []
@@ -0,0 +1,59 @@
+"""Сборка схем из строк БД одним вызовом pydantic-core
+
+Строки читаются колонками (без объектов ORM) и проверяются пакетом:
+TypeAdapter(List[схема]) проходит весь список в pydantic-core, что
+быстрее, чем создавать схемы по одной (model_validate или
+model_construct, который в pydantic 2 работает на Python). Каждая схема
+получается обычной, со своим набором заданных полей.
+
+Выигрыш есть только для плоских строк: словари с уже готовыми
+вложенными схемами (заказ с позициями) быстрее собирать по одному
+через from_values.
+"""
+__all__ = [
+    "schema_columns",
+    "from_rows",
+    "from_object",
+    "from_values",
+    "from_dicts"
+]
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Column
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def schema_columns(schema: Type[BaseModel], model: Any) -> List[Column]:
+    """Колонки таблицы model в порядке полей schema (для select и from_rows)"""
+    table = model.__table__
+    return [table.c[name] for name in schema.model_fields]
+
+
+def from_rows(schema: Type[M], rows: Iterable[Sequence[Any]]) -> List[M]:
+    """Схемы из строк select(*schema_columns(schema, model))"""
+    names = tuple(schema.model_fields)
+    return from_dicts(schema, [dict(zip(names, row)) for row in rows])
+
+
+def from_dicts(schema: Type[M], values: List[Dict[str, Any]]) -> List[M]:
+    """Схемы из списка словарей одним вызовом"""
+    return _list_adapter(schema).validate_python(values)
+
+
+def from_object(schema: Type[M], obj: Any) -> M:
+    """Схема из объекта ORM по одноимённым атрибутам"""
+    return schema.model_validate(obj, from_attributes=True)
+
+
+def from_values(schema: Type[M], values: Dict[str, Any]) -> M:
+    """Схема из словаря (вложенные схемы повторно не проверяются)"""
+    return schema.model_validate(values)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[M]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
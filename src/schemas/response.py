@@ -0,0 +1,16 @@
+from typing import Generic, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class ResponseSchema(BaseModel, Generic[T]):
+    """Успешный ответ API: {'ok': True, 'result': ...}"""
+    ok: bool = True
+    result: T
+
+
+class DetailSchema(BaseModel):
+    """Ответ API с пояснением (в том числе ошибка): {'ok': ..., 'detail': ...}"""
+    ok: bool
+    detail: str
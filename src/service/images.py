@@ -0,0 +1,200 @@
+__all__ = [
+    "PosterFile",
+    "PosterImages",
+    "poster_images"
+]
+
+import asyncio
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from email.utils import formatdate
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from PIL import Image, ImageOps, features
+
+from ..core.const import PATH_TO_SAVE_IMAGE, POSTER_WIDTHS
+
+# Формат → (расширение, MIME-тип, параметры сохранения); порядок = приоритет в <picture>
+FORMATS = {
+    "AVIF": (".avif", "image/avif", {"quality": 50}),
+    "WEBP": (".webp", "image/webp", {"quality": 80, "method": 4}),
+    "JPEG": (".jpg", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+VARIANT_RE = re.compile(r"^(?P<stem>.+)\.w(?P<width>\d+)(?P<ext>\.avif|\.webp|\.jpg)$")
+MIME_BY_EXT = {ext: mime for ext, mime, _ in FORMATS.values()}
+SOURCE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+# Имена файлов, которые отдаются из папки постеров (без путей и "..")
+POSTER_NAME_RE = re.compile(r"^[\w-]+(?:\.w\d+)?\.(?:jpe?g|png|webp|avif)$", re.IGNORECASE)
+# Постеры, названные по хэшу содержимого, и их варианты никогда не меняются
+HASHED_NAME_RE = re.compile(r"^[0-9a-f]{16}(?:\.w\d+)?\.\w+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+LEGACY_CACHE_CONTROL = "public, max-age=3600"
+
+
+@dataclass(frozen=True)
+class PosterFile:
+    """Файл постера с заранее подготовленными заголовками ответа"""
+    path: Path
+    stat: os.stat_result
+    headers: Dict[str, str]
+
+    @classmethod
+    def from_path(cls, path: Path) -> "PosterFile":
+        stat = path.stat()
+        if HASHED_NAME_RE.match(path.name):
+            etag, cache_control = path.name.rsplit(".", 1)[0], IMMUTABLE_CACHE_CONTROL
+        else:
+            etag, cache_control = f"{stat.st_mtime_ns:x}-{stat.st_size:x}", LEGACY_CACHE_CONTROL
+        return cls(path, stat, {
+            "ETag": f'"{etag}"',
+            "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+            "Cache-Control": cache_control
+        })
+
+
+def content_name(path: Path) -> str:
+    """Имя файла по хэшу содержимого (расширение сохраняется)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16] + path.suffix.lower()
+
+
+def build_variants(source: str, widths: Tuple[int, ...] = POSTER_WIDTHS) -> List[str]:
+    """Нарезать постер по ширинам во всех доступных форматах (выполняется в отдельном процессе)"""
+    source_path = Path(source)
+    formats = [name for name in FORMATS if name != "AVIF" or features.check("avif")]
+    written = []
+
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        for width in widths:
+            if width > image.width and width != widths[0]:
+                break
+            resized = image.copy()
+            resized.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+
+            for name in formats:
+                ext, _, options = FORMATS[name]
+                # В имени - фактическая ширина: маленький исходник не увеличивается
+                target = source_path.with_name(f"{source_path.stem}.w{resized.width}{ext}")
+                resized.save(target, name, **options)
+                written.append(target.name)
+    return written
+
+
+class PosterImages:
+    """Варианты постеров (размеры и форматы) и пул процессов для их создания
+
+    Индекс файлов и вариантов держится в памяти: при рендере каталога
+    srcset собирается, а постер отдаётся без лишних обращений к диску.
+    """
+    def __init__(self, directory: Path = PATH_TO_SAVE_IMAGE, workers: int = 2):
+        self.directory = Path(directory)
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._variants: Dict[str, Dict[str, List[Tuple[int, str]]]] = {}
+        self._files: Dict[str, PosterFile] = {}
+
+    def scan(self) -> None:
+        """Заполнить индекс по уже созданным файлам"""
+        self._variants.clear()
+        self._files.clear()
+        if self.directory.exists():
+            self._register(x.name for x in self.directory.iterdir())
+
+    def lookup(self, name: str) -> Optional[PosterFile]:
+        """Файл постера по имени или None (недопустимое имя или файла нет)"""
+        file = self._files.get(name)
+        if file is not None:
+            return file
+        if not POSTER_NAME_RE.match(name):
+            return None
+        # Файл мог появиться в обход индекса (другой процесс, ручное копирование)
+        path = self.directory / name
+        if not path.is_file():
+            return None
+        self._register([name])
+        return self._files.get(name)
+
+    async def store(self, path: Path) -> Path:
+        """Переименовать загруженный постер по хэшу содержимого
+
+        Повторная загрузка того же изображения не создаёт копию файла.
+        """
+        path = Path(path)
+        target = path.with_name(await asyncio.to_thread(content_name, path))
+        if target.exists():
+            path.unlink()
+        else:
+            path.replace(target)
+        self._register([target.name])
+        return target
+
+    async def backfill(self) -> int:
+        """Создать варианты для постеров, загруженных до появления конвейера
+
+        Возвращает количество обработанных постеров.
+        """
+        self.scan()
+        if not self.directory.exists():
+            return 0
+        sources = [
+            x for x in self.directory.iterdir()
+            if x.is_file() and x.suffix.lower() in SOURCE_SUFFIXES
+            and not VARIANT_RE.match(x.name) and x.stem not in self._variants
+        ]
+        for source in sources:
+            await self.process(source)
+        return len(sources)
+
+    async def process(self, source: Path) -> List[str]:
+        """Создать варианты загруженного постера в пуле процессов"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            loop = asyncio.get_running_loop()
+            written = await loop.run_in_executor(self._pool, build_variants, str(source))
+        except Exception as e:
+            logger.error(f"❌ Ошибка обработки постера {source}: {e}")
+            return []
+
+        self._register(written)
+        logger.info(f"🖼️ Постер {Path(source).name}: создано вариантов {len(written)}")
+        return written
+
+    def srcset(self, poster: str) -> Dict[str, str]:
+        """MIME-тип → srcset для постера (пусто, если вариантов нет)"""
+        variants = self._variants.get(Path(poster).stem)
+        if not variants:
+            return {}
+        return {
+            mime: ", ".join(f"/{self.directory.as_posix()}/{name} {width}w" for width, name in sorted(variants[mime]))
+            for mime in MIME_BY_EXT.values() if mime in variants
+        }
+
+    def _register(self, names: Iterable[str]) -> None:
+        for name in names:
+            if POSTER_NAME_RE.match(name):
+                try:
+                    self._files[name] = PosterFile.from_path(self.directory / name)
+                except OSError:
+                    continue
+            match = VARIANT_RE.match(name)
+            if not match:
+                continue
+            mime = MIME_BY_EXT[match["ext"]]
+            items = self._variants.setdefault(match["stem"], {}).setdefault(mime, [])
+            entry = (int(match["width"]), name)
+            if entry not in items:
+                items.append(entry)
+
+
+poster_images = PosterImages()
@@ -0,0 +1,176 @@
+__all__ = [
+    "ProductTransferService",
+    "FORMATS",
+    "detect_format"
+]
+
+import codecs
+import csv
+import io
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Literal, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from loguru import logger
+
+from ..core.const import IMPORT_BATCH_SIZE, IMPORT_ERRORS_LIMIT
+from ..managers.product_manager import ProductManager
+from ..schemas.product import ProductCreateSchema, ProductImportSchema, ProductImportErrorSchema
+
+Format = Literal["csv", "jsonl"]
+
+# Формат → MIME-тип выгрузки
+FORMATS: Dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson"
+}
+COLUMNS = ("external_id", "title", "description", "price", "count", "poster")
+REQUIRED_COLUMNS = {"title", "description", "price", "count", "poster"}
+
+
+def detect_format(filename: Optional[str]) -> Optional[Format]:
+    """Формат по расширению файла (.csv, .jsonl / .ndjson)"""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Строки (с переводом строки) из потока байтов UTF-8, BOM отбрасывается"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    async for chunk in chunks:
+        lines = (tail + decoder.decode(chunk)).splitlines(keepends=True)
+        # Последняя строка может продолжиться в следующей порции (в т.ч. "\r" + "\n")
+        tail = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+        for line in lines:
+            yield line
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def iter_csv(lines: AsyncIterable[str]) -> AsyncIterator[Tuple[int, Any]]:
+    """(номер строки, словарь по заголовку) для каждой записи CSV
+
+    Запись заканчивается, когда в накопленных строках чётное число
+    кавычек: поле в кавычках может содержать перевод строки.
+    """
+    header: Optional[List[str]] = None
+    record: List[str] = []
+    quotes = line_number = start = 0
+    async for line in lines:
+        line_number += 1
+        if not record:
+            start = line_number
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+
+        values = next(csv.reader(record), [])
+        record, quotes = [], 0
+        if not any(x.strip() for x in values):
+            continue
+        if header is None:
+            header = [x.strip().lower() for x in values]
+            missing = REQUIRED_COLUMNS - set(header)
+            if missing:
+                raise ValueError(f"В заголовке CSV нет колонок: {', '.join(sorted(missing))}")
+            continue
+        if len(values) != len(header):
+            yield start, ValueError(f"Ожидалось колонок: {len(header)}, получено: {len(values)}")
+            continue
+        yield start, {key: value for key, value in zip(header, values) if key in COLUMNS}
+
+    if record:
+        yield start, ValueError("Незакрытая кавычка в конце файла")
+
+
+async def iter_jsonl(lines: AsyncIterable[str]) -> AsyncIterator[Tuple[int, Any]]:
+    """(номер строки, объект) для каждой непустой строки JSONL"""
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ValueError(f"Некорректный JSON: {e.msg}")
+
+
+class ProductTransferService:
+    """Потоковый импорт и выгрузка каталога (CSV / JSONL)
+
+    Файл не загружается в память целиком: строки проверяются по одной
+    и записываются пакетами по batch_size продуктов.
+    """
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession], batch_size: int = IMPORT_BATCH_SIZE):
+        self.product_manager = ProductManager(session_maker)
+        self.batch_size = batch_size
+
+    async def import_products(self, chunks: AsyncIterable[bytes], format: Format) -> ProductImportSchema:
+        """Импорт продуктов из потока байтов (ValueError - файл не удаётся разобрать)"""
+        parse = iter_csv if format == "csv" else iter_jsonl
+        result = ProductImportSchema()
+        batch: List[ProductCreateSchema] = []
+
+        async for line, raw in parse(iter_lines(chunks)):
+            try:
+                if isinstance(raw, Exception):
+                    raise raw
+                batch.append(ProductCreateSchema.model_validate(raw))
+            except (ValueError, ValidationError) as e:
+                self._add_error(result, line, e)
+                continue
+
+            if len(batch) >= self.batch_size:
+                await self._flush(result, batch)
+                batch = []
+
+        if batch:
+            await self._flush(result, batch)
+        logger.success(
+            f"✅ Импорт завершён: создано {result.created}, обновлено {result.updated}, ошибок {result.failed}"
+        )
+        return result
+
+    async def export_products(self, format: Format) -> AsyncIterator[bytes]:
+        """Выгрузка каталога порциями (для StreamingResponse или файла)"""
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(COLUMNS)
+            async for chunk in self.product_manager.iter_products(self.batch_size):
+                writer.writerows([getattr(x, column) for column in COLUMNS] for x in chunk)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode()
+        else:
+            async for chunk in self.product_manager.iter_products(self.batch_size):
+                yield "".join(
+                    json.dumps(x.model_dump(include=set(COLUMNS)), ensure_ascii=False) + "\n" for x in chunk
+                ).encode()
+
+    async def _flush(self, result: ProductImportSchema, batch: List[ProductCreateSchema]) -> None:
+        created, updated = await self.product_manager.upsert_products(batch)
+        result.created += created
+        result.updated += updated
+
+    @staticmethod
+    def _add_error(result: ProductImportSchema, line: int, error: Exception) -> None:
+        result.failed += 1
+        if len(result.errors) >= IMPORT_ERRORS_LIMIT:
+            return
+        if isinstance(error, ValidationError):
+            message = "; ".join(f"{'.'.join(map(str, x['loc'])) or 'row'}: {x['msg']}" for x in error.errors())
+        else:
+            message = str(error)
+        result.errors.append(ProductImportErrorSchema(line=line, error=message))
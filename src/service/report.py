@@ -0,0 +1,62 @@
+import os
+from pathlib import Path
+from typing import Iterable
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment
+
+from ..schemas.order import OrderTotalSchema
+
+
+class XlsxReportWriter:
+    """Потоковая запись отчёта по заказам (write-only книга openpyxl)
+
+    Строки сразу уходят в файл, поэтому память не растёт вместе с
+    количеством заказов. Книга сохраняется во временный файл и
+    подменяет отчёт только после успешной записи.
+    """
+    HEADERS = ("ID", "Сумма заказа", "Статус заказа")
+    WIDTHS = {"A": 10, "B": 20, "C": 20}
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.rows = 0
+        self.wb = Workbook(write_only=True)
+        self.ws = self.wb.create_sheet()
+
+        self._center = Alignment(horizontal='center')
+        for column, width in self.WIDTHS.items():
+            self.ws.column_dimensions[column].width = width
+
+        header = []
+        for title in self.HEADERS:
+            cell = WriteOnlyCell(self.ws, value=title)
+            cell.font = Font(bold=True)
+            cell.alignment = self._center
+            header.append(cell)
+        self._append(header)
+
+    def write_rows(self, orders: Iterable[OrderTotalSchema]) -> None:
+        """Записать порцию заказов"""
+        for order in orders:
+            cell = WriteOnlyCell(self.ws, value=order.id)
+            cell.alignment = self._center
+            self._append([cell, f"{order.total} ₽", order.status])
+
+    def close(self, revenue: float) -> None:
+        """Дописать итог по выручке и сохранить отчёт"""
+        self._append([])
+        footer = WriteOnlyCell(self.ws, value=f"Выручка: {revenue} ₽")
+        footer.font = Font(bold=True, size=12, color="00FF00")
+        footer.alignment = self._center
+        self._append([footer])
+        self.ws.merged_cells.add(f"A{self.rows}:C{self.rows}")
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.wb.save(tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def _append(self, row: list) -> None:
+        self.ws.append(row)
+        self.rows += 1
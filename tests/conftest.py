@@ -0,0 +1,79 @@
+"""Общие фикстуры: БД с актуальной схемой на каждый тест и менеджеры поверх неё
+
+По умолчанию - файл SQLite во временном каталоге. TEST_DATABASE_URL
+(например, postgresql+asyncpg://...) запускает те же тесты на другой
+СУБД: таблицы удаляются после каждого теста, поэтому БД должна быть
+отдельной, тестовой.
+"""
+import os
+
+os.environ.setdefault("BOT_TOKEN", "test")
+os.environ.setdefault("API_TOKEN", "test")
+
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.api import create_app
+from src.core.database.engine import create_engine
+from src.core.database.migrations import migrate, schema_version
+from src.core.database.models import Base
+from src.managers import OrderManager, ProductManager
+from src.managers.ledger import SalesLedger
+from src.schemas.product import ProductCreateSchema
+
+pytest_plugins = ["src.core.database.pytest_plugin"]
+
+
+@pytest.fixture
+async def engine(tmp_path) -> AsyncIterator[AsyncEngine]:
+    url = os.environ.get("TEST_DATABASE_URL") or f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine(url)
+    try:
+        await migrate(engine)
+        yield engine
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(lambda sync_conn: schema_version.drop(sync_conn, checkfirst=True))
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture
+def session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine)
+
+
+@pytest.fixture
+def product_manager(session_maker) -> ProductManager:
+    return ProductManager(session_maker)
+
+
+@pytest.fixture
+def order_manager(session_maker) -> OrderManager:
+    return OrderManager(session_maker)
+
+
+@pytest.fixture
+def ledger(session_maker) -> SalesLedger:
+    return SalesLedger(session_maker)
+
+
+@pytest.fixture
+def make_product(product_manager: ProductManager):
+    """Создать продукт: await make_product(price=10.0, count=5)"""
+    async def make(title: str = "Продукт", price: float = 10.0, count: int = 10):
+        return await product_manager.create_product(ProductCreateSchema(
+            title=title, poster="data/img/test.jpg", price=price, count=count, description="Описание"
+        ))
+    return make
+
+
+@pytest.fixture
+async def client(session_maker) -> AsyncIterator[httpx.AsyncClient]:
+    """HTTP-клиент приложения без сервера (ASGI)"""
+    transport = httpx.ASGITransport(app=create_app(session_maker))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
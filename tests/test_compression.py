@@ -0,0 +1,29 @@
+import pytest
+
+from src.api.compression import choose_encoding
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0.5, br;q=0.8", "br"),
+    ("gzip;q=1.0, br;q=0.3", "gzip"),
+    ("BR", "br"),
+    ("*;q=0.5", "br"),
+    ("*, br;q=0", "gzip"),
+    ("gzip;q=0, br;q=0", None),
+    ("identity", None),
+    ("x-brotli, brx", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header, ("br", "gzip")) == expected
+
+
+async def test_api_honours_br_q_zero(client, make_product):
+    for i in range(20):
+        await make_product(title=f"Продукт с длинным названием {i}")
+
+    response = await client.get("/api/v1/productall", headers={"Accept-Encoding": "br;q=0, gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
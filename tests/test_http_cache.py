@@ -0,0 +1,47 @@
+async def test_get_with_current_etag_is_not_modified(client, make_product):
+    await make_product()
+    etag = (await client.get("/api/v1/productall")).headers["etag"]
+
+    response = await client.get("/api/v1/productall", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+async def test_post_with_matching_etag_fails_precondition(client, make_product):
+    product = await make_product()
+    first = await client.post("/api/v1/products", json=[product.id])
+
+    response = await client.post(
+        "/api/v1/products", json=[product.id], headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert response.status_code == 412
+
+    response = await client.post(
+        "/api/v1/products", json=[product.id], headers={"If-Modified-Since": first.headers["last-modified"]}
+    )
+    assert response.status_code == 200
+    assert response.json()["result"][0]["id"] == product.id
+
+
+async def test_change_in_same_second_is_not_hidden_by_if_modified_since(client, make_product):
+    await make_product()
+    first = await client.get("/api/v1/productall")
+    await make_product(title="Второй")
+
+    # Та же секунда - та же дата, но каталог уже другой
+    response = await client.get("/api/v1/productall", headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert response.status_code == 200
+    assert len(response.json()["result"]) == 2
+
+    # ETag важнее даты
+    current = response.headers
+    response = await client.get(
+        "/api/v1/productall",
+        headers={"If-None-Match": first.headers["etag"], "If-Modified-Since": current["last-modified"]}
+    )
+    assert response.status_code == 200
+    response = await client.get(
+        "/api/v1/productall",
+        headers={"If-None-Match": current["etag"], "If-Modified-Since": first.headers["last-modified"]}
+    )
+    assert response.status_code == 304
@@ -0,0 +1,101 @@
+from collections import defaultdict
+
+from sqlalchemy import select, update
+
+from src.core.database.migrations.versions import order_item_price
+from src.core.database.models import OrderItem, OrderStatus, OrderSummary, ProductSales
+from src.schemas.order import CreateOrderSchema, OrderItemSchema
+from src.schemas.product import ProductUpdateSchema
+
+
+async def raw_summary(order_manager):
+    """Суммы и число заказов по статусам, пересчитанные по таблицам заказов"""
+    summary = defaultdict(lambda: [0, 0.0])
+    for total in await order_manager.get_order_totals():
+        summary[total.status][0] += 1
+        summary[total.status][1] += total.total
+    return {status: (orders, round(amount, 2)) for status, (orders, amount) in summary.items()}
+
+
+async def ledger_summary(session_maker):
+    async with session_maker() as session:
+        rows = (await session.execute(select(OrderSummary))).scalars().all()
+    return {x.status: (x.orders, round(x.amount, 2)) for x in rows if x.orders or x.amount}
+
+
+async def test_unpay_after_price_change_reverses_booked_amount(
+    order_manager, product_manager, ledger, session_maker, make_product
+):
+    product = await make_product(price=10.0, count=10)
+    order = await order_manager.create_order(
+        CreateOrderSchema(items=[OrderItemSchema(product_id=product.id, count=2)])
+    )
+    await order_manager.pay_order(order.id)
+    assert await ledger.get_revenue() == 20.0
+
+    await product_manager.update_product(ProductUpdateSchema(id=product.id, price=20.0))
+    await order_manager.update_status(order.id, OrderStatus.UNPAID)
+
+    assert await ledger.get_revenue() == 0
+    assert await ledger_summary(session_maker) == await raw_summary(order_manager)
+    assert await ledger_summary(session_maker) == {OrderStatus.UNPAID.value: (1, 20.0)}
+
+    reconcile = await ledger.rebuild()
+    assert reconcile.revenue_before == reconcile.revenue_after == 0
+
+
+async def test_price_change_keeps_line_price_for_added_count(
+    order_manager, product_manager, ledger, session_maker, make_product
+):
+    product = await make_product(price=10.0, count=10)
+    other = await make_product(title="Другой", price=5.0, count=10)
+    order = await order_manager.create_order(
+        CreateOrderSchema(items=[OrderItemSchema(product_id=product.id, count=1)])
+    )
+    await product_manager.update_product(ProductUpdateSchema(id=product.id, price=30.0))
+
+    # Количество существующей позиции меняется по её цене, новая позиция - по текущей
+    await order_manager.update_order(order.id, OrderItemSchema(product_id=product.id, count=3))
+    await order_manager.update_order(order.id, OrderItemSchema(product_id=other.id, count=2))
+    await order_manager.pay_order(order.id)
+
+    assert await order_manager.get_revenue() == 40.0
+    assert await ledger.get_revenue() == 40.0
+    assert await ledger_summary(session_maker) == await raw_summary(order_manager)
+
+    async with session_maker() as session:
+        sales = {x.product_id: x.revenue for x in (await session.execute(select(ProductSales))).scalars()}
+    assert sales == {product.id: 30.0, other.id: 10.0}
+
+
+async def test_migration_backfills_line_prices(order_manager, ledger, engine, session_maker, make_product):
+    product = await make_product(price=12.5, count=10)
+    order = await order_manager.create_order(
+        CreateOrderSchema(items=[OrderItemSchema(product_id=product.id, count=2)])
+    )
+    await order_manager.pay_order(order.id)
+    async with session_maker() as session:
+        async with session.begin():
+            await session.execute(update(OrderItem).values(price=None))
+
+    await order_item_price(engine)
+
+    async with session_maker() as session:
+        assert (await session.scalars(select(OrderItem.price))).all() == [12.5]
+    assert await ledger.get_revenue() == 25.0
+    assert await ledger_summary(session_maker) == await raw_summary(order_manager)
+
+
+async def test_upsert_fallback_without_on_conflict(
+    order_manager, ledger, session_maker, make_product, monkeypatch
+):
+    monkeypatch.setattr("src.managers.ledger._UPSERT_INSERTS", {})
+    product = await make_product(price=10.0, count=10)
+    for count in (1, 2):
+        order = await order_manager.create_order(
+            CreateOrderSchema(items=[OrderItemSchema(product_id=product.id, count=count)])
+        )
+        await order_manager.pay_order(order.id)
+
+    assert await ledger.get_revenue() == 30.0
+    assert await ledger_summary(session_maker) == await raw_summary(order_manager)
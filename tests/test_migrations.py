@@ -0,0 +1,25 @@
+from sqlalchemy import inspect
+
+from src.core.database.migrations.ops import drop_index_concurrently
+from src.core.database.migrations.versions import order_item_indexes
+from src.schemas.order import CreateOrderSchema, OrderItemSchema
+
+
+async def order_item_index_names(engine):
+    async with engine.connect() as conn:
+        return await conn.run_sync(
+            lambda sync_conn: {x["name"] for x in inspect(sync_conn).get_indexes("order_item")}
+        )
+
+
+async def test_order_item_indexes_rebuild_outside_transaction(engine, order_manager, make_product):
+    product = await make_product(count=10)
+    await order_manager.create_order(CreateOrderSchema(items=[OrderItemSchema(product_id=product.id, count=1)]))
+    for name in ("uq_order_item_order_product", "ix_order_item_product_id"):
+        await drop_index_concurrently(engine, name)
+
+    # Повторный запуск ничего не ломает
+    await order_item_indexes(engine)
+    await order_item_indexes(engine)
+
+    assert {"uq_order_item_order_product", "ix_order_item_product_id"} <= await order_item_index_names(engine)
@@ -0,0 +1,107 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from src.core.database.models import Order, OrderItem, OrderStatus, Product, StockReservation
+from src.managers.reservation import utcnow
+
+
+@pytest.mark.parametrize("body", [
+    {"items": []},
+    {"items": [{"product_id": 1, "count": 0}]},
+    {"items": [{"product_id": 1, "count": -2}]},
+])
+async def test_create_order_rejects_empty_and_non_positive(client, product_manager, make_product, body):
+    product = await make_product(count=5)
+
+    response = await client.post("/api/v1/order", json=body)
+
+    assert response.status_code == 422
+    assert (await product_manager.get_product(product.id)).count == 5
+
+
+async def test_update_order_rejects_non_positive_count(client, make_product):
+    product = await make_product(count=5)
+    order = (await client.post("/api/v1/order", json={"items": [{"product_id": product.id, "count": 1}]})).json()
+
+    response = await client.patch(
+        f"/api/v1/order/{order['result']['id']}", json={"product_id": product.id, "count": -3}
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("pay", [False, True])
+async def test_update_order_unknown_product_is_404(client, order_manager, make_product, pay):
+    product = await make_product(count=5)
+    order = (await client.post("/api/v1/order", json={"items": [{"product_id": product.id, "count": 1}]})).json()
+    if pay:
+        await order_manager.pay_order(order["result"]["id"])
+
+    response = await client.patch(
+        f"/api/v1/order/{order['result']['id']}", json={"product_id": product.id + 999, "count": 1}
+    )
+
+    assert response.status_code == 404
+    assert len((await order_manager.get_order(order["result"]["id"])).items) == 1
+
+
+async def test_bulk_reports_invalid_orders_in_place(client, make_product):
+    product = await make_product(count=5)
+
+    response = await client.post("/api/v1/orders/bulk", json=[
+        {"items": [{"product_id": product.id, "count": 1}]},
+        {"items": []},
+        {"items": [{"product_id": product.id, "count": 0}]},
+    ])
+
+    result = response.json()["result"]
+    assert (result["created"], result["failed"]) == (1, 2)
+    assert [x["id"] is not None for x in result["orders"]] == [True, False, False]
+
+
+async def stock_state(session_maker, product_id):
+    """Остаток, зарезервировано и продано (в оплаченных заказах)"""
+    async with session_maker() as session:
+        stock = await session.scalar(select(Product.count).where(Product.id == product_id))
+        reserved = await session.scalar(
+            select(func.coalesce(func.sum(StockReservation.count), 0))
+            .where(StockReservation.product_id == product_id)
+        )
+        sold = await session.scalar(
+            select(func.coalesce(func.sum(OrderItem.count), 0))
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(OrderItem.product_id == product_id, Order.status == OrderStatus.PAID.value)
+        )
+    return stock, reserved, sold
+
+
+async def test_concurrent_orders_never_oversell(client, session_maker, order_manager, make_product):
+    product = await make_product(count=20)
+    order = {"items": [{"product_id": product.id, "count": 1}]}
+
+    responses = await asyncio.gather(*(client.post("/api/v1/order", json=order) for _ in range(50)))
+
+    assert sorted({x.status_code for x in responses}) == [200, 409]
+    created = [x.json()["result"]["id"] for x in responses if x.status_code == 200]
+    assert len(created) == 20
+    assert await stock_state(session_maker, product.id) == (0, 20, 0)
+
+    # Резервы истекли: остатки вернулись, оплата списывает их заново
+    await order_manager.reservations.sweep(now=utcnow() + timedelta(days=1))
+    assert await stock_state(session_maker, product.id) == (20, 0, 0)
+
+    responses = await asyncio.gather(
+        *(client.post(f"/api/v1/order/{id}/pay") for id in created[:15]),
+        *(client.post("/api/v1/order", json=order) for _ in range(10))
+    )
+
+    assert {x.status_code for x in responses} <= {200, 409}
+    paid = sum(1 for x in responses[:15] if x.status_code == 200)
+    reserved_now = sum(1 for x in responses[15:] if x.status_code == 200)
+    stock, reserved, sold = await stock_state(session_maker, product.id)
+    assert (reserved, sold) == (reserved_now, paid)
+    assert stock >= 0
+    assert stock + reserved + sold == 20
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pytest
+
+from src.core.database.models import OrderStatus
+from src.core.exceptions import OutOfStockError
+from src.managers.reservation import utcnow
+from src.schemas.order import CreateOrderSchema, OrderItemSchema
+
+
+async def test_status_paid_after_expiry_takes_stock(order_manager, product_manager, make_product):
+    product = await make_product(count=5)
+    order = await order_manager.create_order(
+        CreateOrderSchema(items=[OrderItemSchema(product_id=product.id, count=2)])
+    )
+    await order_manager.reservations.sweep(now=utcnow() + timedelta(days=1))
+    assert (await product_manager.get_product(product.id)).count == 5
+
+    await order_manager.update_status(order.id, OrderStatus.PAID)
+
+    assert (await product_manager.get_product(product.id)).count == 3
+    assert (await order_manager.get_order(order.id)).status == OrderStatus.PAID.value
+
+
+async def test_unpay_restocks_and_repay_takes_once(order_manager, product_manager, ledger, make_product):
+    product = await make_product(price=10.0, count=5)
+    order = await order_manager.create_order(
+        CreateOrderSchema(items=[OrderItemSchema(product_id=product.id, count=2)])
+    )
+    await order_manager.update_status(order.id, OrderStatus.PAID)
+    assert (await product_manager.get_product(product.id)).count == 3
+
+    await order_manager.update_status(order.id, OrderStatus.UNPAID)
+    # Повторная отмена ничего не возвращает
+    await order_manager.update_status(order.id, OrderStatus.UNPAID)
+    assert (await product_manager.get_product(product.id)).count == 5
+    assert await ledger.get_revenue() == 0
+
+    await order_manager.pay_order(order.id)
+    assert (await product_manager.get_product(product.id)).count == 3
+    assert await ledger.get_revenue() == 20.0
+
+
+async def test_edit_paid_order_moves_stock(order_manager, product_manager, make_product):
+    product = await make_product(count=5)
+    other = await make_product(title="Другой", count=1)
+    order = await order_manager.create_order(
+        CreateOrderSchema(items=[OrderItemSchema(product_id=product.id, count=2)])
+    )
+    await order_manager.pay_order(order.id)
+
+    await order_manager.update_order(order.id, OrderItemSchema(product_id=product.id, count=4))
+    await order_manager.update_order(order.id, OrderItemSchema(product_id=other.id, count=1))
+    assert (await product_manager.get_product(product.id)).count == 1
+    assert (await product_manager.get_product(other.id)).count == 0
+
+    with pytest.raises(OutOfStockError):
+        await order_manager.update_order(order.id, OrderItemSchema(product_id=product.id, count=7))
+    await order_manager.update_order(order.id, OrderItemSchema(product_id=product.id, count=3))
+    assert (await product_manager.get_product(product.id)).count == 2
+
+    await order_manager.update_status(order.id, OrderStatus.UNPAID)
+    assert (await product_manager.get_product(product.id)).count == 5
+    assert (await product_manager.get_product(other.id)).count == 1
@@ -0,0 +1,32 @@
+import gzip
+import json
+import os
+
+from src.frontend import precompress as module
+from src.frontend.precompress import SKIPPED_MANIFEST, precompress
+
+
+def test_incompressible_files_are_remembered(tmp_path, monkeypatch):
+    (tmp_path / "style.css").write_text("body { color: red; }\n" * 200)
+    (tmp_path / "favicon.ico").write_bytes(os.urandom(4096))
+
+    written = precompress(tmp_path)
+
+    assert (tmp_path / "style.css.gz").exists()
+    assert not (tmp_path / "favicon.ico.gz").exists()
+    manifest = json.loads((tmp_path / SKIPPED_MANIFEST).read_text())
+    assert "favicon.ico.gz" in manifest
+
+    calls = []
+    compress = gzip.compress
+    monkeypatch.setattr(module.gzip, "compress", lambda data, **kwargs: calls.append(data) or compress(data, **kwargs))
+    assert precompress(tmp_path) == 0
+    assert calls == []
+
+    # Файл изменился - сжимается заново
+    ico = tmp_path / "favicon.ico"
+    ico.write_bytes(b"\\0" * 4096)
+    os.utime(ico, ns=(ico.stat().st_atime_ns, ico.stat().st_mtime_ns + 10**9))
+    assert precompress(tmp_path) >= 1
+    assert (tmp_path / "favicon.ico.gz").exists()
+    assert written >= 1
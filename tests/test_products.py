@@ -0,0 +1,22 @@
+from src.schemas.order import CreateOrderSchema, OrderItemSchema
+
+
+async def test_delete_product_in_order_is_conflict(client, order_manager, product_manager, make_product):
+    product = await make_product()
+    await order_manager.create_order(CreateOrderSchema(items=[OrderItemSchema(product_id=product.id, count=1)]))
+
+    response = await client.delete(f"/api/v1/product/{product.id}")
+
+    assert response.status_code == 409
+    assert "есть в заказах" in response.json()["detail"]
+    assert await product_manager.get_product(product.id) is not None
+
+
+async def test_delete_unused_product(client, product_manager, make_product):
+    product = await make_product()
+
+    response = await client.delete(f"/api/v1/product/{product.id}")
+
+    assert response.json()["ok"] is True
+    product_manager.cache.invalidate()
+    assert await product_manager.get_product(product.id) is None
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+import pytest
+
+from src.managers.reservation import utcnow
+from src.schemas.order import CreateOrderSchema, OrderItemSchema
+
+
+@pytest.fixture
+async def orders(order_manager, make_product):
+    """8 заказов по 2 позиции из 5 продуктов"""
+    products = [await make_product(title=f"Продукт {i}", count=100) for i in range(5)]
+    return [
+        await order_manager.create_order(CreateOrderSchema(items=[
+            OrderItemSchema(product_id=products[i % 5].id, count=1),
+            OrderItemSchema(product_id=products[(i + 1) % 5].id, count=2)
+        ]))
+        for i in range(8)
+    ]
+
+
+# Чтения не зависят от числа строк: заказы + все позиции одним запросом
+
+async def test_get_all_orders_budget(order_manager, orders, query_budget):
+    with query_budget(2):
+        result = await order_manager.get_all_orders()
+    assert sum(len(x.items) for x in result) == 16
+
+
+async def test_get_orders_budget(order_manager, orders, query_budget):
+    with query_budget(2):
+        page = await order_manager.get_orders(limit=5)
+    assert len(page.orders) == 5
+
+    with query_budget(1):
+        await order_manager.get_orders(limit=5, with_items=False)
+
+
+@pytest.mark.parametrize("sort", ["id", "price", "title"])
+async def test_get_products_page_budget(product_manager, orders, query_budget, sort):
+    with query_budget(1):
+        page = await product_manager.get_products_page(limit=2, sort=sort)
+    with query_budget(1):
+        await product_manager.get_products_page(page.next_cursor, limit=2, sort=sort)
+
+
+# Записи: постоянная часть + по запросу на INSERT позиции (на PostgreSQL
+# вставка позиций может быть одним запросом); остатки списываются одним UPDATE
+
+async def test_create_order_budget(order_manager, orders, query_budget):
+    items = [OrderItemSchema(product_id=x.product_id, count=1) for x in orders[0].items]
+    # списание, цены, заказ, резерв, агрегат + позиции
+    with query_budget(5 + len(items)):
+        await order_manager.create_order(CreateOrderSchema(items=items))
+
+
+async def test_pay_order_budget(order_manager, orders, query_budget):
+    # заказ, позиции, статус, резерв, 2 × агрегат статуса, выручка за день, продажи продуктов
+    with query_budget(8):
+        await order_manager.pay_order(orders[0].id)
+
+
+async def test_pay_order_after_expiry_budget(order_manager, orders, query_budget):
+    await order_manager.reservations.sweep(now=utcnow() + timedelta(days=1))
+    # то же + одно списание всех позиций без резерва
+    with query_budget(9):
+        await order_manager.pay_order(orders[1].id)
@@ -0,0 +1,10 @@
+from src.schemas.order import OrderItemResponseSchema
+from src.schemas.read import from_rows
+
+
+def test_from_rows_builds_independent_models():
+    first, second = from_rows(OrderItemResponseSchema, [(1, 10, 2, 5.0), (2, 11, 1, None)])
+
+    assert first == OrderItemResponseSchema(id=1, product_id=10, count=2, price=5.0)
+    assert second.model_dump() == {"id": 2, "product_id": 11, "count": 1, "price": None}
+    assert first.model_fields_set is not second.model_fields_set
@@ -0,0 +1,36 @@
+import asyncio
+
+from src.frontend.snapshot import CatalogSnapshot
+from src.managers.cache import ProductCache
+
+
+async def test_invalidations_are_debounced_and_same_html_is_reused():
+    cache = ProductCache()
+    renders = []
+    page = {"html": "<p>1</p>"}
+
+    async def render() -> str:
+        renders.append(page["html"])
+        return page["html"]
+
+    snapshot = CatalogSnapshot(cache, render, interval=0.05)
+    await snapshot.rebuild()
+    first = snapshot.current
+
+    for _ in range(20):
+        cache.invalidate([1])
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.2)
+
+    # 20 инвалидаций - одна пересборка после паузы, HTML тот же: снимок прежний
+    assert len(renders) == 2
+    assert snapshot.current is first
+    assert snapshot.rebuilds == 1
+
+    page["html"] = "<p>2</p>"
+    cache.invalidate([1])
+    await asyncio.sleep(0.2)
+
+    assert snapshot.current.body == b"<p>2</p>"
+    assert snapshot.current.headers["ETag"] != first.headers["ETag"]
+    assert snapshot.rebuilds == 2